@@ -7,16 +7,28 @@ from antichess.game import Game
 # Import colour which represents the white and black colours
 from antichess.colour import Colour
 
+# Import the cache of fonts and rendered texts
+from antichess.assets import ASSETS
+
+# Import the position a game starts from
+from antichess.board import STARTING_POSITION
+
 class App:
     """ Class representing the AntiChess app taking care of all other methods and objects"""
     app_window = None
-    starting_position = "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR"
+    starting_position = STARTING_POSITION
     app_is_running = False
     MAX_DEPTH = 5
+    MAX_FPS = 60
+    # Events after which the menu has to be drawn again, mouse motion is not one of them
+    REDRAW_EVENTS = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.VIDEORESIZE,
+                     pygame.WINDOWSIZECHANGED, pygame.WINDOWEXPOSED)
+    clock = None
 
     def __init__(self, width = 1200, height = 800):
         pygame.init()
         self.app_window = pygame.display.set_mode((width, height))
+        self.clock = pygame.time.Clock()
         pygame.display.set_caption("AntiChess")
 
     def run(self):
@@ -37,19 +49,32 @@ class App:
                 self.__display_text((width / 2, height / 2), "BLACK", player_won, 12)
                 pygame.display.flip()
                 is_in_game = False
-                state_set = True
-                while state_set is True:
-                    for event in pygame.event.get():
-                        state_set = not bool(event.type == pygame.KEYDOWN)
-                        break
-                pygame.time.Clock().tick(24)
+                # sleeps until a key is pressed
+                event = pygame.event.wait()
+                while event.type not in (pygame.KEYDOWN, pygame.QUIT):
+                    event = pygame.event.wait()
+                if event.type == pygame.QUIT:
+                    break
 
             diff_input = "1"
             state = 2
+            needs_redraw = True
             while is_in_game is False and self.app_is_running:
                 width, height = self.app_window.get_size()
-                font = pygame.font.Font(None, int(min(width, height) / 15))
-                for event in pygame.event.get():
+                if needs_redraw:
+                    rects = self.display_menu(state)
+                    diff_surface = ASSETS.text(diff_input, min(width, height) / 15, "black")
+                    self.app_window.blit(diff_surface,
+                        diff_surface.get_rect(center=(
+                            self.__get_diff_coords()[0],
+                            self.__get_diff_coords()[1]+int(height * 0.05))))
+                    pygame.display.flip()
+                    self.clock.tick(self.MAX_FPS)
+
+                # the menu only changes after an input event, sleep until there is one
+                events = [pygame.event.wait()] + pygame.event.get()
+                needs_redraw = any(event.type in self.REDRAW_EVENTS for event in events)
+                for event in events:
                     if event.type == pygame.QUIT:
                         self.quit_app()
                     elif event.type == pygame.KEYDOWN:
@@ -68,23 +93,13 @@ class App:
                             is_in_game = True
                             game = Game(self.app_window,
                                         Colour.WHITE if state == 0 else Colour.BLACK,
-                                        int(diff_input))
+                                        int(diff_input), ponder = True)
                             continue
                         self.__check_mouse_quit(mouse_rect, rects[1])
                         state = 0 if mouse_rect.colliderect(rects[2]) else state
                         state = 1 if mouse_rect.colliderect(rects[3]) else state
                         state_set = False
 
-                if self.app_is_running is True:
-                    rects = self.display_menu(state)
-                    diff_surface = font.render(diff_input, True, "black")
-                    self.app_window.blit(diff_surface,
-                        diff_surface.get_rect(center=(
-                            self.__get_diff_coords()[0],
-                            self.__get_diff_coords()[1]+int(height * 0.05))))
-                    pygame.display.flip()
-                pygame.time.Clock().tick(24)
-
     def __check_mouse_quit(self, mouse_rect, rect):
         if mouse_rect.colliderect(rect):
             self.quit_app()
@@ -122,8 +137,7 @@ class App:
         """ Displays text_to_display at x_coord and y_coord and returns the rect obj to it """
         x_coord, y_coord = coords
         width, height = self.app_window.get_size()
-        font = pygame.font.Font(None, int(min(width, height) / font_size_div))
-        text = font.render(text_to_display, True, colour)
+        text = ASSETS.text(text_to_display, min(width, height) / font_size_div, colour)
         text_rect = text.get_rect(center=(x_coord, y_coord))
         self.app_window.blit(text, text_rect)
         return text_rect
@@ -0,0 +1,63 @@
+""" Importing pygame to load the images and fonts """
+import pygame
+
+class AssetCache:
+    """
+        Cache of everything the app draws that is expensive to create: images are
+        loaded from the disk once, scaled images are kept for the current size only
+        so that they are rebuilt when the window is resized, fonts are kept per size
+        and rendered texts per (text, size, colour)
+    """
+    MAX_TEXTS = 256
+
+    def __init__(self):
+        self.images = {}
+        self.scaled_images = {}
+        self.fonts = {}
+        self.texts = {}
+        self.overlays = {}
+
+    def image(self, path):
+        """ Returns the image loaded from the path """
+        if path not in self.images:
+            self.images[path] = pygame.image.load(path)
+        return self.images[path]
+
+    def scaled_image(self, path, size):
+        """ Returns the image scaled to a size x size square """
+        size = int(round(size))
+        cached = self.scaled_images.get(path)
+        if cached is None or cached[0] != size:
+            cached = (size, pygame.transform.scale(self.image(path), (size, size)))
+            self.scaled_images[path] = cached
+        return cached[1]
+
+    def font(self, size):
+        """ Returns the default font of the size """
+        size = int(size)
+        if size not in self.fonts:
+            self.fonts[size] = pygame.font.Font(None, size)
+        return self.fonts[size]
+
+    def text(self, text, size, colour):
+        """ Returns a surface with the text rendered in the font of the size """
+        key = (text, int(size), str(colour))
+        if key not in self.texts:
+            if len(self.texts) >= self.MAX_TEXTS:
+                self.texts.clear()
+            self.texts[key] = self.font(size).render(text, True, colour)
+        return self.texts[key]
+
+    def overlay(self, size, colour):
+        """ Returns a square surface of the size filled with a (semi transparent) colour """
+        key = (int(size), tuple(colour))
+        if key not in self.overlays:
+            if len(self.overlays) >= self.MAX_TEXTS:
+                self.overlays.clear()
+            surface = pygame.Surface((key[0], key[0]), pygame.SRCALPHA)
+            surface.fill(colour)
+            self.overlays[key] = surface
+        return self.overlays[key]
+
+# The cache shared by the whole app
+ASSETS = AssetCache()
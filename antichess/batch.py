@@ -0,0 +1,116 @@
+""" Importing numpy to look at many positions with one call per step """
+import numpy as np
+
+# Importing a colour enum class to represent black and white
+from antichess.colour import Colour
+
+# Importing the piece types, their codes and the values of pieces on squares
+from antichess.board import (PIECE_CODES, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+                             KNIGHT_STEPS, KING_STEPS, BISHOP_DIRECTIONS, ROOK_DIRECTIONS,
+                             square_values)
+
+# Type a pawn promotes to for every value of promotion_index mod 5, see Board.move
+PROMOTION_TYPES = (ROOK, KNIGHT, BISHOP, QUEEN, KING)
+
+_SQUARES = np.arange(64)
+
+# Tables of square values already built by value_table()
+_VALUE_TABLES = {}
+
+def value_table(colour, piece_square_tables = None):
+    """
+        Returns square_values() as an array [code + 6][square index] so that the evaluation
+        of a position is the sum of table[codes + 6, range(64)], empty squares add 0
+    """
+    key = (colour, piece_square_tables)
+    if key not in _VALUE_TABLES:
+        values = square_values(colour, piece_square_tables)
+        table = np.zeros((13, 64), dtype=np.int32)
+        for col in range(0, 2):
+            for piece_index in range(0, 6):
+                table[PIECE_CODES[col][piece_index] + 6] = values[col][piece_index]
+        _VALUE_TABLES[key] = table
+    return _VALUE_TABLES[key]
+
+def child_codes(board, moves, is_opponent):
+    """
+        Returns the codes of the positions after each of the moves, one row per move,
+        the moves are of the side given by is_opponent and come from generate_legal_moves()
+    """
+    moves = np.array(moves, dtype=np.intp).reshape(-1, 4)
+    rows = np.arange(len(moves))
+    squares_from = moves[:, 0] * 8 + moves[:, 1]
+    squares_to = moves[:, 2] * 8 + moves[:, 3]
+
+    moved = board.codes[squares_from]
+    # a pawn reaching the last row turns into the piece of the promotion cycle
+    promoted = (np.abs(moved) == PIECE_CODES[0][PAWN]) & ((moves[:, 2] == 0) | (moves[:, 2] == 7))
+    if promoted.any():
+        col = Colour.WHITE.value if moved[promoted][0] > 0 else Colour.BLACK.value
+        moved[promoted] = PIECE_CODES[col][PROMOTION_TYPES[board.promotion_index % 5]]
+
+    codes = np.repeat(board.codes[np.newaxis], len(moves), axis = 0)
+    codes[rows, squares_from] = 0
+    codes[rows, squares_to] = moved
+    return codes
+
+def evaluate_batch(codes, colour, piece_square_tables = None):
+    """
+        Returns Board.evaluation of every row of codes for a board of the player's colour
+        and its piece_square_tables, the same number the board keeps up to date
+    """
+    table = value_table(colour, piece_square_tables)
+    return table[codes.astype(np.intp) + 6, _SQUARES].sum(axis = 1)
+
+def _slices(x_step, y_step):
+    """ Returns the slices of (target, source) squares of a shift by (x_step, y_step) """
+    return ((slice(None), slice(max(x_step, 0), 8 + min(x_step, 0)),
+             slice(max(y_step, 0), 8 + min(y_step, 0))),
+            (slice(None), slice(max(-x_step, 0), 8 - max(x_step, 0)),
+             slice(max(-y_step, 0), 8 - max(y_step, 0))))
+
+_SHIFTS = {(x_step, y_step) : _slices(x_step, y_step)
+           for x_step in range(-2, 3) for y_step in range(-2, 3)}
+
+def _shift(squares, step):
+    """ Returns squares moved by step = (x, y) on every board, squares leaving it are dropped """
+    target, source = _SHIFTS[step]
+    shifted = np.zeros_like(squares)
+    shifted[target] = squares[source]
+    return shifted
+
+def moves_batch(codes, colour, is_opponent):
+    """
+        Returns two boolean arrays telling for every row of codes if colour can capture
+        and if it can move at all, what generate_legal_moves() tells without listing
+        the moves. Pawns of the player's colour move up the board unless is_opponent
+    """
+    signed = codes.reshape(-1, 8, 8) * (1 if colour == Colour.WHITE else -1)
+    enemies = signed < 0
+    empty = signed == 0
+    direction = 1 if is_opponent is True else -1
+
+    pawns = signed == PIECE_CODES[0][PAWN]
+    pawn_captures = _shift(pawns, (direction, 1)) | _shift(pawns, (direction, -1))
+    pawn_pushes = _shift(pawns, (direction, 0))
+
+    # squares a piece other than a pawn reaches, empty or taken by the first blocker of a ray
+    reached = np.zeros_like(empty)
+    for piece_index, steps in ((KNIGHT, KNIGHT_STEPS), (KING, KING_STEPS)):
+        pieces = signed == PIECE_CODES[0][piece_index]
+        if pieces.any():
+            for step in steps:
+                reached |= _shift(pieces, step)
+    for piece_index, directions in ((BISHOP, BISHOP_DIRECTIONS), (ROOK, ROOK_DIRECTIONS)):
+        sliders = (signed == PIECE_CODES[0][piece_index]) | (signed == PIECE_CODES[0][QUEEN])
+        if not sliders.any():
+            continue
+        for step in directions:
+            ray = _shift(sliders, step)
+            while ray.any():
+                reached |= ray
+                ray = _shift(ray & empty, step)
+
+    can_capture = ((pawn_captures | reached) & enemies).any(axis = (1, 2))
+    can_move = can_capture | ((pawn_pushes | reached) & empty).any(axis = (1, 2))
+    return can_capture, can_move
@@ -1,5 +1,8 @@
-""" Importing pygame for displaying the board and the moves """
-import pygame
+""" Importing random to generate the keys for hashing positions """
+import random
+
+# Importing struct to pack the side to move and the promotion index of a position
+import struct
 
 # Importing numpy for arrays to represent the board
 import numpy as np
@@ -7,22 +10,129 @@ import numpy as np
 # Importing colour for white and black
 from antichess.colour import Colour
 
-# Importing all pieces as objects that are on the board
+# Importing all pieces as objects that are on the board and the squares they reach
 from antichess.pieces import Pawn, Bishop, Knight, Rook, Queen, King
+from antichess.pieces import (RAYS, BISHOP_RAYS, ROOK_RAYS, KNIGHT_TARGETS, KING_TARGETS,
+                              KNIGHT_ATTACKS, KING_ATTACKS, PAWN_CAPTURES, PAWN_ATTACKS,
+                              PAWN_PUSHES)
+
+# Index of every piece type inside of a colour's list of bitboards
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PIECE_INDEX = {Pawn : PAWN, Knight : KNIGHT, Bishop : BISHOP, Rook : ROOK, Queen : QUEEN,
+               King : KING}
+PIECE_TYPES = (Pawn, Knight, Bishop, Rook, Queen, King)
+# piece a pawn is promoted to for promotion_index mod 5
+PROMOTION_PIECES = (Rook, Knight, Bishop, Queen, King)
+
+# Position a game starts from in the notation of the Board constructor
+STARTING_POSITION = "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR"
+
+PIECE_LETTERS = "PNBRQK"
+# letters a row of a position is written with, '0' is an empty square
+POSITION_LETTERS = frozenset("0" + PIECE_LETTERS + PIECE_LETTERS.lower())
+COLOUR_LETTERS = "wb"
+# colour and side to move bits, promotion index, packed after the squares by Board.to_bytes
+POSITION_FLAGS = struct.Struct("<BH")
+PIECE_VALUES = tuple(piece.VALUE for piece in PIECE_TYPES)
+# int8 code of a piece in Board.codes, piece type + 1 for white and its negation for black
+PIECE_CODES = (tuple(piece_index + 1 for piece_index in range(6)),
+               tuple(-piece_index - 1 for piece_index in range(6)))
+
+# Move patterns of the pieces, the order of the directions is the order of generated moves
+KNIGHT_STEPS = Knight.STEPS
+KING_STEPS = King.STEPS
+BISHOP_DIRECTIONS = Bishop.DIRECTIONS
+ROOK_DIRECTIONS = Rook.DIRECTIONS
+
+# Zobrist keys, one random 64-bit number per piece type, colour and square, one for the side
+# to move being black, one for every step of the promotion cycle and one for a board seen
+# from black's side, the seed is fixed so the hash of a position is the same in every process
+_KEY_GENERATOR = random.Random(0x5EED)
+ZOBRIST_PIECES = [[[_KEY_GENERATOR.getrandbits(64) for _ in range(64)] for _ in range(6)]
+                  for _ in range(2)]
+ZOBRIST_BLACK_TO_MOVE = _KEY_GENERATOR.getrandbits(64)
+ZOBRIST_PROMOTION = [_KEY_GENERATOR.getrandbits(64) for _ in range(5)]
+ZOBRIST_BLACK_PLAYER = _KEY_GENERATOR.getrandbits(64)
+
+def square_bit(x_coord, y_coord):
+    """ Returns the bit of a square on (x, y), square index is x * 8 + y """
+    return 1 << (x_coord * 8 + y_coord)
+
+# Tables of square values already built by square_values()
+_SQUARE_VALUES = {}
+
+def square_values(colour, piece_square_tables = None):
+    """
+        Returns what a piece adds to Board.evaluation on every square,
+        [colour value][piece type][square index] for a board of the player's colour
+
+        piece_square_tables are optional bonuses, a tuple of one table of 64 numbers per
+        piece type (PIECE_INDEX order) seen by the owner of the piece with its pieces
+        at the bottom, so the player's pieces use square x * 8 + y and the opponent's 63 - it
+    """
+    key = (colour, piece_square_tables)
+    if key not in _SQUARE_VALUES:
+        values = [[], []]
+        for piece_colour in (Colour.WHITE, Colour.BLACK):
+            sign = 1 if piece_colour == Colour.WHITE else -1
+            for piece_index, value in enumerate(PIECE_VALUES):
+                table = [0] * 64 if piece_square_tables is None else (
+                    piece_square_tables[piece_index])
+                values[piece_colour.value].append(tuple(
+                    sign * (value + table[square if piece_colour == colour else 63 - square])
+                    for square in range(0, 64)))
+        _SQUARE_VALUES[key] = values
+    return _SQUARE_VALUES[key]
+
+def check_position(position):
+    """
+        Returns the rows of a position in the notation of the Board constructor,
+        raises ValueError if it is not 8 rows of 8 letters of POSITION_LETTERS
+    """
+    rows = position.split('/')
+    if len(rows) != 8 or any(len(row) != 8 or not POSITION_LETTERS.issuperset(row)
+                             for row in rows):
+        raise ValueError(f"invalid position {position!r}")
+    return rows
 
 class Board:
-    """ Class representing a chess board """
+    """
+        Class representing a chess board
+
+        Next to the 8x8 array of pieces the board keeps bitboards, one 64-bit integer
+        per piece type and colour where bit x * 8 + y is set if such a piece is on (x, y),
+        plus an occupancy mask per colour and one for the whole board
+
+        hash_key is a Zobrist hash of the pieces, side_to_move, promotion_index mod 5 and
+        colour that is updated with every change of the board, colour is part of it because
+        the same letters mean other squares for the player of the other colour
+
+        evaluation is the material of white minus the material of black plus the optional
+        piece square tables (see square_values), it is updated with every change as well
+
+        codes is the position as 64 int8 piece codes (see PIECE_CODES) indexed by x * 8 + y
+        with 0 for an empty square, the encoding read by antichess.batch
+    """
     current_board = np.full((8, 8), None)
     colour = Colour.WHITE
     moves_played = []
     pieces_taken = []
     white_pieces_pos = set({})
     black_pieces_pos = set({})
+    piece_bitboards = [[0] * 6, [0] * 6]
+    colour_bitboards = [0, 0]
+    occupied = 0
+    side_to_move = Colour.WHITE
+    hash_key = 0
     promotion_index = 0
+    evaluation = 0
+    codes = np.zeros(64, dtype=np.int8)
+    piece_square_tables = None
     # promotion_index mod 5 -> 0 = rook, 1 = knight, 2 = bishop, 3 = queen, 4 = king
 
     def __init__(self, colour = Colour.WHITE,
-    starting_position = "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR"):
+    starting_position = STARTING_POSITION,
+    side_to_move = Colour.WHITE, promotion_index = 0, piece_square_tables = None):
         """
             Notation for a starting position follows these rules: 
 
@@ -41,90 +151,247 @@ class Board:
                 - Q/q means Queen
                 - K/k means King
                 - P/p means Pawn
+
+            side_to_move is the colour that makes the next move, after every move
+            it becomes the colour of the other side than the one that moved,
+            promotion_index is the number of promotions that already happened, only
+            its place in the cycle of 5 promotion pieces matters so it is kept mod 5,
+            piece_square_tables are added to the evaluation, see square_values()
+
+            Raises ValueError if the position is not 8 rows of 8 of these letters
         """
+        start_pos_rows = check_position(starting_position)
         self.colour = Colour.WHITE if colour == Colour.WHITE else Colour.BLACK
         player_col = self.colour
         opponent_col = Colour.BLACK if player_col == Colour.WHITE else Colour.WHITE
+        self.current_board = np.full((8, 8), False, dtype=object)
+        self.moves_played = []
+        self.pieces_taken = []
         self.white_pieces_pos = set({})
         self.black_pieces_pos = set({})
-
-        start_pos_rows = starting_position.split('/')
-        pieces = {
-          'R' : Rook(player_col),
-          'N' : Knight(player_col),
-          'B' : Bishop(player_col),
-          'Q' : Queen(player_col),
-          'K' : King(player_col),
-          'P' : Pawn(player_col),
-
-          'r' : Rook(opponent_col),
-          'n' : Knight(opponent_col),
-          'b' : Bishop(opponent_col),
-          'q' : Queen(opponent_col),
-          'k' : King(opponent_col),
-          'p' : Pawn(opponent_col),
-        }
+        self.piece_bitboards = [[0] * 6, [0] * 6]
+        self.colour_bitboards = [0, 0]
+        self.occupied = 0
+        self.side_to_move = Colour.WHITE if side_to_move == Colour.WHITE else Colour.BLACK
+        self.promotion_index = promotion_index % 5
+        self.hash_key = ZOBRIST_PROMOTION[self.promotion_index]
+        if self.side_to_move == Colour.BLACK:
+            self.hash_key ^= ZOBRIST_BLACK_TO_MOVE
+        if self.colour == Colour.BLACK:
+            self.hash_key ^= ZOBRIST_BLACK_PLAYER
+        self.__previous_sides = []
+        self.piece_square_tables = piece_square_tables
+        self.evaluation = 0
+        self.codes = np.zeros(64, dtype=np.int8)
+        self.__square_values = square_values(self.colour, piece_square_tables)
+
+        pieces = {}
+        for letter, piece_type in zip(PIECE_LETTERS, PIECE_TYPES):
+            pieces[letter] = piece_type(player_col)
+            pieces[letter.lower()] = piece_type(opponent_col)
 
         for row_num, row_pos in enumerate(start_pos_rows):
             for col_num, piece in enumerate(row_pos):
-                if piece.upper() in ['R', 'N', 'B', 'Q', 'K', 'P']:
-                    piece_to_insert = pieces[piece]
-                    if piece_to_insert is not False:
-                        self.current_board[row_num, col_num] = piece_to_insert.copy()
-                else:
-                    self.current_board[row_num, col_num] = False
-
-        for i in range(0, 8):
-            for j in range(0, 8):
-                piece = self.current_board[i, j]
-                if piece is not False:
-                    if piece.colour == Colour.WHITE:
-                        self.white_pieces_pos.add((i, j))
-                    elif piece.colour == Colour.BLACK:
-                        self.black_pieces_pos.add((i, j))
-
-    def move (self, move, is_opponent = False):
-        """ Makes a move on the board """
+                if piece in pieces:
+                    self.__place_piece(pieces[piece], row_num, col_num)
+
+    def position_string(self):
+        """ Returns the position in the starting position notation of the constructor """
+        rows = []
+        for row in range(0, 8):
+            letters = ""
+            for col in range(0, 8):
+                piece = self.current_board[row, col]
+                if piece is False:
+                    letters += "0"
+                    continue
+                letter = PIECE_LETTERS[PIECE_INDEX[type(piece)]]
+                letters += letter if piece.colour == self.colour else letter.lower()
+            rows.append(letters)
+        return "/".join(rows)
+
+    def clone(self):
+        """
+            Returns a board with the same position, side to move and promotion index,
+            the history of moves is not copied so the clone cannot unmake them,
+            pieces are shared since they are never changed once they are on the board
+        """
+        board = Board.__new__(Board)
+        board.colour = self.colour
+        board.current_board = self.current_board.copy()
+        board.moves_played = []
+        board.pieces_taken = []
+        board.white_pieces_pos = set(self.white_pieces_pos)
+        board.black_pieces_pos = set(self.black_pieces_pos)
+        board.piece_bitboards = [list(self.piece_bitboards[0]), list(self.piece_bitboards[1])]
+        board.colour_bitboards = list(self.colour_bitboards)
+        board.occupied = self.occupied
+        board.side_to_move = self.side_to_move
+        board.promotion_index = self.promotion_index
+        board.hash_key = self.hash_key
+        board.evaluation = self.evaluation
+        board.codes = self.codes.copy()
+        board.piece_square_tables = self.piece_square_tables
+        board.__previous_sides = []
+        board.__square_values = self.__square_values
+        return board
+
+    def to_fen(self):
+        """
+            Returns the position as one line "<position> <colour> <side to move> <promotion
+            index>", the position in the notation of the constructor and colours as w or b
+        """
+        return (f"{self.position_string()} {COLOUR_LETTERS[self.colour.value]} "
+                f"{COLOUR_LETTERS[self.side_to_move.value]} {self.promotion_index % 5}")
+
+    @staticmethod
+    def from_fen(fen, piece_square_tables = None):
+        """ Returns the board written by to_fen, raises ValueError for a malformed line """
+        fields = fen.split()
+        if (len(fields) != 4 or fields[1] not in COLOUR_LETTERS or fields[2] not in COLOUR_LETTERS
+                or not fields[3].isdigit()):
+            raise ValueError(f"invalid board {fen!r}")
+        return Board(Colour(COLOUR_LETTERS.index(fields[1])), fields[0],
+                     Colour(COLOUR_LETTERS.index(fields[2])), int(fields[3]),
+                     piece_square_tables)
+
+    def to_bytes(self):
+        """
+            Returns the position packed into 35 bytes, two squares per byte with 0 for an
+            empty square and 1 + colour * 6 + piece index otherwise (see PIECE_LETTERS),
+            then the colour and the side to move as bits of one byte and the promotion index
+        """
+        squares = [0] * 64
+        for col in range(0, 2):
+            for piece_index in range(0, 6):
+                bitboard = self.piece_bitboards[col][piece_index]
+                while bitboard:
+                    lowest_bit = bitboard & -bitboard
+                    squares[lowest_bit.bit_length() - 1] = 1 + col * 6 + piece_index
+                    bitboard ^= lowest_bit
+        packed = bytes(squares[i] << 4 | squares[i + 1] for i in range(0, 64, 2))
+        return packed + POSITION_FLAGS.pack(self.colour.value | self.side_to_move.value << 1,
+                                            self.promotion_index % 5)
+
+    @staticmethod
+    def from_bytes(data, piece_square_tables = None):
+        """ Returns the board packed by to_bytes, raises ValueError for data of another size """
+        if len(data) != 32 + POSITION_FLAGS.size:
+            raise ValueError(f"a packed board has {32 + POSITION_FLAGS.size} bytes")
+        flags, promotion_index = POSITION_FLAGS.unpack_from(data, 32)
+        colour = Colour(flags & 1)
+        rows = []
+        for x_coord in range(0, 8):
+            row = ""
+            for byte in data[x_coord * 4:x_coord * 4 + 4]:
+                for code in (byte >> 4, byte & 15):
+                    if code == 0:
+                        row += "0"
+                        continue
+                    letter = PIECE_LETTERS[(code - 1) % 6]
+                    row += letter if (code - 1) // 6 == colour.value else letter.lower()
+            rows.append(row)
+        return Board(colour, "/".join(rows), Colour(flags >> 1 & 1), promotion_index,
+                     piece_square_tables)
+
+    def __place_piece(self, piece, x_coord, y_coord):
+        """ Puts the piece on an empty square (x, y) and updates the bitboards """
+        bit = square_bit(x_coord, y_coord)
+        col = piece.colour.value
+        piece_index = PIECE_INDEX[type(piece)]
+        self.piece_bitboards[col][piece_index] |= bit
+        self.colour_bitboards[col] |= bit
+        self.occupied |= bit
+        self.hash_key ^= ZOBRIST_PIECES[col][piece_index][x_coord * 8 + y_coord]
+        self.evaluation += self.__square_values[col][piece_index][x_coord * 8 + y_coord]
+        self.codes[x_coord * 8 + y_coord] = PIECE_CODES[col][piece_index]
+        self.current_board[x_coord, y_coord] = piece
+        if piece.colour == Colour.WHITE:
+            self.white_pieces_pos.add((x_coord, y_coord))
+        else:
+            self.black_pieces_pos.add((x_coord, y_coord))
+
+    def __remove_piece(self, x_coord, y_coord):
+        """ Removes and returns the piece on (x, y), returns False if the square is empty """
+        piece = self.current_board[x_coord, y_coord]
+        if piece is False:
+            return False
+        bit = square_bit(x_coord, y_coord)
+        col = piece.colour.value
+        piece_index = PIECE_INDEX[type(piece)]
+        self.piece_bitboards[col][piece_index] ^= bit
+        self.colour_bitboards[col] ^= bit
+        self.occupied ^= bit
+        self.hash_key ^= ZOBRIST_PIECES[col][piece_index][x_coord * 8 + y_coord]
+        self.evaluation -= self.__square_values[col][piece_index][x_coord * 8 + y_coord]
+        self.codes[x_coord * 8 + y_coord] = 0
+        self.current_board[x_coord, y_coord] = False
+        if piece.colour == Colour.WHITE:
+            self.white_pieces_pos.discard((x_coord, y_coord))
+        else:
+            self.black_pieces_pos.discard((x_coord, y_coord))
+        return piece
+
+    def __set_side_to_move(self, colour):
+        """ Changes the side to move and its part of the hash """
+        if colour != self.side_to_move:
+            self.hash_key ^= ZOBRIST_BLACK_TO_MOVE
+            self.side_to_move = colour
+
+    def __set_promotion_index(self, promotion_index):
+        """ Changes the promotion index and its part of the hash """
+        self.hash_key ^= ZOBRIST_PROMOTION[self.promotion_index % 5]
+        self.hash_key ^= ZOBRIST_PROMOTION[promotion_index % 5]
+        self.promotion_index = promotion_index
+
+    def compute_hash(self):
+        """ Returns the hash of the position computed from scratch, equal to hash_key """
+        hash_key = ZOBRIST_PROMOTION[self.promotion_index % 5]
+        if self.side_to_move == Colour.BLACK:
+            hash_key ^= ZOBRIST_BLACK_TO_MOVE
+        if self.colour == Colour.BLACK:
+            hash_key ^= ZOBRIST_BLACK_PLAYER
+        for col in range(0, 2):
+            for piece_index in range(0, 6):
+                for x_coord, y_coord in self.squares_of(self.piece_bitboards[col][piece_index]):
+                    hash_key ^= ZOBRIST_PIECES[col][piece_index][x_coord * 8 + y_coord]
+        return hash_key
+
+    def compute_evaluation(self):
+        """ Returns the evaluation computed from scratch, equal to evaluation """
+        evaluation = 0
+        for col in range(0, 2):
+            for piece_index in range(0, 6):
+                for x_coord, y_coord in self.squares_of(self.piece_bitboards[col][piece_index]):
+                    evaluation += self.__square_values[col][piece_index][x_coord * 8 + y_coord]
+        return evaluation
+
+    def move (self, move, is_opponent = False, validate = True):
+        """
+            Makes a move on the board, validate = False skips the legality check
+            and is meant for moves coming from generate_legal_moves()
+        """
         x_from, y_from, x_to, y_to = move
         if x_from == -1:
             self.moves_played.append((x_from, y_from, x_to, y_to))
-            self.pieces_taken.append(self.current_board[x_to, y_to])
+            promoted_pawn = self.__remove_piece(x_to, y_to)
+            self.pieces_taken.append(promoted_pawn)
             prom_ind = self.promotion_index % 5
 
-            op_col, player_col = (Colour.BLACK if self.colour == Colour.WHITE else Colour.WHITE,
-                                   self.colour)
-
-            if prom_ind == 0:
-                self.current_board[x_to, y_to]=Rook(op_col if is_opponent is True else player_col)
-            elif prom_ind == 1:
-                self.current_board[x_to, y_to]=Knight(op_col if is_opponent is True else player_col)
-            elif prom_ind == 2:
-                self.current_board[x_to, y_to]=Bishop(op_col if is_opponent is True else player_col)
-            elif prom_ind == 3:
-                self.current_board[x_to, y_to]=Queen(op_col if is_opponent is True else player_col)
-            else:
-                self.current_board[x_to, y_to]=King(op_col if is_opponent is True else player_col)
-
-            self.promotion_index += 1
+            # the promoted piece keeps the colour of the pawn, whoever is_opponent names
+            self.__place_piece(PROMOTION_PIECES[prom_ind](promoted_pawn.colour), x_to, y_to)
+
+            self.__set_promotion_index(self.promotion_index + 1)
             return True
 
-        if self.is_move_valid((x_from, y_from, x_to, y_to), is_opponent):
+        if validate is False or self.is_move_valid((x_from, y_from, x_to, y_to), is_opponent):
             self.moves_played.append((x_from, y_from, x_to, y_to))
-            taken_piece = self.current_board[x_to, y_to]
-            self.pieces_taken.append(taken_piece)
-
-            self.black_pieces_pos.discard((x_to, y_to))
-            self.white_pieces_pos.discard((x_to, y_to))
-
-            if (x_from, y_from) in self.white_pieces_pos:
-                self.white_pieces_pos.discard((x_from, y_from))
-                self.white_pieces_pos.add((x_to, y_to))
-            else:
-                self.black_pieces_pos.discard((x_from, y_from))
-                self.black_pieces_pos.add((x_to, y_to))
-
-            self.current_board[x_to, y_to] = self.current_board[x_from, y_from]
-            self.current_board[x_from, y_from] = False
+            self.pieces_taken.append(self.__remove_piece(x_to, y_to))
+            moved_piece = self.__remove_piece(x_from, y_from)
+            self.__place_piece(moved_piece, x_to, y_to)
+            self.__previous_sides.append(self.side_to_move)
+            self.__set_side_to_move(
+                Colour.BLACK if moved_piece.colour == Colour.WHITE else Colour.WHITE)
 
             if x_to in [0, 7] and isinstance(self.current_board[x_to, y_to], Pawn):
                 self.__promotion(x_to, y_to, is_opponent)
@@ -142,212 +409,240 @@ class Board:
         piece_to_return = self.pieces_taken.pop()
 
         if move_to_undo[0] == -1:
-            self.current_board[move_to_undo[2], move_to_undo[3]] = piece_to_return
+            self.__remove_piece(move_to_undo[2], move_to_undo[3])
+            self.__place_piece(piece_to_return, move_to_undo[2], move_to_undo[3])
             self.unmake_last_move()
-            self.promotion_index -= 1
+            self.__set_promotion_index(self.promotion_index - 1)
 
             return True
 
-        if (move_to_undo[2], move_to_undo[3]) in self.black_pieces_pos:
-            self.black_pieces_pos.add((move_to_undo[0], move_to_undo[1]))
-            self.black_pieces_pos.remove((move_to_undo[2], move_to_undo[3]))
-        else:
-            self.white_pieces_pos.add((move_to_undo[0], move_to_undo[1]))
-            self.white_pieces_pos.remove((move_to_undo[2], move_to_undo[3]))
+        self.__place_piece(self.__remove_piece(move_to_undo[2], move_to_undo[3]),
+                           move_to_undo[0], move_to_undo[1])
 
         if piece_to_return is not False:
-            if piece_to_return.colour == Colour.WHITE:
-                self.white_pieces_pos.add((move_to_undo[2], move_to_undo[3]))
-            else:
-                self.black_pieces_pos.add((move_to_undo[2], move_to_undo[3]))
-
-        self.current_board[move_to_undo[0], move_to_undo[1]] = (
-            self.current_board[move_to_undo[2], move_to_undo[3]])
-        self.current_board[move_to_undo[2], move_to_undo[3]] = piece_to_return
+            self.__place_piece(piece_to_return, move_to_undo[2], move_to_undo[3])
+        self.__set_side_to_move(self.__previous_sides.pop())
 
         return True
 
-    def display_board(self, window):
-        """ Displays the board in the pygame window """
-        width, height = window.get_size()
-        board_center_position = (width / 2, height / 2)
-        size_of_board = self.get_size_of_board(window)
-
-        tile_x, tile_y = (board_center_position[0] - size_of_board / 2,
-                           board_center_position[1] - size_of_board / 2)
-        tile_size = size_of_board / 8
-
-        for row in range(0, 8):
-            for col in range(0, 8):
-                pygame.draw.rect(
-                    window, ((155,76,20)) if ((row * (8 + 1) + col) % 2 == 1) else ((255,240,200)),
-                      (tile_x, tile_y, tile_size, tile_size))
-                if self.current_board[row, col] is not False:
-                    coords = self.get_coords(window, col, row)
-                    self.current_board[row, col].display_piece(window, tile_size, *coords)
-                tile_x += tile_size
-            tile_y += tile_size
-            tile_x -= 8 * tile_size
-
-    def display_moves(self, window, x_coord, y_coord, is_opponent):
-        """ Displays the moves of a piece on (x, y) """
-        if self.current_board[x_coord, y_coord] is False:
+    def legal_moves_from(self, x_coord, y_coord, is_opponent):
+        """ Returns the squares the piece on (x, y) can legally move to """
+        piece = self.current_board[x_coord, y_coord]
+        if piece is False:
             return []
-        all_moves = self.current_board[x_coord, y_coord].get_moves(x_coord, y_coord, is_opponent)
-
-        moves_to_display = []
-        for move in all_moves:
-            if self.is_move_valid((x_coord, y_coord, *move), is_opponent):
-                moves_to_display.append(move)
-
-        for move in moves_to_display:
-            coords = self.get_coords(window, move[1], move[0])
-            self.highlight_tile(window, *coords, (255, 0, 0, 90))
-
-        return moves_to_display
-
-    def get_coords(self, window, x_coord, y_coord):
-        """ Returns the coords in px for a tile on (x, y) """
-        width, height = window.get_size()
-        board_center_position = (width / 2, height / 2)
-        tile_size = self.get_tile_size(window)
-        left_corner_tile_x, left_corner_tile_y = (board_center_position[0] - 4 * tile_size,
-                                                  board_center_position[1] - 4 * tile_size)
-        return (left_corner_tile_x + x_coord * tile_size + tile_size / 2,
-                 left_corner_tile_y + y_coord * tile_size + tile_size / 2)
-
-    def get_size_of_board(self, window):
-        """ Returns a size of a side of a chess board """
-        width, height = window.get_size()
-        return 0.9 * width if width < height else 0.9 * height
-
-    def get_tile_size(self, window):
-        """ Returns a size of a square representing a chess tile """
-        return self.get_size_of_board(window) / 8
-
-    def get_tile_based_on_click(self, window, x_coord, y_coord):
-        """ Gets coords of a tile based on x,y coords on the window """
-        width, height = window.get_size()
-        board_center_position = (width / 2, height / 2)
-        size_of_board = self.get_size_of_board(window)
-        tile_x, tile_y = (board_center_position[0] - size_of_board / 2,
-                           board_center_position[1] - size_of_board / 2)
-        tile_size = size_of_board / 8
-        return (int((y_coord - tile_y) // tile_size), int((x_coord - tile_x) // tile_size))
+
+        return [
+            (move[2], move[3]) for move in self.generate_legal_moves(piece.colour, is_opponent)
+            if move[0] == x_coord and move[1] == y_coord
+            ]
 
     def __check_pawn(self, move, is_opponent):
         x_from, y_from, x_to, y_to = move
-        if y_to not in {y_from + 1,  y_from - 1,  y_from}:
-            return False
-        if is_opponent is True:
-            if abs(x_to - x_from) == 1 or (abs(x_to - x_from) == 2 and x_from == 1):
-                return True
-        if is_opponent is False:
-            if abs(x_to - x_from) == 1 or (abs(x_to - x_from) == 2 and x_from == 6):
+        side = is_opponent is True
+        if y_to != y_from:
+            return bool(PAWN_ATTACKS[side][x_from * 8 + y_from] & square_bit(x_to, y_to))
+        return any(x_coord == x_to for x_coord, _, _ in PAWN_PUSHES[side][x_from * 8 + y_from])
+
+    def __is_ray_clear(self, move, x_step, y_step):
+        """ Walks the ray of the direction from the start of the move until the target """
+        x_from, y_from, x_to, y_to = move
+        for x_coord, y_coord, bit in RAYS[(x_step, y_step)][x_from * 8 + y_from]:
+            if x_coord == x_to and y_coord == y_to:
                 return True
+            if self.occupied & bit:
+                return False
         return False
 
     def __check_bishop(self, move):
         x_from, y_from, x_to, y_to = move
-        for inc in range(1, 8):
-            x_inc, y_inc = (inc * (1 if x_to > x_from else -1),
-                            inc * (1 if y_to > y_from else -1))
-            if (self.is_in_bounds(x_from + x_inc, y_from + y_inc) is False
-                or (x_from + x_inc == x_to and y_from + y_inc == y_to)):
-                return True
-            if self.current_board[x_from + x_inc, y_from + y_inc] is not False:
-                return False
-        return True
+        return self.__is_ray_clear(move, 1 if x_to > x_from else -1, 1 if y_to > y_from else -1)
 
     def __check_rook(self, move):
         x_from, y_from, x_to, y_to = move
+        if x_to != x_from and y_to != y_from:
+            return False
         x_inc_q = 1 if x_to > x_from else (0 if x_to == x_from else -1)
         y_inc_q = 1 if y_to > y_from else (0 if y_to == y_from else -1)
-        for inc in range (1, 8):
-            x_inc, y_inc = inc * x_inc_q, inc * y_inc_q
-            if (self.is_in_bounds(x_from + x_inc, y_from + y_inc) is False
-                or (x_from + x_inc == x_to and y_from + y_inc == y_to)):
-                return True
-            if self.current_board[x_from + x_inc, y_from + y_inc] is not False:
-                return False
-        return True
+        return self.__is_ray_clear(move, x_inc_q, y_inc_q)
 
     def __check_queen(self, move):
         x_from, y_from, x_to, y_to = move
         if x_to == x_from or y_to == y_from:
-            x_inc_q = 1 if x_to > x_from else (0 if x_to == x_from else -1)
-            y_inc_q = 1 if y_to > y_from else (0 if y_to == y_from else -1)
-            for inc in range (1, 8):
-                x_inc, y_inc = inc * x_inc_q, inc * y_inc_q
-                if (self.is_in_bounds(x_from + x_inc, y_from + y_inc) is False
-                    or (x_from + x_inc == x_to and y_from + y_inc == y_to)):
-                    return True
-                if self.current_board[x_from + x_inc, y_from + y_inc] is not False:
-                    return False
-        else:
-            for inc in range(1, 8):
-                x_inc, y_inc = (inc * (1 if x_to > x_from else -1),
-                                inc * (1 if y_to > y_from else -1))
-                if (self.is_in_bounds(x_from + x_inc, y_from + y_inc) is False
-                    or (x_from + x_inc == x_to and y_from + y_inc == y_to)):
-                    return True
-                if self.current_board[x_from + x_inc, y_from + y_inc] is not False:
-                    return False
-        return True
+            return self.__check_rook(move)
+        return self.__check_bishop(move)
 
     def is_move_valid(self, move, is_opponent):
-        """ Checks if the move is valid returns True/False"""
+        """
+            Checks if the move is valid returns True/False, the colour of the moved piece
+            decides which way pawns move so is_opponent does not change the answer
+        """
         x_from, y_from, x_to, y_to = move
-        is_move_valid = False
 
         if ((not (self.is_in_bounds(x_from, y_from)
                   and self.is_in_bounds(x_to, y_to)))
                   or (x_from == x_to and y_from == y_to)
-                  or (self.current_board[x_from, y_from] is False)):
+                  or not self.occupied & square_bit(x_from, y_from)):
             return False
 
-        if isinstance(self.current_board[x_from, y_from], Pawn):
-            is_move_valid = self.__check_pawn(move, is_opponent)
-        elif isinstance(self.current_board[x_from, y_from], Bishop):
+        piece = self.current_board[x_from, y_from]
+        piece_index = PIECE_INDEX[type(piece)]
+        is_piece_opponent = piece.colour != self.colour
+        if piece_index == PAWN:
+            # the colour of the pawn decides its direction, pawns of the player move up
+            is_move_valid = self.__check_pawn(move, is_piece_opponent)
+        elif piece_index == BISHOP:
             is_move_valid = self.__check_bishop(move)
-        elif isinstance(self.current_board[x_from, y_from], Rook):
+        elif piece_index == ROOK:
             is_move_valid = self.__check_rook(move)
-        elif isinstance(self.current_board[x_from, y_from], Queen):
+        elif piece_index == QUEEN:
             is_move_valid = self.__check_queen(move)
         else:
-            is_move_valid = True
+            attacks = KNIGHT_ATTACKS if piece_index == KNIGHT else KING_ATTACKS
+            is_move_valid = bool(attacks[x_from * 8 + y_from] & square_bit(x_to, y_to))
 
         if is_move_valid is False:
             return False
 
-        ret_val = True
-        if (self.current_board[x_to, y_to] is not False
-            and self.current_board[x_to, y_to].colour != self.current_board[x_from, y_from].colour):
-            if isinstance(self.current_board[x_from, y_from], Pawn) and y_to == y_from:
-                ret_val = False
-            return ret_val
+        col = piece.colour.value
+        bit_to = square_bit(x_to, y_to)
+        if self.colour_bitboards[1 - col] & bit_to:
+            return not (piece_index == PAWN and y_to == y_from)
 
-        if self.current_board[x_to, y_to] is False:
-            if isinstance(self.current_board[x_from, y_from], Pawn):
+        if not self.occupied & bit_to:
+            if piece_index == PAWN:
                 if ((y_to != y_from) or abs(x_from - x_to) == 2
-                    and (self.current_board[int((x_from + x_to) / 2), y_to] is not False)):
+                    and self.occupied & square_bit((x_from + x_to) // 2, y_to)):
                     return False
-            return not self.can_take(self.current_board[x_from, y_from].colour, is_opponent)
+            return not self.can_take(piece.colour, is_piece_opponent)
 
         return False
 
-    def can_take(self, colour, is_opponent):
-        """ Checks if any piece of colour can capture anything """
-        coords_col = self.white_pieces_pos if colour == Colour.WHITE else self.black_pieces_pos
-        for coords in coords_col:
-            moves = self.current_board[coords].get_moves(*coords, is_opponent)
-            for move in moves:
-                if (self.current_board[move] is not False
-                    and self.current_board[move].colour != colour):
-                    if self.is_move_valid((*coords, *move), is_opponent):
+    def can_take(self, colour, is_opponent = None):
+        """
+            Checks if any piece of colour can capture anything, pawns of the player's colour
+            move up the board, is_opponent may be left out and must agree with colour if given
+        """
+        side = colour != self.colour
+        assert is_opponent is None or is_opponent == side, "is_opponent disagrees with colour"
+        col = colour.value
+        enemies = self.colour_bitboards[1 - col]
+        occupied = self.occupied
+        bitboards = self.piece_bitboards[col]
+
+        for piece_index, attacks in ((PAWN, PAWN_ATTACKS[side]),
+                                     (KNIGHT, KNIGHT_ATTACKS), (KING, KING_ATTACKS)):
+            for x_coord, y_coord in self.squares_of(bitboards[piece_index]):
+                if enemies & attacks[x_coord * 8 + y_coord]:
+                    return True
+
+        for piece_index, rays in ((BISHOP, BISHOP_RAYS), (ROOK, ROOK_RAYS),
+                                  (QUEEN, BISHOP_RAYS), (QUEEN, ROOK_RAYS)):
+            for x_coord, y_coord in self.squares_of(bitboards[piece_index]):
+                for ray in rays[x_coord * 8 + y_coord]:
+                    for _, _, bit in ray:
+                        if occupied & bit:
+                            if enemies & bit:
+                                return True
+                            break
+        return False
+
+    def generate_legal_moves(self, colour, is_opponent = None):
+        """
+            Returns all legal moves of colour as (x_from, y_from, x_to, y_to) in one pass,
+            captures are listed first and quiet moves only when nothing can be captured.
+            Pawns of the player's colour move up the board, is_opponent may be left out
+            and must agree with colour if given
+        """
+        side = colour != self.colour
+        assert is_opponent is None or is_opponent == side, "is_opponent disagrees with colour"
+        col = colour.value
+        enemies = self.colour_bitboards[1 - col]
+        empty = ~self.occupied
+        bitboards = self.piece_bitboards[col]
+        captures, quiet_moves = [], []
+
+        pawn_captures, pawn_pushes = PAWN_CAPTURES[side], PAWN_PUSHES[side]
+        for x_coord, y_coord in self.squares_of(bitboards[PAWN]):
+            for x_to, y_to, bit in pawn_captures[x_coord * 8 + y_coord]:
+                if enemies & bit:
+                    captures.append((x_coord, y_coord, x_to, y_to))
+            for x_to, y_to, bit in pawn_pushes[x_coord * 8 + y_coord]:
+                if not empty & bit:
+                    break
+                quiet_moves.append((x_coord, y_coord, x_to, y_to))
+
+        for piece_index, targets in ((KNIGHT, KNIGHT_TARGETS), (KING, KING_TARGETS)):
+            for x_coord, y_coord in self.squares_of(bitboards[piece_index]):
+                for x_to, y_to, bit in targets[x_coord * 8 + y_coord]:
+                    if enemies & bit:
+                        captures.append((x_coord, y_coord, x_to, y_to))
+                    elif empty & bit:
+                        quiet_moves.append((x_coord, y_coord, x_to, y_to))
+
+        for piece_index, rays in ((BISHOP, BISHOP_RAYS), (ROOK, ROOK_RAYS),
+                                  (QUEEN, BISHOP_RAYS), (QUEEN, ROOK_RAYS)):
+            for x_coord, y_coord in self.squares_of(bitboards[piece_index]):
+                # rays are walked together so that shorter moves come first,
+                # a ray is left at the first piece on it
+                open_rays = rays[x_coord * 8 + y_coord]
+                inc = 0
+                while open_rays:
+                    still_open = []
+                    for ray in open_rays:
+                        x_to, y_to, bit = ray[inc]
+                        if empty & bit:
+                            quiet_moves.append((x_coord, y_coord, x_to, y_to))
+                            if inc + 1 < len(ray):
+                                still_open.append(ray)
+                        elif enemies & bit:
+                            captures.append((x_coord, y_coord, x_to, y_to))
+                    open_rays = still_open
+                    inc += 1
+
+        return captures if captures else quiet_moves
+
+    def has_legal_moves(self, colour, is_opponent = None):
+        """
+            Returns True if colour can make a move, same as generate_legal_moves() != []
+            but stops at the first move found and does not build the list
+        """
+        side = colour != self.colour
+        assert is_opponent is None or is_opponent == side, "is_opponent disagrees with colour"
+        col = colour.value
+        free = ~self.colour_bitboards[col]
+        enemies = self.colour_bitboards[1 - col]
+        bitboards = self.piece_bitboards[col]
+
+        pawn_attacks, pawn_pushes = PAWN_ATTACKS[side], PAWN_PUSHES[side]
+        for x_coord, y_coord in self.squares_of(bitboards[PAWN]):
+            square = x_coord * 8 + y_coord
+            if pawn_pushes[square] and not self.occupied & pawn_pushes[square][0][2]:
+                return True
+            if enemies & pawn_attacks[square]:
+                return True
+
+        # any other piece can move if one of its neighbouring squares in the directions
+        # it moves is not taken by a piece of its own colour
+        for piece_index, attacks in ((KNIGHT, KNIGHT_ATTACKS), (KING, KING_ATTACKS),
+                                     (QUEEN, KING_ATTACKS)):
+            for x_coord, y_coord in self.squares_of(bitboards[piece_index]):
+                if free & attacks[x_coord * 8 + y_coord]:
+                    return True
+        for piece_index, rays in ((BISHOP, BISHOP_RAYS), (ROOK, ROOK_RAYS)):
+            for x_coord, y_coord in self.squares_of(bitboards[piece_index]):
+                for ray in rays[x_coord * 8 + y_coord]:
+                    if free & ray[0][2]:
                         return True
         return False
 
+    @staticmethod
+    def squares_of(bitboard):
+        """ Yields (x, y) coords of every square set in the bitboard """
+        while bitboard:
+            lowest_bit = bitboard & -bitboard
+            yield divmod(lowest_bit.bit_length() - 1, 8)
+            bitboard ^= lowest_bit
+
     def is_in_bounds(self, x_coord, y_coord):
         """ Returns True if the x, y coords are inside a 8x8 board"""
         return 0 <= x_coord <= 7 and 0 <= y_coord <= 7
@@ -355,12 +650,3 @@ class Board:
     def __promotion(self, x_coord, y_coord, is_opponent = False):
         """ Private method used when promotion is happening """
         return self.move((-1,-1, x_coord, y_coord), is_opponent)
-
-    def highlight_tile(self, window, x_coord, y_coord, colour):
-        """ Highlights the tile on board at x_coord, y_coord"""
-        if self.is_in_bounds(*self.get_tile_based_on_click(window, x_coord, y_coord)) is False:
-            return
-        tile_size = self.get_tile_size(window)  * 1.02
-        tile_surface = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
-        tile_surface.fill(colour)
-        window.blit(tile_surface, (x_coord - tile_size/ 2, y_coord - tile_size / 2))
@@ -0,0 +1,181 @@
+""" Importing argparse to build the book from the command line """
+import argparse
+
+# Importing mmap to read the book without loading it
+import mmap
+
+# Importing os to find the book next to this file and to replace it in one step
+import os
+
+# Importing struct to pack the records of the book
+import struct
+
+# Importing time to report how long the book took to build
+import time
+
+# Importing a class representing a chess board and the position a game starts from
+from antichess.board import Board, STARTING_POSITION
+
+# Importing a colour enum class to represent black and white
+from antichess.colour import Colour
+
+# Importing the engine that searches the moves of the book
+from antichess.engine import Engine
+
+# Importing the transposition table shared by the searches of the builder
+from antichess.transposition import TranspositionTable
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+
+# One record of the book: Board.hash_key, the move packed by encode_move(), the number
+# of times the builder reached the move and its score for the side that plays it.
+# Records are sorted by the key and moves of the same key by the weight, the heaviest first
+RECORD = struct.Struct("<QHHh")
+
+def encode_move(move):
+    """ Packs (x_from, y_from, x_to, y_to) into 12 bits, square from * 64 + square to """
+    x_from, y_from, x_to, y_to = move
+    return (x_from * 8 + y_from) * 64 + x_to * 8 + y_to
+
+def decode_move(code):
+    """ Returns the move packed by encode_move() """
+    square_from, square_to = divmod(code, 64)
+    return (*divmod(square_from, 8), *divmod(square_to, 8))
+
+def write_book(path, records):
+    """ Writes the records (key, move, weight, score) sorted as the book expects them """
+    records = sorted(records, key = lambda record: (record[0], -record[2], -record[3]))
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        for key, move, weight, score in records:
+            file.write(RECORD.pack(key, encode_move(move), min(weight, 0xFFFF), score))
+    os.replace(temporary_path, path)
+    return len(records)
+
+class OpeningBook:
+    """
+        Read-only opening book stored in a file of RECORD records, the file is mapped
+        into memory on the first probe and searched by binary search, so opening it costs
+        nothing and a probe reads only a few records. A missing file is an empty book
+    """
+    path = BOOK_PATH
+
+    def __init__(self, path = BOOK_PATH):
+        self.path = path
+        self.__mapped = None
+        self.__records = None
+
+    def __open(self):
+        if self.__records is not None:
+            return
+        self.__records = 0
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, "rb") as file:
+            self.__mapped = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        self.__records = len(self.__mapped) // RECORD.size
+
+    def __len__(self):
+        """ Returns the number of records in the book """
+        self.__open()
+        return self.__records
+
+    def probe(self, key):
+        """ Returns [(move, weight, score)] stored for the key, the heaviest move first """
+        self.__open()
+        low, high = 0, self.__records
+        while low < high:
+            middle = (low + high) // 2
+            if RECORD.unpack_from(self.__mapped, middle * RECORD.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        entries = []
+        while low < self.__records:
+            found_key, code, weight, score = RECORD.unpack_from(self.__mapped, low * RECORD.size)
+            if found_key != key:
+                break
+            entries.append((decode_move(code), weight, score))
+            low += 1
+        return entries
+
+    def best_move(self, board, legal_moves):
+        """ Returns the heaviest book move of the position that is legal or None """
+        for move, _, _ in self.probe(board.hash_key):
+            if move in legal_moves:
+                return move
+        return None
+
+    def close(self):
+        """ Unmaps the file, the next probe maps it again """
+        if self.__mapped is not None:
+            self.__mapped.close()
+        self.__mapped, self.__records = None, None
+
+# The book shared by the whole app
+OPENING_BOOK = OpeningBook()
+
+def build_book(path = BOOK_PATH, depth = 3, engine_moves = 2, time_limit = None,
+               starting_position = STARTING_POSITION):
+    """
+        Builds the book by letting the engine answer every possible move of the player,
+        for both colours of the player, until the engine made engine_moves moves, every
+        engine move is a search of the depth (or the time_limit), returns the number of records
+    """
+    weights, searched = {}, {}
+    table = TranspositionTable(Engine.TRANSPOSITION_TABLE_MB)
+
+    def add_replies(board, engine_colour, engine_to_move, moves_left):
+        if engine_to_move is False:
+            player_colour = board.colour
+            for move in board.generate_legal_moves(player_colour, False):
+                board.move(move, False, False)
+                add_replies(board, engine_colour, True, moves_left)
+                board.unmake_last_move()
+            return
+
+        moves = board.generate_legal_moves(engine_colour, True)
+        if moves_left == 0 or len(moves) == 0:
+            return
+        key = board.hash_key
+        if key not in searched:
+            engine = Engine(board, depth, engine_colour, table, time_limit)
+            move = engine.get_best_move()
+            searched[key] = (move, 0 if engine.best_score is None else engine.best_score)
+        move, score = searched[key]
+        # a position with one move is played without searching anyway
+        if len(moves) > 1:
+            weight = weights.get((key, move), (0, score))[0]
+            weights[(key, move)] = (weight + 1, score)
+        board.move(move, True, False)
+        add_replies(board, engine_colour, False, moves_left - 1)
+        board.unmake_last_move()
+
+    for player_colour in (Colour.WHITE, Colour.BLACK):
+        engine_colour = Colour.BLACK if player_colour == Colour.WHITE else Colour.WHITE
+        board = Board(player_colour, starting_position)
+        add_replies(board, engine_colour, engine_colour == Colour.WHITE, engine_moves)
+
+    return write_book(path, [(key, move, weight, score)
+                             for (key, move), (weight, score) in weights.items()])
+
+def main(arguments = None):
+    """ Command line entry point, run with python -m antichess.book --help """
+    parser = argparse.ArgumentParser(description = "Builds the opening book of the engine")
+    parser.add_argument("--output", default = BOOK_PATH)
+    parser.add_argument("--depth", type = int, default = 3,
+                        help = "depth of the search of every engine move")
+    parser.add_argument("--moves", type = int, default = 2,
+                        help = "number of engine moves stored along every line")
+    parser.add_argument("--time-limit", type = float, default = None,
+                        help = "seconds for every engine move instead of the fixed depth")
+    args = parser.parse_args(arguments)
+
+    start = time.perf_counter()
+    records = build_book(args.output, args.depth, args.moves, args.time_limit)
+    print(f"{records} records written to {args.output} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
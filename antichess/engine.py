@@ -1,126 +1,569 @@
-""" Import copy to help create a deepcopy of the chess board """
-import copy
+""" Importing time to keep the search inside of its time budget """
+import time
+
+# Importing os to tell the tables of different processes apart
+import os
+
+# Importing a process pool to search root moves on more cores
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Importing a lock to hand out the stop flags to searches of several threads
+import threading
+
+# Importing shared memory that holds the stop flags of the searches in the pools
+import multiprocessing
 
 # Importing a class representing a chess board
-from antichess.board import Board
+from antichess.board import Board, square_bit
 
 # Importing a colour enum class to represent black and white
 from antichess.colour import Colour
 
+# Importing the transposition table and the bound types of its entries
+from antichess.transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+# Importing the move ordering used by the search
+from antichess.ordering import MoveOrderer
+
+# Importing the results stored in the endgame tablebases
+from antichess.tablebase import WIN, DRAW
+
+# Importing the scoring of many positions at once used for the last ply
+from antichess.batch import child_codes, evaluate_batch, moves_batch
+
+# Process pools shared by all engines, one per number of workers, several searches can use
+# a pool at once (pondering next to the search, the two engines of a match game)
+_PROCESS_POOLS = {}
+
+# One stop flag for every search that runs in a pool at the same time, a search takes a free
+# slot, sets it to stop its own root moves only and gives it back once they all ended
+STOP_SLOTS = 64
+_STOP_FLAGS = multiprocessing.RawArray("b", STOP_SLOTS)
+_FREE_STOP_SLOTS = list(range(0, STOP_SLOTS))
+_STOP_SLOTS_LOCK = threading.Lock()
+
+# Transposition table of a pool worker process, kept between the root moves it searches
+# as long as they come from the same table of the same process with the same settings
+_WORKER_TABLE = None
+_WORKER_TABLE_KEY = None
+
+# Stop flags as seen by a worker process
+_WORKER_STOP_FLAGS = None
+
+class StopFlag:
+    """ The stop slot of one search, read by its workers like an event with is_set() """
+    __slots__ = ("flags", "slot")
+
+    def __init__(self, flags, slot):
+        self.flags = flags
+        self.slot = slot
+
+    def is_set(self):
+        """ Returns True once the search of the slot was stopped """
+        return self.flags[self.slot] != 0
+
+    def set(self):
+        """ Stops the root moves of the search of the slot """
+        self.flags[self.slot] = 1
+
+def _take_stop_slot():
+    """ Returns a free stop slot with its flag cleared """
+    with _STOP_SLOTS_LOCK:
+        if not _FREE_STOP_SLOTS:
+            raise RuntimeError(f"more than {STOP_SLOTS} parallel searches at once")
+        slot = _FREE_STOP_SLOTS.pop()
+    _STOP_FLAGS[slot] = 0
+    return slot
+
+def _give_back_stop_slot(slot):
+    """ Returns the slot of a search whose root moves all ended """
+    with _STOP_SLOTS_LOCK:
+        _FREE_STOP_SLOTS.append(slot)
+
+def _init_worker(stop_flags):
+    """ Runs once in every new pool worker and keeps the stop flags of the searches """
+    global _WORKER_STOP_FLAGS # pylint: disable=global-statement
+    _WORKER_STOP_FLAGS = stop_flags
+
+def get_process_pool(workers):
+    """ Returns a process pool with the number of workers, pools are created once and reused """
+    if workers not in _PROCESS_POOLS:
+        _PROCESS_POOLS[workers] = ProcessPoolExecutor(
+            max_workers = workers, initializer = _init_worker, initargs = (_STOP_FLAGS,))
+    return _PROCESS_POOLS[workers]
+
+def _search_root_move(position, move, depth, colour_value, deadline, node_limit,
+                      quiescence_node_limit, table_key, stop_slot):
+    """
+        Runs in a pool worker, rebuilds the board from the position tuple
+        (Board.to_bytes(), piece square tables)
+        and returns (evaluation of the engine's move, was the search stopped, nodes),
+        deadline is the time.time() the search has to end at, so a move that waited in
+        the queue of the pool gets only the time that is left, table_key identifies the
+        table and the settings of the search, the worker starts a new table when it changes,
+        stop_slot is the stop flag of the search
+    """
+    global _WORKER_TABLE, _WORKER_TABLE_KEY # pylint: disable=global-statement
+    if _WORKER_TABLE is None or _WORKER_TABLE_KEY != table_key:
+        _WORKER_TABLE = TranspositionTable(Engine.TRANSPOSITION_TABLE_MB)
+        _WORKER_TABLE_KEY = table_key
+    time_limit = None if deadline is None else max(0.0, deadline - time.time())
+    board = Board.from_bytes(*position)
+    engine = Engine(board, depth, Colour(colour_value), _WORKER_TABLE, time_limit, node_limit,
+                    quiescence_node_limit = quiescence_node_limit)
+    engine.stop_event = StopFlag(_WORKER_STOP_FLAGS, stop_slot)
+    evaluation = engine.evaluate_move(move, depth)
+    return evaluation, engine.stopped, engine.nodes
+
 
 class Engine:
     """ Class that represents the engine or the opponent the player is playing against """
     board = Board()
     colour = None
     depth = 5
+    nodes = 0
+    transposition_table = None
+    time_limit = None
+    node_limit = None
+    completed_depth = -1
+    stopped = False
+    move_orderer = None
+    workers = 1
+    quiescence_node_limit = 256
+    quiescence_nodes = 0
+    book = None
+    tablebase = None
+    best_score = None
+    # called as on_iteration(depth, score, move) after every completed iteration
+    on_iteration = None
+    # stop flag of the search a worker runs a root move of, see StopFlag
+    stop_event = None
     MAX_EVAL = 64 * 9 # if all board was filled with white queens (the most powerful piece)
+    TRANSPOSITION_TABLE_MB = 16
+    MAX_SEARCH_DEPTH = 64 # depth of the deepest iteration when only a budget limits the search
+    PARALLEL_MIN_DEPTH = 2 # shallower iterations are faster to search than to send to workers
+    BATCH_MIN_LEAVES = 12 # fewer leaves are faster to score one by one than with numpy
+    POLL_INTERVAL = 0.02 # seconds between the checks of stop() while workers search
+
+    def __init__(self, board, depth, colour_of_engine, transposition_table = None,
+                 time_limit = None, node_limit = None, workers = 1,
+                 quiescence_node_limit = 256, book = None, tablebase = None):
+        """
+            transposition_table can be shared between engines so that a game keeps
+            what was searched on previous moves, a new one is created if it is None
+
+            time_limit in seconds and node_limit bound the iterative deepening,
+            depth can be None when the search should be limited only by them
 
-    def __init__(self, board, depth, colour_of_engine):
-        self.board = copy.deepcopy(board)
-        self.depth = depth
+            workers > 1 splits the root moves of deeper iterations between processes,
+            the node_limit then applies to each root move separately
+
+            at depth 0 captures are searched until the side to move has none, since
+            capturing is compulsory, quiescence_node_limit bounds the nodes of one such
+            search and 0 turns it off
+
+            book is an OpeningBook, a position found in it is played without searching,
+            tablebase is a Tablebase, positions it covers are not searched but looked up
+        """
+        self.board = board.clone()
+        self.depth = self.MAX_SEARCH_DEPTH if depth is None else depth
         self.colour = Colour.WHITE if colour_of_engine == Colour.WHITE else Colour.BLACK
+        self.nodes = 0
+        self.transposition_table = (TranspositionTable(self.TRANSPOSITION_TABLE_MB)
+                                    if transposition_table is None else transposition_table)
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.completed_depth = -1
+        self.stopped = False
+        self.move_orderer = MoveOrderer()
+        self.workers = workers
+        self.quiescence_node_limit = quiescence_node_limit
+        self.quiescence_nodes = 0
+        self.book = book
+        self.tablebase = tablebase
+        self.best_score = None
+        self.__deadline = None
+        self.__quiescence_budget = 0
 
     def get_best_move(self):
-        """ Returns the best found move in the depth = self.depth """
-        best_eval = self.MAX_EVAL if self.colour == Colour.WHITE else -self.MAX_EVAL
-        best_move = (0, 0, 0, 0)
-        what_col = bool(self.colour == Colour.WHITE)
-        pieces_coords = self.board.white_pieces_pos if what_col else self.board.black_pieces_pos
-        moves_valid= []
-
-        for coords in pieces_coords:
-            moves = self.board.current_board[coords].get_moves(*coords, True)
-            for move in moves:
-                if self.board.is_move_valid((*coords, *move), True):
-                    moves_valid.append((*coords, *move))
+        """
+            Searches depth 0, 1, 2 ... up to self.depth (plies after the engine's move)
+            and returns the best move of the last iteration that was not cut by the budget,
+            best_score is then its score for the engine
+        """
+        moves_valid = self.board.generate_legal_moves(self.colour, True)
 
+        if len(moves_valid) == 0:
+            return (0, 0, 0, 0)
         if len(moves_valid) == 1:
             return moves_valid[0]
+        if self.book is not None:
+            book_move = self.book.best_move(self.board, moves_valid)
+            if book_move is not None:
+                return book_move
+        if self.tablebase is not None:
+            tablebase_move = self.__tablebase_move(moves_valid)
+            if tablebase_move is not None:
+                return tablebase_move
 
-        if len(moves_valid) > 1:
-            for move in moves_valid:
-                self.board.move(move, True)
-                new_eval=self.__minimax(self.depth,(-self.MAX_EVAL,self.MAX_EVAL), False)
-                self.board.unmake_last_move()
-                if self.colour == Colour.WHITE and new_eval < best_eval:
-                    best_eval = new_eval
-                    best_move = move
-                elif self.colour == Colour.BLACK and new_eval > best_eval:
-                    best_eval = new_eval
-                    best_move = move
+        self.__start_search()
+        best_move = moves_valid[0]
+
+        for iteration_depth in range(0, self.depth + 1):
+            if self.workers > 1 and iteration_depth >= self.PARALLEL_MIN_DEPTH:
+                best_eval, iteration_move = self.__search_root_parallel(
+                    moves_valid, iteration_depth)
+            else:
+                best_eval, iteration_move = self.__search_root(moves_valid, iteration_depth)
+            if self.stopped:
+                break
+            best_move, self.best_score = iteration_move, best_eval
+            self.completed_depth = iteration_depth
+            if self.on_iteration is not None:
+                self.on_iteration(iteration_depth, best_eval, best_move)
+            # the best move of this iteration is searched first in the next one
+            moves_valid.remove(best_move)
+            moves_valid.insert(0, best_move)
+            if best_eval == self.MAX_EVAL:
+                break
 
         return best_move
 
-    def __minimax(self, depth, alpha_beta, is_op):
-        play_col = Colour.WHITE if self.colour == Colour.BLACK else Colour.BLACK
-        colour_to_play = self.colour if is_op else play_col
+    def __start_search(self):
+        """ Resets the state of the previous search and starts the clock of the time budget """
+        self.stopped = False
+        self.completed_depth = -1
+        self.best_score = None
+        self.__deadline = (None if self.time_limit is None
+                           else time.perf_counter() + self.time_limit)
+
+    def evaluate_move(self, move, depth):
+        """ Returns the evaluation of the engine's move with depth plies searched below it """
+        self.__start_search()
+        return self.__search_move(move, depth)
 
-        if depth == 0 or abs(self.evaluate(colour_to_play)) == self.MAX_EVAL:
-            eval_return = self.evaluate(colour_to_play)
-            return eval_return
+    def __search_move(self, move, depth):
+        self.board.move(move, True, False)
+        score = -self.__negamax(depth, -self.MAX_EVAL, self.MAX_EVAL, False, 1)
+        self.board.unmake_last_move()
+        return score if self.colour == Colour.BLACK else -score
 
-        what_col = colour_to_play == Colour.WHITE
-        best_eval = self.MAX_EVAL if what_col else -self.MAX_EVAL
-        pieces_coords = self.board.white_pieces_pos if what_col else self.board.black_pieces_pos
+    def __search_root(self, moves, depth):
+        """
+            Returns the score of the best of the moves for the engine and the first move
+            that has it, the best score so far is the alpha of the following moves
+        """
+        alpha, beta = -self.MAX_EVAL, self.MAX_EVAL
+        best_score, best_move = None, None
+        for move_number, move in enumerate(moves):
+            self.board.move(move, True, False)
+            score = self.__search_child(depth, alpha, beta, False, 1, move_number == 0)
+            self.board.unmake_last_move()
+            if self.stopped:
+                return None, None
+            if best_score is None or score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best_score, best_move
 
-        for coords in pieces_coords:
-            what_col = colour_to_play == self.colour
-            moves = self.board.current_board[coords].get_moves(*coords, what_col)
+    def __search_root_parallel(self, moves, depth):
+        """
+            Same as __search_root but every root move is searched by a pool worker,
+            the futures are polled so that stop() reaches the workers through the stop
+            flag of this search, moves that did not start yet are cancelled then
+        """
+        position = (self.board.to_bytes(), self.board.piece_square_tables)
+        deadline = None
+        if self.__deadline is not None:
+            deadline = time.time() + max(0.0, self.__deadline - time.perf_counter())
+
+        pool = get_process_pool(self.workers)
+        # scores of another game or of other settings must not reach this search
+        table_key = (os.getpid(), self.transposition_table.identity, self.quiescence_node_limit)
+        stop_slot = _take_stop_slot()
+        stop_flag = StopFlag(_STOP_FLAGS, stop_slot)
+        futures = []
+        try:
             for move in moves:
-                if self.board.is_move_valid((*coords, *move), is_op):
-                    self.board.move((*coords, *move), is_op)
-                    new_eval = self.__minimax(depth - 1, alpha_beta, not is_op)
-                    self.board.unmake_last_move()
-                    if colour_to_play == Colour.WHITE:
-                        if new_eval < best_eval:
-                            best_eval = new_eval
-                        alpha_beta = max(alpha_beta[0], new_eval), alpha_beta[1]
-                        if alpha_beta[0] >= alpha_beta[1]:
-                            return best_eval
-                    else:
-                        if new_eval > best_eval:
-                            best_eval = new_eval
-                        alpha_beta = alpha_beta[0], min(alpha_beta[1], new_eval)
-                        if alpha_beta[0] >= alpha_beta[1]:
-                            return best_eval
-
-        return best_eval
+                futures.append(pool.submit(_search_root_move, position, move, depth,
+                                           self.colour.value, deadline, self.node_limit,
+                                           self.quiescence_node_limit, table_key, stop_slot))
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout = self.POLL_INTERVAL,
+                                     return_when = FIRST_COMPLETED)
+                for future in done:
+                    if not future.cancelled():
+                        _, stopped, nodes = future.result()
+                        self.nodes += nodes
+                        self.stopped = self.stopped or stopped
+                if self.stopped and pending and not stop_flag.is_set():
+                    for future in pending:
+                        future.cancel()
+                    stop_flag.set()
+        finally:
+            # no root move of this search runs any more once all futures are done
+            wait(futures)
+            _give_back_stop_slot(stop_slot)
+        if self.stopped:
+            return None, None
+        return self.__pick_best(moves, [future.result()[0] for future in futures])
 
-    def evaluate(self, colour_to_play):
-        """ Returns an evaluation of the board = Black -> wants positive, White -> wants negative"""
-        evaluation = 0
+    def __pick_best(self, moves, evaluations):
+        """ Returns the best score for the engine and the first move that has it """
+        sign = 1 if self.colour == Colour.BLACK else -1
+        best_score, best_move = None, None
+        for move, new_eval in zip(moves, evaluations):
+            if best_score is None or sign * new_eval > best_score:
+                best_score, best_move = sign * new_eval, move
+        return best_score, best_move
+
+    def stop(self):
+        """ Stops the running search, get_best_move returns the last completed result """
+        self.stopped = True
 
+    def __out_of_budget(self):
+        """ Returns True if the node or time budget of the search ran out or it was stopped """
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            return True
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        return self.__deadline is not None and time.perf_counter() >= self.__deadline
+
+    def __tablebase_score(self, colour_to_play):
+        """
+            Returns the score of a position covered by the tablebase for colour_to_play
+            or None, shorter wins and longer losses score better
+        """
+        if self.tablebase is None or (len(self.board.white_pieces_pos)
+                + len(self.board.black_pieces_pos) > self.tablebase.max_pieces):
+            return None
+        found = self.tablebase.probe(self.board, colour_to_play)
+        if found is None:
+            return None
+        result, distance = found
+        if result == DRAW:
+            return 0
+        return self.MAX_EVAL - distance if result == WIN else distance - self.MAX_EVAL
+
+    def __tablebase_move(self, moves):
+        """ Returns the move with the best tablebase score or None if it does not cover them """
+        player_colour = Colour.WHITE if self.colour == Colour.BLACK else Colour.BLACK
+        best_score, best_move = None, None
+        for move in moves:
+            self.board.move(move, True, False)
+            if len(self.board.white_pieces_pos) == 0 or len(self.board.black_pieces_pos) == 0:
+                # the engine captured the last piece of the player who wins
+                score = -self.MAX_EVAL
+            else:
+                score = self.__tablebase_score(player_colour)
+                score = None if score is None else -score
+            self.board.unmake_last_move()
+            if score is None:
+                return None
+            if best_score is None or score > best_score:
+                best_score, best_move = score, move
+        self.best_score = best_score
+        return best_move
+
+    def __search_child(self, depth, alpha, beta, is_op, ply, is_first):
+        """
+            Returns the score of the move just made for the side that made it, the first
+            move is searched with the full window and the others with a null window
+            that only tells if they beat alpha, and only then they are searched again
+        """
+        if is_first:
+            return -self.__negamax(depth, -beta, -alpha, is_op, ply)
+        score = -self.__negamax(depth, -alpha - 1, -alpha, is_op, ply)
+        if alpha < score < beta and not self.stopped:
+            score = -self.__negamax(depth, -beta, -alpha, is_op, ply)
+        return score
+
+    def __negamax(self, depth, alpha, beta, is_op, ply):
+        """
+            Principal variation search returning the evaluation from the point of view
+            of the side to move, ply is the distance from the root used for the killer moves
+        """
+        self.nodes += 1
+        if self.stopped or (self.nodes & 127 == 0 or self.node_limit is not None) and (
+                self.__out_of_budget()):
+            self.stopped = True
+            return 0
+        play_col = Colour.WHITE if self.colour == Colour.BLACK else Colour.BLACK
+        colour_to_play = self.colour if is_op else play_col
+        # black maximizes the evaluation and white minimizes it
+        sign = 1 if colour_to_play == Colour.BLACK else -1
+
+        # a side without pieces or moves wins, a leaf only checks that a move exists,
+        # other nodes find it out from the moves they generate
         if len(self.board.white_pieces_pos) == 0:
-            return -self.MAX_EVAL
+            return -sign * self.MAX_EVAL
         if len(self.board.black_pieces_pos) == 0:
+            return sign * self.MAX_EVAL
+        tablebase_score = self.__tablebase_score(colour_to_play)
+        if tablebase_score is not None:
+            return tablebase_score
+        if depth == 0:
+            if self.quiescence_node_limit > 0:
+                self.__quiescence_budget = self.quiescence_node_limit
+                return self.__quiescence(alpha, beta, is_op, ply)
+            if not self.board.has_legal_moves(colour_to_play, is_op):
+                return self.MAX_EVAL
+            return sign * self.board.evaluation
+
+        key = self.board.hash_key
+        entry = self.transposition_table.probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                if entry[3] == EXACT:
+                    return entry[2]
+                if entry[3] == LOWER:
+                    alpha = max(alpha, entry[2])
+                else:
+                    beta = min(beta, entry[2])
+                if alpha >= beta:
+                    return entry[2]
+        original_alpha, original_beta = alpha, beta
+
+        moves = self.board.generate_legal_moves(colour_to_play, is_op)
+        if len(moves) == 0:
             return self.MAX_EVAL
-        if self.__check_stalemate(colour_to_play):
-            if colour_to_play == Colour.WHITE:
-                return -self.MAX_EVAL
+        moves = self.move_orderer.order(self.board, moves, ply, tt_move)
+
+        best_score, best_move, leaf_scores = None, None, None
+        for move_number, move in enumerate(moves):
+            # the first move often cuts, the leaves after the other moves are scored together
+            if depth == 1 and move_number == 1:
+                leaf_scores = self.__leaf_scores(moves[1:], colour_to_play, is_op)
+                if self.stopped:
+                    return 0
+            if leaf_scores is not None and leaf_scores[move_number - 1] is not None:
+                score = leaf_scores[move_number - 1]
+            else:
+                self.board.move(move, is_op, False)
+                score = self.__search_child(depth - 1, alpha, beta, not is_op, ply + 1,
+                                            move_number == 0)
+                self.board.unmake_last_move()
+                if self.stopped:
+                    return 0
+            if best_score is None or score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.move_orderer.record_cutoff(self.board, move, ply, depth, move_number)
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= original_beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.transposition_table.store(key, depth, best_score, bound, best_move)
+        return best_score
+
+    def __leaf_scores(self, moves, colour_to_play, is_op):
+        """
+            Scores the leaves after the moves of colour_to_play together, returns the score
+            of every move for colour_to_play or None for a move whose leaf has to be searched
+            because a capture follows it, returns None when the leaves are not worth batching,
+            when the tablebase covers them or when they could go over the node_limit
+        """
+        if len(moves) < self.BATCH_MIN_LEAVES or self.tablebase is not None and (
+                len(self.board.white_pieces_pos) + len(self.board.black_pieces_pos)
+                <= self.tablebase.max_pieces + 1):
+            return None
+        if self.node_limit is not None and self.nodes + len(moves) > self.node_limit:
+            return None
+        codes = child_codes(self.board, moves, is_op)
+        other_colour = Colour.WHITE if colour_to_play == Colour.BLACK else Colour.BLACK
+        can_capture, can_move = moves_batch(codes, other_colour, not is_op)
+        white_left, black_left = (codes > 0).any(axis = 1), (codes < 0).any(axis = 1)
+        # scores are white minus black like Board.evaluation until they are returned
+        scores = evaluate_batch(codes, self.board.colour, self.board.piece_square_tables)
+        scores[~can_move] = -self.MAX_EVAL if other_colour == Colour.WHITE else self.MAX_EVAL
+        scores[~white_left] = -self.MAX_EVAL
+        scores[~black_left] = self.MAX_EVAL
+        # a leaf where a capture is forced is searched by __quiescence, without it the
+        # side to move stands pat like in __negamax
+        searched = can_capture & white_left & black_left
+        if self.quiescence_node_limit <= 1:
+            searched[:] = False
+
+        self.nodes += len(moves) - int(searched.sum())
+        if self.__out_of_budget():
+            self.stopped = True
+            return None
+        sign = 1 if colour_to_play == Colour.BLACK else -1
+        return [None if is_searched else sign * score
+                for score, is_searched in zip(scores.tolist(), searched.tolist())]
+
+    def __quiescence(self, alpha, beta, is_op, ply):
+        """
+            Searches the captures below a leaf of __negamax until the side to move has none,
+            returns the evaluation from the point of view of the side to move
+
+            Only a side that cannot capture may stand pat, a side that can is forced to take
+            so the static evaluation says nothing about its position. When the node budget
+            of the search runs out the static evaluation is used anyway
+        """
+        self.nodes += 1
+        self.quiescence_nodes += 1
+        self.__quiescence_budget -= 1
+        if self.stopped or (self.nodes & 127 == 0 or self.node_limit is not None) and (
+                self.__out_of_budget()):
+            self.stopped = True
+            return 0
+        play_col = Colour.WHITE if self.colour == Colour.BLACK else Colour.BLACK
+        colour_to_play = self.colour if is_op else play_col
+        sign = 1 if colour_to_play == Colour.BLACK else -1
+
+        if len(self.board.white_pieces_pos) == 0:
+            return -sign * self.MAX_EVAL
+        if len(self.board.black_pieces_pos) == 0:
+            return sign * self.MAX_EVAL
+        tablebase_score = self.__tablebase_score(colour_to_play)
+        if tablebase_score is not None:
+            return tablebase_score
+
+        moves = self.board.generate_legal_moves(colour_to_play, is_op)
+        if len(moves) == 0:
             return self.MAX_EVAL
+        first = moves[0]
+        if self.__quiescence_budget <= 0 or not self.board.occupied & square_bit(first[2],
+                                                                                  first[3]):
+            return sign * self.board.evaluation
 
-        for coord in self.board.white_pieces_pos:
-            evaluation += self.board.current_board[coord].get_value()
+        best_score = None
+        for move in self.move_orderer.order(self.board, moves, ply):
+            self.board.move(move, is_op, False)
+            score = -self.__quiescence(-beta, -alpha, not is_op, ply + 1)
+            self.board.unmake_last_move()
+            if self.stopped:
+                return 0
+            if best_score is None or score > best_score:
+                best_score = score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best_score
 
-        for coord in self.board.black_pieces_pos:
-            evaluation -= self.board.current_board[coord].get_value()
+    def evaluate(self, colour_to_play):
+        """ Returns an evaluation of the board = Black -> wants positive, White -> wants negative"""
 
-        return evaluation
+        if len(self.board.white_pieces_pos) == 0:
+            return -self.MAX_EVAL
+        if len(self.board.black_pieces_pos) == 0:
+            return self.MAX_EVAL
+        if not self.board.has_legal_moves(colour_to_play, colour_to_play == self.colour):
+            return self.__no_moves_score(colour_to_play)
 
-    def __check_stalemate(self, colour):
-        if colour == Colour.WHITE:
-            is_op = self.colour == Colour.WHITE
-            for coords in self.board.white_pieces_pos:
-                moves = self.board.current_board[coords].get_moves(*coords, is_op)
-                for move in moves:
-                    if self.board.is_move_valid((*coords, *move), is_op):
-                        return False
-            return True
+        return self.board.evaluation
 
-        is_op = self.colour == Colour.BLACK
-        for coords in self.board.black_pieces_pos:
-            moves = self.board.current_board[coords].get_moves(*coords, is_op)
-            for move in moves:
-                if self.board.is_move_valid((*coords, *move), is_op):
-                    return False
-        return True
+    def __no_moves_score(self, colour_to_play):
+        """ Returns the evaluation of a position where colour_to_play cannot move and wins """
+        return -self.MAX_EVAL if colour_to_play == Colour.WHITE else self.MAX_EVAL
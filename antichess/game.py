@@ -1,8 +1,8 @@
 """ Import pygame to draw the game on the window """
 import pygame
 
-# Import board that the game is played on
-from antichess.board import Board
+# Import board that the game is played on and the position a game starts from
+from antichess.board import Board, STARTING_POSITION
 
 # Import colour to represent black and white
 from antichess.colour import Colour
@@ -10,21 +10,67 @@ from antichess.colour import Colour
 # Import engine to be the enemy a player plays against
 from antichess.engine import Engine
 
+# Import the transposition table the engine keeps between its moves
+from antichess.transposition import TranspositionTable
+
+# Import the handle of an engine search running in the background
+from antichess.worker import SearchHandle
+
+# Import the opening book the engine plays from
+from antichess.book import OPENING_BOOK
+
+# Import the endgame tablebases the engine looks positions up in
+from antichess.tablebase import TABLEBASE
+
+# Import the cache of fonts
+from antichess.assets import ASSETS
+
+# Import the view that draws the board on the window
+from antichess.render import BoardView
+
+# Event posted by the search thread when the engine found its move
+ENGINE_MOVED = pygame.event.custom_type()
+
 class Game:
     """ Class representing a current game that is being played """
     window = None
     player_colour = Colour.WHITE
     board = Board(player_colour)
+    view = None
     depth = 1
     app_is_running = False
+    transposition_table = None
+    time_limit = None
+    ponder = False
+    clock = None
+    MAX_FPS = 60
+    # How long the loop sleeps waiting for an event, while the engine is searching
+    # the progress strip is refreshed at least this often
+    IDLE_TIMEOUT_MS = 1000
+    SEARCH_TIMEOUT_MS = 100
+    # Events after which the whole window is drawn again, like the menu of App does
+    REDRAW_EVENTS = (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED, pygame.WINDOWEXPOSED)
 
     def __init__(self, window, colour = Colour.WHITE, depth = 1,
-                start_pos =
-                "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR"):
+                start_pos = STARTING_POSITION,
+                time_limit = None, ponder = False):
+        """
+            time_limit is the number of seconds the engine can think about a move,
+            with ponder the engine keeps searching on the player's time the position
+            after the reply it expects and continues that search if the player plays it
+        """
         self.window = window
         self.player_colour = Colour.WHITE if colour == Colour.WHITE else Colour.BLACK
         self.board = Board(self.player_colour, start_pos)
+        self.view = BoardView(self.board)
         self.depth = depth
+        self.transposition_table = TranspositionTable(Engine.TRANSPOSITION_TABLE_MB)
+        self.time_limit = time_limit
+        self.ponder = ponder
+        self.clock = pygame.time.Clock()
+        self.__pondering = None
+        self.__shown_progress = None
+        self.__redraw_all = True
 
     def start_game(self):
         """ Starts the game loop """
@@ -32,46 +78,54 @@ class Game:
             True, False, False, bool(self.player_colour == Colour.WHITE))
         displayed_moves = []
         played_move, current_piece = (0,0,0,0), (0,0)
-
-        self.window.fill((238,238,228))
-        self.board.display_board(self.window)
-        pygame.display.flip()
+        search = None
 
         while self.app_is_running:
-            if player_move is False:
-                played_move = Engine(self.board,
-                                   self.depth,
-                                   Colour.WHITE if (
-                                       self.player_colour != Colour.WHITE
-                                       ) else Colour.BLACK
-                                  ).get_best_move()
+            if player_move is False and search is None:
+                search = self.__start_search(played_move)
+
+            if search is not None and search.done():
+                played_move = search.result()
+                search = None
                 self.board.move(played_move, True)
-                self.board.highlight_tile(self.window, played_move[0],
-                                           played_move[1], (0, 0, 255, 90))
-                self.board.highlight_tile(self.window, played_move[2],
-                                           played_move[3], (0, 0, 255, 90))
                 player_move, already_checked = True, False
-
-                self.window.fill((238,238,228))
-                self.board.display_board(self.window)
+                self.__start_pondering()
 
             if already_checked is False and self.check_win(player_move) != "":
-                pygame.display.flip()
+                pygame.display.update(self.__render(played_move, displayed_moves, search))
+                self.__stop_pondering()
                 return self.check_win(player_move)
+            already_checked = True
+
+            changed_rects = self.__render(played_move, displayed_moves, search)
+            if changed_rects:
+                pygame.display.update(changed_rects)
+                self.clock.tick(self.MAX_FPS)
 
-            for event in pygame.event.get():
+            for event in self.__wait_for_events(search):
                 if event.type == pygame.QUIT:
                     self.app_is_running = False
+                    if search is not None:
+                        search.cancel()
+                    self.__stop_pondering()
                     return "QUIT"
-                if event.type == pygame.MOUSEBUTTONDOWN:
+                if event.type in self.REDRAW_EVENTS:
+                    # an uncovered or resized window lost what was drawn on it
+                    self.__shown_progress = False
+                    self.__redraw_all = True
+                if event.type == pygame.KEYDOWN and search is not None:
+                    # space or escape make the engine play the best move it found so far
+                    if event.key in (pygame.K_SPACE, pygame.K_ESCAPE):
+                        search.cancel()
+                if event.type == pygame.MOUSEBUTTONDOWN and player_move:
                     pos = pygame.mouse.get_pos()
-                    x_min = (self.board.get_coords(self.window, 0, 0)[0]
-                             - self.board.get_tile_size(self.window) / 2)
-                    y_min = (self.board.get_coords(self.window, 0, 0)[1]
-                            - self.board.get_tile_size(self.window) / 2)
-                    x_max = x_min + self.board.get_size_of_board(self.window)
-                    y_max = y_min + self.board.get_size_of_board(self.window)
-                    current_click = self.board.get_tile_based_on_click(self.window, *pos)
+                    x_min = (self.view.get_coords(self.window, 0, 0)[0]
+                             - self.view.get_tile_size(self.window) / 2)
+                    y_min = (self.view.get_coords(self.window, 0, 0)[1]
+                            - self.view.get_tile_size(self.window) / 2)
+                    x_max = x_min + self.view.get_size_of_board(self.window)
+                    y_max = y_min + self.view.get_size_of_board(self.window)
+                    current_click = self.view.get_tile_based_on_click(self.window, *pos)
 
                     if moves_displayed and current_click in displayed_moves:
                         if self.board.move((*current_piece, *current_click)):
@@ -87,37 +141,105 @@ class Game:
                         pos[0] <= x_max and pos[1] <= y_max
                         )
                     if in_bounds is True:
-                        current_piece = self.board.get_tile_based_on_click(self.window, *pos)
+                        current_piece = self.view.get_tile_based_on_click(self.window, *pos)
 
                     moves_displayed = bool(
                         in_bounds and self.board.current_board[current_piece] is not False
                         and self.board.current_board[current_piece].colour == self.player_colour)
-                    displayed_moves= self.board.display_moves(
-                        self.window, *current_piece, False
+                    displayed_moves= self.board.legal_moves_from(
+                        *current_piece, False
                         ) if moves_displayed else []
 
-            self.window.fill((238,238,228))
-            self.board.display_board(self.window)
+    def __wait_for_events(self, search):
+        """
+            Sleeps until there is an event or the timeout passes and returns the pending
+            events, the engine posts ENGINE_MOVED when its search finishes
+        """
+        timeout = self.IDLE_TIMEOUT_MS if search is None else self.SEARCH_TIMEOUT_MS
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
 
-            if played_move != (0,0,0,0) :
-                self.board.highlight_tile(self.window,
-                    *self.board.get_coords(self.window, played_move[1], played_move[0]),
-                    (0, 0, 255, 40))
-                self.board.highlight_tile(self.window,
-                    *self.board.get_coords(self.window, played_move[3], played_move[2]),
-                    (0, 0, 255, 40))
+    def __render(self, played_move, displayed_moves, search):
+        """
+            Draws what changed since the last frame: tiles of the last move, of the
+            selected piece's moves and the search progress, returns the changed rects
+        """
+        highlights = {}
+        if played_move != (0,0,0,0):
+            highlights[(played_move[0], played_move[1])] = [(0, 0, 255, 40)]
+            highlights[(played_move[2], played_move[3])] = [(0, 0, 255, 40)]
+        for square in displayed_moves:
+            highlights.setdefault(square, []).append((255, 0, 0, 90))
 
-            if moves_displayed:
-                displayed_moves = self.board.display_moves(
-                    self.window,*current_piece, False)
+        changed_rects = self.view.display_board(self.window, highlights, self.__redraw_all)
+        self.__redraw_all = False
+        progress = None if search is None else search.progress()
+        if progress != self.__shown_progress:
+            changed_rects.append(self.__display_progress(progress))
+            self.__shown_progress = progress
+        return changed_rects
 
-            pygame.display.flip()
+    def __engine_colour(self):
+        return Colour.WHITE if self.player_colour != Colour.WHITE else Colour.BLACK
 
-            if already_checked is False and self.check_win(player_move) != "":
-                return self.check_win(player_move)
+    def __start_search(self, player_last_move):
+        """ Returns a handle of the engine's search, continues the ponder search on a hit """
+        if self.__pondering is not None:
+            expected_move, handle = self.__pondering
+            self.__pondering = None
+            if expected_move == player_last_move:
+                return handle
+            handle.cancel()
+            handle.result()
+        return SearchHandle(Engine(self.board, self.depth, self.__engine_colour(),
+                                   self.transposition_table, self.time_limit,
+                                   book = OPENING_BOOK, tablebase = TABLEBASE),
+                            self.__post_engine_moved)
 
-            already_checked = True
-            pygame.time.Clock().tick(24)
+    def __start_pondering(self):
+        """ Starts searching the position after the player's reply the engine expects """
+        if self.ponder is False:
+            return
+        entry = self.transposition_table.probe(self.board.hash_key)
+        if entry is None or entry[4] not in self.board.generate_legal_moves(self.player_colour):
+            return
+        expected_move = entry[4]
+        self.board.move(expected_move, False, False)
+        engine = Engine(self.board, self.depth, self.__engine_colour(),
+                        self.transposition_table, self.time_limit, book = OPENING_BOOK,
+                        tablebase = TABLEBASE)
+        self.board.unmake_last_move()
+        self.__pondering = (expected_move, SearchHandle(engine, self.__post_engine_moved))
+
+    @staticmethod
+    def __post_engine_moved():
+        """ Wakes up the game loop, pygame.event.post can be called from any thread """
+        try:
+            pygame.event.post(pygame.event.Event(ENGINE_MOVED))
+        except pygame.error:
+            # a cancelled search can finish after pygame was quit
+            pass
+
+    def __stop_pondering(self):
+        if self.__pondering is not None:
+            self.__pondering[1].cancel()
+            self.__pondering = None
+
+    def __display_progress(self, progress):
+        """ Displays the depth and the number of nodes of the running search, returns its rect """
+        width, height = self.window.get_size()
+        strip = pygame.Rect(0, 0, width, int(height * 0.05))
+        self.window.fill(self.view.BACKGROUND_COLOUR, strip)
+        if progress is not None:
+            depth, nodes = progress
+            font = ASSETS.font(min(width, height) / 30)
+            text = font.render(
+                f"Thinking... depth {depth + 1}, {nodes} positions (space to move now)",
+                True, "black")
+            self.window.blit(text, text.get_rect(center = strip.center))
+        return strip
 
     def check_win(self, player_move):
         """ Returns True if someone already won the game otherwise False """
@@ -144,19 +266,7 @@ class Game:
 
     def check_stalemate(self, colour):
         """ Returns True if a side of colour cannot make any legal moves and still has pieces """
-        if colour == Colour.WHITE:
-            for coords in self.board.white_pieces_pos:
-                is_op = self.player_colour != Colour.WHITE
-                moves = self.board.current_board[coords].get_moves(*coords, is_op)
-                for move in moves:
-                    if self.board.is_move_valid((*coords, *move), is_op):
-                        return False
-            return not self.someone_ran_out_of_pieces()
-
-        for coords in self.board.black_pieces_pos:
-            is_op = self.player_colour == Colour.WHITE
-            moves = self.board.current_board[coords].get_moves(*coords, is_op)
-            for move in moves:
-                if self.board.is_move_valid((*coords, *move), is_op):
-                    return False
+        is_op = colour != self.player_colour
+        if len(self.board.generate_legal_moves(colour, is_op)) != 0:
+            return False
         return not self.someone_ran_out_of_pieces()
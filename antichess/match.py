@@ -0,0 +1,425 @@
+""" Importing argparse to run matches from the command line """
+import argparse
+
+# Importing math for the Elo difference and the likelihood ratio of the SPRT
+import math
+
+# Importing random to pick the opening lines
+import random
+
+# Importing time to measure how long every engine move took
+import time
+
+# Importing wait to collect the games of the pool as they finish
+from concurrent.futures import wait, FIRST_COMPLETED
+
+# Importing a class representing a chess board and the position a game starts from
+from antichess.board import Board, STARTING_POSITION
+
+# Importing a colour enum class to represent black and white
+from antichess.colour import Colour
+
+# Importing the engine and the process pools it shares
+from antichess.engine import Engine, get_process_pool
+
+# Importing the transposition table every engine keeps during a game
+from antichess.transposition import TranspositionTable
+
+# Importing the opening book and the tablebases the engines can use
+from antichess.book import OPENING_BOOK
+from antichess.tablebase import TABLEBASE
+
+# A game that gets this long without a winner is a draw
+MAX_PLIES = 300
+
+class EngineConfig:
+    """
+        Settings of one side of a match, everything get_best_move() is allowed to use:
+        the depth, time and node budget, the quiescence search (0 turns it off),
+        the opening book and the tablebases
+    """
+    name = "engine"
+    depth = 3
+    time_limit = None
+    node_limit = None
+    quiescence_node_limit = 256
+    book = False
+    tablebase = False
+
+    # names of the settings in the notation of parse()
+    KEYS = {"depth" : "depth", "time" : "time_limit", "nodes" : "node_limit",
+            "quiescence" : "quiescence_node_limit", "book" : "book", "tablebase" : "tablebase"}
+
+    def __init__(self, name = "engine", depth = 3, time_limit = None, node_limit = None,
+                 quiescence_node_limit = 256, book = False, tablebase = False):
+        self.name = name
+        self.depth = depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.quiescence_node_limit = quiescence_node_limit
+        self.book = book
+        self.tablebase = tablebase
+
+    @classmethod
+    def parse(cls, text, name = "engine"):
+        """
+            Returns the config written as comma separated key=value pairs,
+            e.g. "depth=3,time=0.5,nodes=20000,quiescence=0,book=1,tablebase=1",
+            depth=none searches until the time or node budget runs out
+        """
+        settings = {}
+        for pair in filter(None, text.split(",")):
+            key, _, value = pair.partition("=")
+            if key.strip() not in cls.KEYS:
+                raise ValueError(f"unknown engine setting {key.strip()!r}")
+            key, value = cls.KEYS[key.strip()], value.strip().lower()
+            if key in ("book", "tablebase"):
+                settings[key] = value in ("1", "true", "yes", "on")
+            elif value in ("", "none"):
+                settings[key] = None
+            else:
+                settings[key] = float(value) if key == "time_limit" else int(value)
+        return cls(name, **settings)
+
+    def __str__(self):
+        # 0 == False, so a setting of 0 is told apart from a switch that is off by identity
+        values = {key : getattr(self, attribute) for key, attribute in self.KEYS.items()}
+        settings = [f"{key}={value}" for key, value in values.items()
+                    if value is not None and value is not False]
+        return f"{self.name} ({', '.join(settings)})"
+
+    def create_engine(self, board, colour, transposition_table):
+        """ Returns an engine playing colour on the board with these settings """
+        return Engine(board, self.depth, colour, transposition_table, self.time_limit,
+                      self.node_limit, quiescence_node_limit = self.quiescence_node_limit,
+                      book = OPENING_BOOK if self.book else None,
+                      tablebase = TABLEBASE if self.tablebase else None)
+
+def mirror_position(position):
+    """ Returns the position seen by the other colour, rows upside down and cases swapped """
+    return "/".join(row.swapcase() for row in reversed(position.split("/")))
+
+def mirror_move(move):
+    """ Returns the move on the board of the other colour, see mirror_position() """
+    x_from, y_from, x_to, y_to = move
+    return (7 - x_from, y_from, 7 - x_to, y_to)
+
+def opening_lines(count, plies = 2, seed = 0, starting_position = STARTING_POSITION):
+    """
+        Returns count different lines of plies random moves from the starting position,
+        moves are on the board of white, Board(Colour.WHITE, starting_position), white first.
+        There can be fewer lines when the position does not have that many
+    """
+    generator = random.Random(seed)
+    board = Board(Colour.WHITE, starting_position)
+    lines, attempts = set(), 0
+    while len(lines) < count and attempts < 20 * count:
+        attempts += 1
+        line = []
+        for ply in range(plies):
+            is_op = ply % 2 == 1
+            moves = board.generate_legal_moves(Colour.BLACK if is_op else Colour.WHITE, is_op)
+            if len(moves) == 0:
+                break
+            line.append(generator.choice(moves))
+            board.move(line[-1], is_op, False)
+        while board.unmake_last_move():
+            pass
+        lines.add(tuple(line))
+    return sorted(lines)
+
+class GameRecord:
+    """
+        Result of one game: score of white (1, 0.5 or 0), number of plies and for every
+        colour value the nodes, the seconds spent searching and the time of each move
+    """
+    white_score = 0.5
+    plies = 0
+
+    def __init__(self):
+        self.white_score = 0.5
+        self.plies = 0
+        self.nodes = [0, 0]
+        self.search_time = [0.0, 0.0]
+        self.move_times = [[], []]
+
+def play_game(white, black, opening = (), max_plies = MAX_PLIES,
+              starting_position = STARTING_POSITION):
+    """
+        Plays a game of the white and black EngineConfig after the opening line
+        (moves on the board of white, see opening_lines()) and returns its GameRecord
+
+        Every engine plays on a board of its own where it is the opponent, the same one
+        Game gives it against a player of the other colour, both boards get every move
+    """
+    # the board of the engine playing a colour is the board of the player of the other one
+    boards = {Colour.WHITE : Board(Colour.BLACK, mirror_position(starting_position)),
+              Colour.BLACK : Board(Colour.WHITE, starting_position)}
+    configs = {Colour.WHITE : white, Colour.BLACK : black}
+    tables = {colour : TranspositionTable(Engine.TRANSPOSITION_TABLE_MB) for colour in boards}
+    record = GameRecord()
+
+    def play(colour, move):
+        other_colour = Colour.BLACK if colour == Colour.WHITE else Colour.WHITE
+        boards[colour].move(move, True, False)
+        boards[other_colour].move(mirror_move(move), False, False)
+        record.plies += 1
+
+    colour = Colour.WHITE
+    for move in opening:
+        play(colour, move if colour == Colour.BLACK else mirror_move(move))
+        colour = Colour.BLACK if colour == Colour.WHITE else Colour.WHITE
+
+    while record.plies < max_plies:
+        board = boards[colour]
+        if len(board.white_pieces_pos) == 0 or len(board.black_pieces_pos) == 0:
+            record.white_score = 1 if len(board.white_pieces_pos) == 0 else 0
+            return record
+        if not board.has_legal_moves(colour, True):
+            # a side that cannot move wins by stalemate
+            record.white_score = 1 if colour == Colour.WHITE else 0
+            return record
+
+        start = time.perf_counter()
+        engine = configs[colour].create_engine(board, colour, tables[colour])
+        move = engine.get_best_move()
+        elapsed = time.perf_counter() - start
+        record.nodes[colour.value] += engine.nodes
+        record.search_time[colour.value] += elapsed
+        record.move_times[colour.value].append(elapsed)
+
+        play(colour, move)
+        colour = Colour.BLACK if colour == Colour.WHITE else Colour.WHITE
+    return record
+
+def _play_game_task(task):
+    """ Runs in a pool worker, plays one game of run_match() """
+    return play_game(*task)
+
+def elo_difference(score):
+    """ Returns the Elo difference that makes the expected score score (0 to 1) """
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+class SPRT:
+    """
+        Sequential probability ratio test of elo0 (H0) against elo1 (H1) with the error
+        rates alpha and beta, uses the normal approximation of the log likelihood ratio of
+        the game scores so that draws count as half a win
+    """
+    elo0 = 0
+    elo1 = 5
+    alpha = 0.05
+    beta = 0.05
+
+    def __init__(self, elo0 = 0, elo1 = 5, alpha = 0.05, beta = 0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+
+    def bounds(self):
+        """ Returns (lower, upper) bounds of the log likelihood ratio """
+        return (math.log(self.beta / (1 - self.alpha)), math.log((1 - self.beta) / self.alpha))
+
+    def llr(self, wins, draws, losses):
+        """ Returns the log likelihood ratio of H1 against H0 after the games """
+        games = wins + draws + losses
+        if games == 0:
+            return 0.0
+        if games in (wins, draws, losses):
+            # games that all ended the same have no variance, a win and a loss give them some
+            wins, losses, games = wins + 1, losses + 1, games + 2
+        score = (wins + draws / 2) / games
+        variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2
+                    + losses * score ** 2) / games
+        score0 = 1 / (1 + 10 ** (-self.elo0 / 400))
+        score1 = 1 / (1 + 10 ** (-self.elo1 / 400))
+        return games * (score1 - score0) * (2 * score - score0 - score1) / (2 * variance)
+
+    def decision(self, wins, draws, losses):
+        """ Returns "H1" if elo1 was shown, "H0" if elo0 was or None to keep playing """
+        lower, upper = self.bounds()
+        llr = self.llr(wins, draws, losses)
+        if llr >= upper:
+            return "H1"
+        if llr <= lower:
+            return "H0"
+        return None
+
+class MatchResult:
+    """
+        Results of engine A against engine B: wins, draws and losses are A's, the nodes,
+        search time and move times are kept per engine, index 0 is A and 1 is B
+    """
+    wins = 0
+    draws = 0
+    losses = 0
+    decision = None
+
+    def __init__(self):
+        self.wins, self.draws, self.losses = 0, 0, 0
+        self.decision = None
+        self.nodes = [0, 0]
+        self.search_time = [0.0, 0.0]
+        self.move_times = [[], []]
+
+    def add(self, record, a_is_white):
+        """ Adds the GameRecord of a game where A played white if a_is_white """
+        a_score = record.white_score if a_is_white else 1 - record.white_score
+        if a_score == 1:
+            self.wins += 1
+        elif a_score == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+        for engine, colour in ((0, Colour.WHITE if a_is_white else Colour.BLACK),
+                               (1, Colour.BLACK if a_is_white else Colour.WHITE)):
+            self.nodes[engine] += record.nodes[colour.value]
+            self.search_time[engine] += record.search_time[colour.value]
+            self.move_times[engine] += record.move_times[colour.value]
+
+    def games(self):
+        """ Returns the number of games played """
+        return self.wins + self.draws + self.losses
+
+    def score(self):
+        """ Returns the score of A per game, 0 to 1 """
+        return (self.wins + self.draws / 2) / self.games() if self.games() else 0.5
+
+    def elo(self):
+        """
+            Returns (Elo difference of A over B, margin of its 95% confidence interval),
+            games that all ended the same count one more win and loss like in SPRT.llr,
+            otherwise a score of 0 or 1 has no variance and an infinite difference,
+            the margin is infinite while the interval reaches a score of 0 or 1
+        """
+        wins, draws, losses, games = self.wins, self.draws, self.losses, self.games()
+        if games == 0:
+            return 0.0, math.inf
+        if games in (wins, draws, losses):
+            wins, losses, games = wins + 1, losses + 1, games + 2
+        score = (wins + draws / 2) / games
+        variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2
+                    + losses * score ** 2) / games
+        deviation = 1.959964 * math.sqrt(variance / games)
+        low, high = elo_difference(score - deviation), elo_difference(score + deviation)
+        return elo_difference(score), (high - low) / 2
+
+    def nodes_per_second(self, engine):
+        """ Returns the nodes the engine (0 = A, 1 = B) searched per second """
+        seconds = self.search_time[engine]
+        return self.nodes[engine] / seconds if seconds > 0 else 0.0
+
+    def latency(self, engine):
+        """ Returns (mean, 95th percentile, max) seconds of a move of the engine """
+        times = sorted(self.move_times[engine])
+        if not times:
+            return 0.0, 0.0, 0.0
+        return (sum(times) / len(times), times[min(len(times) - 1, int(0.95 * len(times)))],
+                times[-1])
+
+    def report(self, engine_a, engine_b):
+        """ Returns the results as lines of text """
+        elo, margin = self.elo()
+        lines = [f"{engine_a} vs {engine_b}",
+                 f"games {self.games()}: +{self.wins} ={self.draws} -{self.losses}, "
+                 f"score {self.score():.3f}, elo {elo:+.1f} +/- {margin:.1f}"]
+        if self.decision is not None:
+            lines.append(f"SPRT: {self.decision} accepted")
+        for engine, config in ((0, engine_a), (1, engine_b)):
+            mean, percentile, longest = self.latency(engine)
+            lines.append(f"{config.name}: {self.nodes_per_second(engine):.0f} nodes/s, "
+                         f"move {mean * 1000:.0f} ms mean, {percentile * 1000:.0f} ms p95, "
+                         f"{longest * 1000:.0f} ms max")
+        return lines
+
+def run_match(engine_a, engine_b, openings, workers = 1, max_plies = MAX_PLIES,
+              sprt = None, on_game = None):
+    """
+        Plays every opening line twice, A is white in the first game and black in the
+        second one, and returns the MatchResult. With workers > 1 the games are played
+        in a process pool. sprt is an optional SPRT that ends the match once it decides,
+        on_game(result) is called after every game
+    """
+    tasks = []
+    for opening in openings:
+        tasks.append(((engine_a, engine_b, opening, max_plies), True))
+        tasks.append(((engine_b, engine_a, opening, max_plies), False))
+    result = MatchResult()
+
+    def finish(record, a_is_white):
+        result.add(record, a_is_white)
+        if on_game is not None:
+            on_game(result)
+        if sprt is not None:
+            result.decision = sprt.decision(result.wins, result.draws, result.losses)
+        return result.decision is not None
+
+    if workers <= 1:
+        for task, a_is_white in tasks:
+            if finish(play_game(*task), a_is_white):
+                break
+        return result
+
+    # a few games wait in the pool so that workers never idle, the rest is submitted
+    # as games finish so that a decided SPRT does not leave a long queue behind
+    pool = get_process_pool(workers)
+    pending, next_task = {}, 0
+    while next_task < len(tasks) or pending:
+        while next_task < len(tasks) and len(pending) < 2 * workers:
+            task, a_is_white = tasks[next_task]
+            pending[pool.submit(_play_game_task, task)] = a_is_white
+            next_task += 1
+        done, _ = wait(pending, return_when = FIRST_COMPLETED)
+        for future in done:
+            if finish(future.result(), pending.pop(future)):
+                for waiting in pending:
+                    waiting.cancel()
+                return result
+    return result
+
+def main(arguments = None):
+    """ Command line entry point, run with python -m antichess.match --help """
+    parser = argparse.ArgumentParser(description = "Plays two engine settings against each other")
+    parser.add_argument("--a", default = "depth=3",
+                        help = "settings of engine A, e.g. depth=3,quiescence=0,book=1")
+    parser.add_argument("--b", default = "depth=2",
+                        help = "settings of engine B, see --a")
+    parser.add_argument("--games", type = int, default = 100,
+                        help = "number of games, every opening is played with both colours")
+    parser.add_argument("--plies", type = int, default = 2,
+                        help = "number of random moves of every opening line")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--workers", type = int, default = 1)
+    parser.add_argument("--max-plies", type = int, default = MAX_PLIES,
+                        help = "length of a game that is a draw")
+    parser.add_argument("--sprt", type = float, nargs = 2, metavar = ("ELO0", "ELO1"),
+                        help = "stop once A is shown to be elo0 or elo1 stronger than B")
+    parser.add_argument("--quiet", action = "store_true", help = "print only the result")
+    args = parser.parse_args(arguments)
+
+    engine_a = EngineConfig.parse(args.a, "A")
+    engine_b = EngineConfig.parse(args.b, "B")
+    openings = opening_lines((args.games + 1) // 2, args.plies, args.seed)
+    sprt = None if args.sprt is None else SPRT(*args.sprt)
+
+    def progress(result):
+        if not args.quiet:
+            elo, margin = result.elo()
+            print(f"game {result.games()}: +{result.wins} ={result.draws} -{result.losses} "
+                  f"elo {elo:+.1f} +/- {margin:.1f}", flush = True)
+
+    start = time.perf_counter()
+    result = run_match(engine_a, engine_b, openings, args.workers, args.max_plies, sprt,
+                       progress)
+    for line in result.report(engine_a, engine_b):
+        print(line)
+    print(f"{result.games()} games in {time.perf_counter() - start:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
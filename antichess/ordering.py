@@ -0,0 +1,63 @@
+""" Importing the bitboard helper to tell captures from quiet moves """
+from antichess.board import square_bit
+
+class MoveOrderer:
+    """
+        Orders moves for the alpha-beta search so that the move most likely to cause
+        a cutoff is tried first: the transposition table move, then captures by the value
+        of the victim and the attacker (MVV-LVA), then killer moves of the ply and then
+        quiet moves by their history score. Since capturing is compulsory a list of legal
+        moves is either all captures or all quiet moves
+    """
+    KILLERS_PER_PLY = 2
+    killers = []
+    history = {}
+    cutoffs = 0
+    first_move_cutoffs = 0
+
+    def __init__(self):
+        self.killers = []
+        self.history = {}
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def order(self, board, moves, ply, tt_move = None):
+        """ Returns the moves sorted from the most to the least promising one """
+        if len(moves) == 0:
+            return moves
+
+        first = moves[0]
+        if board.occupied & square_bit(first[2], first[3]):
+            pieces = board.current_board
+            ordered = sorted(moves, reverse = True, key = lambda move: (
+                10 * pieces[move[2], move[3]].VALUE - pieces[move[0], move[1]].VALUE))
+        else:
+            killers = self.killers[ply] if ply < len(self.killers) else ()
+            history = self.history
+            ordered = sorted(moves, reverse = True, key = lambda move: (
+                move in killers, history.get(move, 0)))
+
+        if tt_move is not None and tt_move in moves:
+            ordered.remove(tt_move)
+            ordered.insert(0, tt_move)
+        return ordered
+
+    def record_cutoff(self, board, move, ply, depth, move_number):
+        """ Remembers a move that caused a cutoff, move_number is its index in the order """
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+
+        if board.occupied & square_bit(move[2], move[3]):
+            return
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[self.KILLERS_PER_PLY:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def first_move_cutoff_rate(self):
+        """ Returns the share of cutoffs caused by the first move tried """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
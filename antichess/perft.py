@@ -0,0 +1,120 @@
+""" Importing argparse to run perft from the command line """
+import argparse
+
+# Importing time to measure the number of nodes per second
+import time
+
+# Importing a class representing a chess board
+from antichess.board import Board, STARTING_POSITION
+
+# Importing a colour enum class to represent black and white
+from antichess.colour import Colour
+
+# Reference positions in the Board starting position notation with expected node counts,
+# (colour of player, position, does the opponent move first, node counts for depth 1, 2, ...)
+PERFT_SUITE = [
+    (Colour.WHITE, STARTING_POSITION, False, [20, 400, 8067, 153299]),
+    (Colour.BLACK, STARTING_POSITION, True, [20, 400, 8067]),
+    (Colour.WHITE,
+     "rnbqkbnr/pp0ppppp/00000000/00p00000/0000P000/00000000/PPPP0PPP/RNBQKBNR",
+     False, [30, 593, 10138]),
+    (Colour.WHITE,
+     "K0000000/PPPPPPPP/00000000/00000000/00000000/k0000000/ppppk000/00000000",
+     False, [8, 112, 1060, 13648]),
+    (Colour.BLACK,
+     "R000000r/0PP00000/00000000/00000000/00000000/0KR00000/00000000/0000000R",
+     True, [2, 34, 410, 9679]),
+    (Colour.WHITE,
+     "0000k000/00000000/00000000/00q00000/00000000/00000000/0Q000000/0000K000",
+     False, [28, 521, 7866, 116284]),
+]
+
+def colour_to_move(board, is_opponent):
+    """ Returns the colour of the side that moves when is_opponent is or is not playing """
+    if is_opponent is False:
+        return board.colour
+    return Colour.BLACK if board.colour == Colour.WHITE else Colour.WHITE
+
+def perft(board, depth, is_opponent = False):
+    """ Returns the number of leaf nodes depth plies below the position on the board """
+    if depth == 0:
+        return 1
+
+    moves = board.generate_legal_moves(colour_to_move(board, is_opponent), is_opponent)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        board.move(move, is_opponent, False)
+        nodes += perft(board, depth - 1, not is_opponent)
+        board.unmake_last_move()
+    return nodes
+
+def divide(board, depth, is_opponent = False):
+    """ Returns a dictionary of every legal move and the number of leaf nodes below it """
+    counts = {}
+    for move in board.generate_legal_moves(colour_to_move(board, is_opponent), is_opponent):
+        board.move(move, is_opponent, False)
+        counts[move] = perft(board, depth - 1, not is_opponent)
+        board.unmake_last_move()
+    return counts
+
+def timed_perft(board, depth, is_opponent = False):
+    """ Returns the number of leaf nodes, the time it took in seconds and nodes per second """
+    start = time.perf_counter()
+    nodes = perft(board, depth, is_opponent)
+    elapsed = time.perf_counter() - start
+    return nodes, elapsed, nodes / elapsed if elapsed > 0 else 0.0
+
+def run_suite(max_depth = None):
+    """ Runs the PERFT_SUITE and returns (position, depth, expected, found, nodes per second) """
+    results = []
+    for colour, position, is_opponent, counts in PERFT_SUITE:
+        for depth, expected in enumerate(counts, start = 1):
+            if max_depth is not None and depth > max_depth:
+                break
+            nodes, _, nodes_per_second = timed_perft(Board(colour, position), depth, is_opponent)
+            results.append((position, depth, expected, nodes, nodes_per_second))
+    return results
+
+def main(arguments = None):
+    """ Command line entry point, run with python -m antichess.perft --help """
+    parser = argparse.ArgumentParser(description = "Counts the leaf nodes of the move tree")
+    parser.add_argument("depth", type = int, nargs = "?", default = 3)
+    parser.add_argument("--position", default = STARTING_POSITION)
+    parser.add_argument("--colour", choices = ["w", "b"], default = "w",
+                        help = "colour of the player whose pieces are the upper case letters")
+    parser.add_argument("--opponent-first", action = "store_true",
+                        help = "the lower case pieces make the first move")
+    parser.add_argument("--divide", action = "store_true",
+                        help = "print the number of nodes below every root move")
+    parser.add_argument("--suite", action = "store_true",
+                        help = "run the reference suite up to depth")
+    args = parser.parse_args(arguments)
+
+    if args.suite:
+        failed = 0
+        for position, depth, expected, nodes, nodes_per_second in run_suite(args.depth):
+            status = "ok" if nodes == expected else "FAILED"
+            failed += nodes != expected
+            print(f"{position} depth {depth}: {nodes} / {expected} {status} "
+                  f"({nodes_per_second:.0f} nodes/s)")
+        return 1 if failed else 0
+
+    board = Board(Colour.WHITE if args.colour == "w" else Colour.BLACK, args.position)
+    if args.divide:
+        start = time.perf_counter()
+        counts = divide(board, args.depth, args.opponent_first)
+        elapsed = time.perf_counter() - start
+        for move, nodes in counts.items():
+            print(f"{move}: {nodes}")
+        nodes = sum(counts.values())
+    else:
+        nodes, elapsed, _ = timed_perft(board, args.depth, args.opponent_first)
+
+    print(f"nodes {nodes} time {elapsed:.3f}s nps {nodes / elapsed if elapsed > 0 else 0:.0f}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
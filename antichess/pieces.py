@@ -1,22 +1,43 @@
 """ Importing ABC and abstractmethod to create abstract Piece class """
 from abc import ABC, abstractmethod
 
-# Importing pygame for drawing the pieces on the app window
-import pygame
-
 # Importing enum class which contains colours BLACK and WHITE
 from antichess.colour import Colour
 
 PATH = "antichess/images/"
 
+def _slide(rays):
+    """ Returns the squares of the rays as (x, y), nearest squares of every ray first """
+    return [ray[inc][:2] for inc in range(0, 7) for ray in rays if inc < len(ray)]
+
 class Piece(ABC):
-    """ Abstract class representing a chess piece"""
-    colour = None
+    """
+        Abstract class representing a chess piece
+
+        Pieces are flyweights, Rook(Colour.WHITE) always returns the same instance so that
+        boards share them and a promotion allocates nothing, the value and the move pattern
+        of a piece are tables of its class and a piece cannot be changed once it is created
+    """
+    __slots__ = ("colour",)
     image_white = None
     image_black = None
+    VALUE = 0
+    __instances = {}
+
+    def __new__(cls, colour):
+        colour = Colour.WHITE if colour == Colour.WHITE else Colour.BLACK
+        piece = Piece.__instances.get((cls, colour))
+        if piece is None:
+            piece = super().__new__(cls)
+            object.__setattr__(piece, "colour", colour)
+            Piece.__instances[(cls, colour)] = piece
+        return piece
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is shared by all boards and cannot change")
 
-    def __init__(self, colour):
-        self.colour = Colour.WHITE if colour == Colour.WHITE else Colour.BLACK
+    def __reduce__(self):
+        return (type(self), (self.colour,))
 
     @abstractmethod
     def get_moves(self, x_coord, y_coord, is_opponent = False):
@@ -27,20 +48,19 @@ class Piece(ABC):
         return 0 <= x_coord <= 7 and 0 <= y_coord <= 7
 
     def copy(self):
-        """ Returns a copy of a piece with the same colour """
-        return type(self)(self.colour)
+        """ Returns the piece itself, a piece is shared instead of copied """
+        return self
 
-    def display_piece(self, window, piece_size, x_coord, y_coord):
-        """ Displays the piece on the window in row = x_coord, column = y_coord """
-        image_address = self.image_white if self.colour == Colour.WHITE else self.image_black
-        pawn_picture = pygame.image.load(image_address)
-        pawn_picture = pygame.transform.scale(pawn_picture, (piece_size, piece_size))
-        window.blit(pawn_picture, (x_coord - piece_size / 2, y_coord - piece_size / 2))
+    def get_value(self):
+        """ Method returning the value of the piece used when evaluating the position """
+        return self.VALUE
 
 class Pawn(Piece):
     """ Class representing a pawn """
+    __slots__ = ()
     image_white = PATH + "pawn_white.png"
     image_black = PATH + "pawn_black.png"
+    VALUE = 1
 
     def get_moves(self, x_coord, y_coord, is_opponent = False):
         direction = 1 if is_opponent is True else -1
@@ -52,102 +72,107 @@ class Pawn(Piece):
             ]
         return [move for move in all_moves if self.is_in_range(*move)]
 
-    def get_value(self):
-        """ Method returning the value of pawn used when evaluating the position """
-        return 1
-
 class Bishop(Piece):
     """ Class representing a bishop """
+    __slots__ = ()
     image_white = PATH + "bishop_white.png"
     image_black = PATH + "bishop_black.png"
+    VALUE = 3
+    DIRECTIONS = ((1, 1), (-1, -1), (1, -1), (-1, 1))
 
     def get_moves(self, x_coord, y_coord, is_opponent = False):
-        all_moves = []
-
-        for inc in range (1,8):
-            all_moves += [
-              (x_coord + inc, y_coord + inc),
-              (x_coord - inc, y_coord - inc),
-              (x_coord + inc, y_coord - inc),
-              (x_coord - inc, y_coord + inc)
-              ]
-
-        return [move for move in all_moves if self.is_in_range(*move)]
-
-    def get_value(self):
-        """ Method returning the value of bishop used when evaluating the position """
-        return 3
+        return _slide(BISHOP_RAYS[x_coord * 8 + y_coord])
 
 class Knight(Piece):
     """ Class representing a knight """
+    __slots__ = ()
     image_white = PATH + "knight_white.png"
     image_black = PATH + "knight_black.png"
+    VALUE = 3
+    STEPS = ((2, 1), (2, -1), (-2, 1), (-2, -1), (1, 2), (1, -2), (-1, 2), (-1, -2))
 
     def get_moves(self, x_coord, y_coord, is_opponent = False):
-        all_moves = []
-
-        for nums in [(2, 1), (1, 2)]:
-            for first_sign in [1, -1]:
-                for second_sign in [1, -1]:
-                    all_moves.append(
-                        (x_coord + nums[0] * first_sign, y_coord + nums[1] * second_sign)
-                        )
-
-        return [move for move in all_moves if self.is_in_range(*move)]
-
-    def get_value(self):
-        """ Method returning the value of knight used when evaluating the position """
-        return 3
+        return [target[:2] for target in KNIGHT_TARGETS[x_coord * 8 + y_coord]]
 
 class Rook(Piece):
     """ Class representing a rook """
+    __slots__ = ()
     image_white = PATH + "rook_white.png"
     image_black = PATH + "rook_black.png"
+    VALUE = 5
+    DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
 
     def get_moves(self, x_coord, y_coord, is_opponent = False):
-        all_moves = []
-
-        for inc in range (1, 8):
-            for sign in [1, -1]:
-                all_moves.append((x_coord + inc * sign, y_coord))
-                all_moves.append((x_coord, y_coord + inc * sign))
-
-        return [move for move in all_moves if self.is_in_range(*move)]
-
-    def get_value(self):
-        """ Method returning the value of rook used when evaluating the position """
-        return 5
+        return _slide(ROOK_RAYS[x_coord * 8 + y_coord])
 
 class Queen(Piece):
     """ Class representing a queen """
+    __slots__ = ()
     image_white = PATH + "queen_white.png"
     image_black = PATH + "queen_black.png"
+    VALUE = 9
+    DIRECTIONS = Bishop.DIRECTIONS + Rook.DIRECTIONS
 
     def get_moves(self, x_coord, y_coord, is_opponent = False):
-        bishop = Bishop(self.colour)
-        rook = Rook(self.colour)
-        return bishop.get_moves(x_coord, y_coord) + rook.get_moves(x_coord, y_coord)
-
-    def get_value(self):
-        """ Method returning the value of queen used when evaluating the position """
-        return 9
+        return (_slide(BISHOP_RAYS[x_coord * 8 + y_coord])
+                + _slide(ROOK_RAYS[x_coord * 8 + y_coord]))
 
 class King(Piece):
     """ Class representing a king """
+    __slots__ = ()
     image_white = PATH + "king_white.png"
     image_black = PATH + "king_black.png"
+    VALUE = 3
+    STEPS = ((1, 1), (1, 0), (1, -1), (0, 1), (0, -1), (-1, 1), (-1, 0), (-1, -1))
 
     def get_moves(self, x_coord, y_coord, is_opponent = False):
-        all_moves = []
-
-        for i in [-1, 0, 1]:
-            for j in [-1, 0, 1]:
-                if i == j == 0:
-                    continue
-                all_moves.append((x_coord + i, y_coord + j))
-
-        return [move for move in all_moves if self.is_in_range(*move)]
-
-    def get_value(self):
-        """ Method returning the value of king used when evaluating the position """
-        return 3
+        return [target[:2] for target in KING_TARGETS[x_coord * 8 + y_coord]]
+
+# Tables of the squares the pieces reach from every square (index x * 8 + y), built once at
+# import so that generating moves only looks them up. A target is (x, y, bit of the square),
+# a ray is the tuple of targets in one direction with the nearest square first, so a walk
+# along it stops at the first piece it meets
+
+def _ray(square, x_step, y_step, length = 7):
+    """ Returns the targets up to length steps from the square in the direction """
+    x_coord, y_coord = divmod(square, 8)
+    ray = []
+    for inc in range(1, length + 1):
+        x_to, y_to = x_coord + inc * x_step, y_coord + inc * y_step
+        if not (0 <= x_to <= 7 and 0 <= y_to <= 7):
+            break
+        ray.append((x_to, y_to, 1 << (x_to * 8 + y_to)))
+    return tuple(ray)
+
+def _targets(steps):
+    """ Returns the targets one step away for every square """
+    return tuple(tuple(target for step in steps for target in _ray(square, *step, 1))
+                 for square in range(0, 64))
+
+def _attacks(targets):
+    """ Returns the bitboard of the targets of every square """
+    return tuple(sum(bit for _, _, bit in square_targets) for square_targets in targets)
+
+# rays of every direction of the bishop and the rook, RAYS[(x_step, y_step)][square]
+RAYS = {direction : tuple(_ray(square, *direction) for square in range(0, 64))
+        for direction in Bishop.DIRECTIONS + Rook.DIRECTIONS}
+# rays of a piece from a square in the order of its DIRECTIONS, empty rays are left out
+BISHOP_RAYS = tuple(tuple(RAYS[direction][square] for direction in Bishop.DIRECTIONS
+                          if RAYS[direction][square]) for square in range(0, 64))
+ROOK_RAYS = tuple(tuple(RAYS[direction][square] for direction in Rook.DIRECTIONS
+                        if RAYS[direction][square]) for square in range(0, 64))
+
+KNIGHT_TARGETS = _targets(Knight.STEPS)
+KING_TARGETS = _targets(King.STEPS)
+KNIGHT_ATTACKS = _attacks(KNIGHT_TARGETS)
+KING_ATTACKS = _attacks(KING_TARGETS)
+
+# pawn tables are indexed by is_opponent first, pawns of the player move up (x decreases),
+# PAWN_CAPTURES lists the square to y + 1 first, PAWN_PUSHES the one step push first and
+# the two step push from the starting row after it
+PAWN_CAPTURES = tuple(_targets(((direction, 1), (direction, -1))) for direction in (-1, 1))
+PAWN_ATTACKS = tuple(_attacks(targets) for targets in PAWN_CAPTURES)
+PAWN_PUSHES = tuple(
+    tuple(_ray(square, direction, 0, 2 if square // 8 == start_row else 1)
+          if 0 <= square // 8 + direction <= 7 else () for square in range(0, 64))
+    for direction, start_row in ((-1, 6), (1, 1)))
@@ -0,0 +1,119 @@
+""" Importing pygame to draw the board and the pieces """
+import pygame
+
+# Importing colour for white and black
+from antichess.colour import Colour
+
+# Importing the cache of surfaces used for drawing
+from antichess.assets import ASSETS
+
+def display_piece(window, piece, piece_size, x_coord, y_coord):
+    """ Displays the piece centered on (x_coord, y_coord) px of the window """
+    image_address = piece.image_white if piece.colour == Colour.WHITE else piece.image_black
+    piece_picture = ASSETS.scaled_image(image_address, piece_size)
+    window.blit(piece_picture, (x_coord - piece_size / 2, y_coord - piece_size / 2))
+
+class _RenderCache:
+    """ Surface of the board drawn by BoardView.display_board and what is drawn on the window """
+
+    def __init__(self, window_size, size_of_board):
+        width, height = window_size
+        self.window_size = window_size
+        self.origin = (int(round(width / 2 - size_of_board / 2)),
+                       int(round(height / 2 - size_of_board / 2)))
+        self.tile_size = size_of_board / 8
+        self.edges = [int(round(i * self.tile_size)) for i in range(0, 9)]
+        self.surface = pygame.Surface((self.edges[8], self.edges[8]))
+        self.surface_pieces = {}
+        self.window_tiles = {}
+
+    def tile_rect(self, row, col):
+        """ Returns the rect of the tile on (row, col) relative to the board """
+        return pygame.Rect(self.edges[col], self.edges[row],
+                           self.edges[col + 1] - self.edges[col],
+                           self.edges[row + 1] - self.edges[row])
+
+class BoardView:
+    """
+        Draws a Board on a pygame window and maps the window's pixels to its tiles,
+        the board itself knows nothing about pygame so that the engine can run without it
+    """
+    board = None
+    BACKGROUND_COLOUR = (238, 238, 228)
+    __render_cache = None
+
+    def __init__(self, board):
+        self.board = board
+        self.__render_cache = None
+
+    def display_board(self, window, highlights = None, redraw_all = False):
+        """
+            Displays the board in the pygame window and returns the list of rects that
+            changed so that only they can be pushed by pygame.display.update(rects).
+            highlights maps (row, col) of a tile to a list of colours drawn over it.
+            Tiles with their pieces are kept on a cached surface of the board and a tile
+            of the window is redrawn only when its piece or its highlights changed, the
+            whole window is redrawn after a resize or with redraw_all
+        """
+        highlights = {} if highlights is None else highlights
+        cache = self.__render_cache
+        changed_rects = []
+        if redraw_all or cache is None or cache.window_size != window.get_size():
+            cache = _RenderCache(window.get_size(), self.get_size_of_board(window))
+            self.__render_cache = cache
+            window.fill(self.BACKGROUND_COLOUR)
+            changed_rects.append(window.get_rect())
+
+        for row in range(0, 8):
+            for col in range(0, 8):
+                piece = self.board.current_board[row, col]
+                tile_state = (piece, tuple(highlights.get((row, col), ())))
+                if cache.window_tiles.get((row, col)) == tile_state:
+                    continue
+
+                tile_rect = cache.tile_rect(row, col)
+                if cache.surface_pieces.get((row, col)) is not piece:
+                    pygame.draw.rect(cache.surface,
+                        ((155,76,20)) if ((row * (8 + 1) + col) % 2 == 1) else ((255,240,200)),
+                        tile_rect)
+                    if piece is not False:
+                        display_piece(cache.surface, piece, cache.tile_size, *tile_rect.center)
+                    cache.surface_pieces[(row, col)] = piece
+
+                window_rect = tile_rect.move(cache.origin)
+                window.blit(cache.surface, window_rect, tile_rect)
+                for colour in tile_state[1]:
+                    window.blit(ASSETS.overlay(tile_rect.width, colour), window_rect)
+                cache.window_tiles[(row, col)] = tile_state
+                changed_rects.append(window_rect)
+
+        return changed_rects
+
+    def get_coords(self, window, x_coord, y_coord):
+        """ Returns the coords in px for a tile on (x, y) """
+        width, height = window.get_size()
+        board_center_position = (width / 2, height / 2)
+        tile_size = self.get_tile_size(window)
+        left_corner_tile_x, left_corner_tile_y = (board_center_position[0] - 4 * tile_size,
+                                                  board_center_position[1] - 4 * tile_size)
+        return (left_corner_tile_x + x_coord * tile_size + tile_size / 2,
+                 left_corner_tile_y + y_coord * tile_size + tile_size / 2)
+
+    def get_size_of_board(self, window):
+        """ Returns a size of a side of a chess board """
+        width, height = window.get_size()
+        return 0.9 * width if width < height else 0.9 * height
+
+    def get_tile_size(self, window):
+        """ Returns a size of a square representing a chess tile """
+        return self.get_size_of_board(window) / 8
+
+    def get_tile_based_on_click(self, window, x_coord, y_coord):
+        """ Gets coords of a tile based on x,y coords on the window """
+        width, height = window.get_size()
+        board_center_position = (width / 2, height / 2)
+        size_of_board = self.get_size_of_board(window)
+        tile_x, tile_y = (board_center_position[0] - size_of_board / 2,
+                           board_center_position[1] - size_of_board / 2)
+        tile_size = size_of_board / 8
+        return (int((y_coord - tile_y) // tile_size), int((x_coord - tile_x) // tile_size))
@@ -0,0 +1,507 @@
+""" Importing argparse to build the tablebases from the command line """
+import argparse
+
+# Importing itertools to list the material of every table
+import itertools
+
+# Importing math to count the sets of squares the pieces of one type stand on
+import math
+
+# Importing mmap to read the tablebases without loading them
+import mmap
+
+# Importing os to find the file next to the package and to replace it in one step
+import os
+
+# Importing struct to pack the header of the file
+import struct
+
+# Importing time to report how long the tables took to build
+import time
+
+# Importing a process pool to solve the tables of one piece count in parallel
+from concurrent.futures import ProcessPoolExecutor
+
+# Importing numpy to solve all positions of a table at once
+import numpy as np
+
+# Importing the piece types and steps of the board
+from antichess.board import (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, PIECE_LETTERS,
+                             KNIGHT_STEPS, KING_STEPS, BISHOP_DIRECTIONS, ROOK_DIRECTIONS)
+
+# Importing a colour enum class to represent black and white
+from antichess.colour import Colour
+
+TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase.bin")
+
+# Results of a position for the side to move
+WIN, LOSS, DRAW = 0, 1, 2
+
+# Values are one byte per position: 0 is a draw, 2 * d + 1 is a win
+# and 2 * d + 2 a loss of the side to move, d plies before the game ends
+MAX_DISTANCE = 126
+
+# File header: magic, the largest number of pieces, number of tables and then
+# one entry per table: its name (like "RvK", white pieces first) and the offset of its values
+HEADER = struct.Struct("<4sII")
+ENTRY = struct.Struct("<8sQ")
+MAGIC = b"ATB2"
+
+# Tables cover positions without pawns, so promotions never happen in them
+PIECE_TYPES = (KNIGHT, BISHOP, ROOK, QUEEN, KING)
+
+def _targets(x_step, y_step, length):
+    """ Returns an array (length, 64) of the square k + 1 steps away from a square or -1 """
+    targets = np.full((length, 64), -1, dtype = np.int64)
+    for square in range(0, 64):
+        x_coord, y_coord = divmod(square, 8)
+        for step in range(0, length):
+            x_to, y_to = x_coord + (step + 1) * x_step, y_coord + (step + 1) * y_step
+            if not (0 <= x_to <= 7 and 0 <= y_to <= 7):
+                break
+            targets[step, square] = x_to * 8 + y_to
+    return targets
+
+# Lines of squares a piece type can move along, a step is a line of length 1
+LINES = {
+    KNIGHT : [_targets(x_step, y_step, 1) for x_step, y_step in KNIGHT_STEPS],
+    KING : [_targets(x_step, y_step, 1) for x_step, y_step in KING_STEPS],
+    BISHOP : [_targets(x_step, y_step, 7) for x_step, y_step in BISHOP_DIRECTIONS],
+    ROOK : [_targets(x_step, y_step, 7) for x_step, y_step in ROOK_DIRECTIONS],
+    QUEEN : [_targets(x_step, y_step, 7) for x_step, y_step in BISHOP_DIRECTIONS
+             + ROOK_DIRECTIONS],
+}
+
+# BINOMIAL[n, k] is n choose k, a sorted set of k squares s_1 < ... < s_k has the rank
+# sum(BINOMIAL[s_i, i]) among all sets of k squares out of n (the combinatorial number system)
+BINOMIAL = np.array([[math.comb(n, k) for k in range(0, 5)] for n in range(0, 65)],
+                    dtype = np.int64)
+
+def _mirror(square, swap, x_flip, y_flip):
+    """ Returns the square mirrored by a symmetry of the board """
+    x_coord, y_coord = divmod(square, 8)
+    x_coord, y_coord = (7 - x_coord if x_flip else x_coord), (7 - y_coord if y_flip else y_coord)
+    return y_coord * 8 + x_coord if swap else x_coord * 8 + y_coord
+
+# The 8 symmetries of the board, SYMMETRIES[t, square] is the square it is moved to, without
+# pawns every move of a position has its mirrored move in the mirrored position
+SYMMETRIES = np.array([[_mirror(square, *symmetry) for square in range(0, 64)]
+                       for symmetry in itertools.product((False, True), repeat = 3)],
+                      dtype = np.int64)
+
+# The same tables as lists, one position is indexed faster without numpy
+_BINOMIAL_ROWS = BINOMIAL.tolist()
+_SYMMETRY_ROWS = SYMMETRIES.tolist()
+
+def _rank(squares):
+    """ Returns the ranks of the rows of sorted squares, an array (positions, k) """
+    rank = np.zeros(len(squares), dtype = np.int64)
+    for column in range(0, squares.shape[1]):
+        rank += BINOMIAL[squares[:, column], column + 1]
+    return rank
+
+def _unrank(ranks, count):
+    """ Returns the sorted squares (positions, count) of the ranks of sets of count squares """
+    squares = np.zeros((len(ranks), count), dtype = np.int64)
+    ranks = ranks.copy()
+    for column in range(count - 1, -1, -1):
+        squares[:, column] = np.searchsorted(BINOMIAL[:, column + 1], ranks, side = "right") - 1
+        ranks -= BINOMIAL[squares[:, column], column + 1]
+    return squares
+
+# Sets of squares of the first pieces of a table, keyed by their number: the symmetry that
+# moves a set to the smallest rank of its 8 images and the index of that image among those
+# smallest ranks, so a table only holds one of the mirrored positions (10 squares for one piece)
+_LEADS = {}
+
+def _lead(count):
+    """ Returns (symmetry, lead index, squares of every lead index) for sets of count squares """
+    if count not in _LEADS:
+        sets = np.array(list(itertools.combinations(range(0, 64), count)), dtype = np.int64)
+        images = np.sort(SYMMETRIES[:, sets], axis = 2)
+        image_ranks = np.stack([_rank(image) for image in images])
+        symmetry = np.zeros(len(sets), dtype = np.int64)
+        smallest = np.zeros(len(sets), dtype = np.int64)
+        ranks = _rank(sets)
+        symmetry[ranks] = np.argmin(image_ranks, axis = 0)
+        smallest[ranks] = np.min(image_ranks, axis = 0)
+        leads = np.unique(smallest)
+        _LEADS[count] = (symmetry, np.searchsorted(leads, smallest),
+                         _unrank(leads, count))
+    return _LEADS[count]
+
+def _groups(signature):
+    """ Returns (first slot, count) of the pieces of one type and colour in slot order """
+    groups, slot = [], 0
+    for types in signature:
+        for _, run in itertools.groupby(types):
+            count = len(list(run))
+            groups.append((slot, count))
+            slot += count
+    return groups
+
+def table_size(signature):
+    """ Returns the number of positions of a table with one side to move """
+    groups = _groups(signature)
+    size, placed = len(_lead(groups[0][1])[2]), groups[0][1]
+    for _, count in groups[1:]:
+        size *= int(BINOMIAL[64 - placed, count])
+        placed += count
+    return size
+
+def position_indexes(signature, squares):
+    """
+        Returns the indexes of positions in their table, squares are arrays of the square
+        of every slot (white's pieces and then black's, both ordered by type)
+
+        The first pieces are mirrored to their lead index and the other pieces with them,
+        the pieces of every further type are a set of the squares still free, so an index
+        is lead * C(n_1, k_1) * ... + rank_1 * C(n_2, k_2) * ... + rank_last
+    """
+    groups = _groups(signature)
+    first, count = groups[0]
+    symmetry, lead_indexes, _ = _lead(count)
+    lead_ranks = _rank(np.sort(np.stack(squares[first:first + count], axis = 1), axis = 1))
+    mirrored = [SYMMETRIES[symmetry[lead_ranks], square] for square in squares]
+    placed = np.stack(mirrored[first:first + count], axis = 1)
+    indexes = lead_indexes[lead_ranks]
+    for first, count in groups[1:]:
+        group = np.sort(np.stack(mirrored[first:first + count], axis = 1), axis = 1)
+        free = group - (group[:, :, None] > placed[:, None, :]).sum(axis = 2)
+        indexes = indexes * BINOMIAL[64 - placed.shape[1], count] + _rank(free)
+        placed = np.concatenate([placed, group], axis = 1)
+    return indexes
+
+def position_index(signature, squares):
+    """ Returns the index of one position like position_indexes, squares are plain ints """
+    groups = _groups(signature)
+    first, count = groups[0]
+    symmetry, lead_indexes, _ = _lead(count)
+    lead_rank = sum(_BINOMIAL_ROWS[square][column + 1] for column, square
+                    in enumerate(sorted(squares[first:first + count])))
+    mirror = _SYMMETRY_ROWS[symmetry[lead_rank]]
+    placed = [mirror[square] for square in squares[first:first + count]]
+    index = int(lead_indexes[lead_rank])
+    for first, count in groups[1:]:
+        group = sorted(mirror[square] for square in squares[first:first + count])
+        rank = sum(_BINOMIAL_ROWS[square - sum(other < square for other in placed)][column + 1]
+                   for column, square in enumerate(group))
+        index = index * _BINOMIAL_ROWS[64 - len(placed)][count] + rank
+        placed += group
+    return index
+
+def position_squares(signature, indexes):
+    """ Returns the arrays of the square of every slot of the positions with the indexes """
+    groups = _groups(signature)
+    digits, placed = [], sum(count for _, count in groups)
+    indexes = indexes.copy()
+    for _, count in reversed(groups[1:]):
+        placed -= count
+        digits.append(indexes % BINOMIAL[64 - placed, count])
+        indexes //= BINOMIAL[64 - placed, count]
+    placed = _lead(groups[0][1])[2][indexes]
+    squares = list(placed.T)
+    for (_, count), digit in zip(groups[1:], reversed(digits)):
+        group = _unrank(digit, count)
+        for square in np.sort(placed, axis = 1).T:
+            group += group >= square[:, None]
+        squares.extend(group.T)
+        placed = np.concatenate([placed, group], axis = 1)
+    return squares
+
+def table_name(white_types, black_types):
+    """ Returns the name of a table, letters of white's pieces, 'v' and black's pieces """
+    return ("".join(PIECE_LETTERS[piece] for piece in white_types) + "v"
+            + "".join(PIECE_LETTERS[piece] for piece in black_types))
+
+def table_signatures(pieces):
+    """ Returns (white types, black types) of every table with the number of pieces """
+    signatures = []
+    for white_count in range(1, pieces):
+        for white_types in itertools.combinations_with_replacement(PIECE_TYPES, white_count):
+            for black_types in itertools.combinations_with_replacement(
+                    PIECE_TYPES, pieces - white_count):
+                signatures.append((white_types, black_types))
+    return signatures
+
+def encode_value(result, distance):
+    """ Returns the byte stored for a result with the distance in plies """
+    if result == DRAW:
+        return 0
+    if distance > MAX_DISTANCE:
+        raise ValueError(f"distance {distance} does not fit into a tablebase value")
+    return 2 * distance + 1 if result == WIN else 2 * distance + 2
+
+def decode_value(value):
+    """ Returns (result, distance) of a stored byte """
+    if value == 0:
+        return DRAW, 0
+    return (WIN if value % 2 == 1 else LOSS), (value - 1) // 2
+
+def _parents(children, start, count, reverse_sources):
+    """ Returns the sources of all moves into the children, with repetitions """
+    lengths = count[children]
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype = np.int64)
+    offsets = np.repeat(start[children] - (np.cumsum(lengths) - lengths), lengths)
+    return reverse_sources[offsets + np.arange(total)]
+
+def solve_table(signature, subtables):
+    """
+        Solves every position of a table by retrograde analysis and returns their values,
+        subtables are the values of the tables one capture away keyed by their names
+
+        A position has an index side * table_size + position_indexes, moves are generated
+        for all positions at once, then results spread back from the positions where the side
+        to move has no moves (and wins), a position is won as soon as a move leads to a lost
+        one and lost once all of its moves lead to won ones, in order of the distance
+    """
+    white_types, black_types = signature
+    types = white_types + black_types
+    pieces = len(types)
+    half = table_size(signature)
+    size = 2 * half
+    # moves are kept as 32 bit indexes, 4 pieces fill gigabytes with them
+    index_type = np.int32 if size < 2 ** 31 else np.int64
+    squares = position_squares(signature, np.arange(half, dtype = np.int64))
+
+    quiet_sources, quiet_children = [], []
+    capture_sources, capture_values = [], []
+    for side in (0, 1):
+        side_offset, child_offset = side * half, (1 - side) * half
+        own_slots = range(0, len(white_types)) if side == 0 else range(len(white_types), pieces)
+        for slot in own_slots:
+            for line in LINES[types[slot]]:
+                blocked = np.zeros(half, dtype = bool)
+                for targets in line:
+                    target = targets[squares[slot]]
+                    blocked = blocked | (target < 0)
+                    occupant = np.full(half, -1, dtype = np.int64)
+                    for other in range(0, pieces):
+                        if other != slot:
+                            occupant[squares[other] == target] = other
+                    moving = ~blocked
+                    quiet = np.nonzero(moving & (occupant < 0))[0]
+                    children = position_indexes(signature, [
+                        target[quiet] if other == slot else other_squares[quiet]
+                        for other, other_squares in enumerate(squares)]) + child_offset
+                    quiet_sources.append((quiet + side_offset).astype(index_type))
+                    quiet_children.append(children.astype(index_type))
+                    for other in range(0, pieces):
+                        if (other < len(white_types)) == (side == 0):
+                            continue
+                        captures = np.nonzero(moving & (occupant == other))[0]
+                        capture_sources.append((captures + side_offset).astype(index_type))
+                        capture_values.append(_capture_values(
+                            signature, subtables, squares, slot, other, target, captures, side))
+                    blocked = blocked | (occupant >= 0)
+
+    quiet_sources = np.concatenate(quiet_sources)
+    quiet_children = np.concatenate(quiet_children)
+    capture_sources = np.concatenate(capture_sources)
+    capture_values = np.concatenate(capture_values)
+
+    # capturing is compulsory
+    can_capture = np.zeros(size, dtype = bool)
+    can_capture[capture_sources] = True
+    keep = ~can_capture[quiet_sources]
+    quiet_sources, quiet_children = quiet_sources[keep], quiet_children[keep]
+
+    remaining = (np.bincount(quiet_sources, minlength = size)
+                 + np.bincount(capture_sources, minlength = size))
+    values = np.zeros(size, dtype = np.uint8)
+    resolved = np.zeros(size, dtype = bool)
+    won = np.nonzero(remaining == 0)[0]
+    lost = np.zeros(0, dtype = np.int64)
+    values[won] = encode_value(WIN, 0)
+    resolved[won] = True
+
+    order = np.argsort(quiet_children, kind = "stable")
+    reverse_sources = quiet_sources[order]
+    count = np.bincount(quiet_children, minlength = size)
+    start = np.cumsum(count) - count
+
+    # moves into other tables, grouped by the distance of the position they lead to
+    decided = capture_values != 0
+    capture_sources, capture_values = capture_sources[decided], capture_values[decided]
+    capture_distances = (capture_values.astype(np.int64) - 1) // 2
+    order = np.argsort(capture_distances, kind = "stable")
+    capture_sources, capture_values = capture_sources[order], capture_values[order]
+    capture_distances = capture_distances[order]
+    bounds = np.searchsorted(capture_distances, np.arange(MAX_DISTANCE + 2))
+
+    for distance in range(0, MAX_DISTANCE + 1):
+        low, high = bounds[distance], bounds[distance + 1]
+        outside_sources = capture_sources[low:high]
+        outside_wins = capture_values[low:high] % 2 == 1
+        if len(won) == 0 and len(lost) == 0 and low == len(capture_sources):
+            break
+
+        # a move into a lost position wins, the first one found is the shortest
+        winning = np.concatenate([_parents(lost, start, count, reverse_sources),
+                                  outside_sources[~outside_wins]])
+        winning = np.unique(winning[~resolved[winning]])
+        # a position is lost once every move leads to a won position, the last one is the longest
+        losing = np.concatenate([_parents(won, start, count, reverse_sources),
+                                 outside_sources[outside_wins]])
+        np.subtract.at(remaining, losing, 1)
+        losing = np.unique(losing)
+        losing = losing[(remaining[losing] == 0) & ~resolved[losing]]
+
+        if len(winning) > 0:
+            values[winning] = encode_value(WIN, distance + 1)
+        if len(losing) > 0:
+            values[losing] = encode_value(LOSS, distance + 1)
+        resolved[winning] = True
+        resolved[losing] = True
+        won, lost = winning, losing
+    return values
+
+def _capture_values(signature, subtables, squares, slot, captured, target, sources, side):
+    """ Returns the values of the positions after the piece on slot captures the captured """
+    white_types, black_types = signature
+    white_count = len(white_types)
+    captured_is_white = captured < white_count
+    if (white_count if captured_is_white else len(black_types)) == 1:
+        # the side that lost its last piece is to move and wins
+        return np.full(len(sources), encode_value(WIN, 0), dtype = np.uint8)
+
+    if captured_is_white:
+        child_signature = (white_types[:captured] + white_types[captured + 1:], black_types)
+    else:
+        index = captured - white_count
+        child_signature = (white_types, black_types[:index] + black_types[index + 1:])
+    child_squares = [target[sources] if other == slot else other_squares[sources]
+                     for other, other_squares in enumerate(squares) if other != captured]
+    child_indexes = (position_indexes(child_signature, child_squares)
+                     + (1 - side) * table_size(child_signature))
+    return subtables[table_name(*child_signature)][child_indexes]
+
+def _solve_task(task):
+    signature, subtables = task
+    return table_name(*signature), solve_table(signature, subtables)
+
+def build_tablebase(path = TABLEBASE_PATH, max_pieces = 3, workers = None):
+    """
+        Solves all tables without pawns with 2 up to max_pieces pieces and writes them
+        into one file, tables with the same number of pieces are solved by a process pool
+        of workers, returns the number of tables
+    """
+    workers = os.cpu_count() if workers is None else workers
+    tables = {}
+    for pieces in range(2, max_pieces + 1):
+        tasks = []
+        for white_types, black_types in table_signatures(pieces):
+            subtables = {}
+            for index in range(0, pieces):
+                if index < len(white_types):
+                    child = (white_types[:index] + white_types[index + 1:], black_types)
+                else:
+                    black_index = index - len(white_types)
+                    child = (white_types, black_types[:black_index] + black_types[black_index + 1:])
+                if len(child[0]) > 0 and len(child[1]) > 0:
+                    subtables[table_name(*child)] = tables[table_name(*child)]
+            tasks.append(((white_types, black_types), subtables))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers = workers) as pool:
+                tables.update(pool.map(_solve_task, tasks))
+        else:
+            tables.update(map(_solve_task, tasks))
+
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, max_pieces, len(tables)))
+        offset = HEADER.size + ENTRY.size * len(tables)
+        for name, values in tables.items():
+            file.write(ENTRY.pack(name.encode(), offset))
+            offset += len(values)
+        for values in tables.values():
+            file.write(values.tobytes())
+    os.replace(temporary_path, path)
+    return len(tables)
+
+class Tablebase:
+    """
+        Read-only tablebases of positions without pawns, the file is mapped into memory
+        on the first probe and a probe reads one byte, a missing file covers no positions
+    """
+    path = TABLEBASE_PATH
+    max_pieces = 0
+
+    def __init__(self, path = TABLEBASE_PATH):
+        self.path = path
+        self.max_pieces = 0
+        self.__mapped = None
+        self.__offsets = None
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= HEADER.size:
+            with open(self.path, "rb") as file:
+                magic, max_pieces, _ = HEADER.unpack(file.read(HEADER.size))
+            self.max_pieces = max_pieces if magic == MAGIC else 0
+
+    def __open(self):
+        if self.__offsets is not None:
+            return
+        self.__offsets = {}
+        if self.max_pieces == 0:
+            return
+        with open(self.path, "rb") as file:
+            self.__mapped = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        _, _, tables = HEADER.unpack_from(self.__mapped, 0)
+        for table in range(0, tables):
+            name, offset = ENTRY.unpack_from(self.__mapped, HEADER.size + table * ENTRY.size)
+            self.__offsets[name.rstrip(b"\0").decode()] = offset
+
+    def probe(self, board, colour_to_play):
+        """
+            Returns (result, distance in plies) of the position for colour_to_play
+            or None if the tables do not cover it
+        """
+        if len(board.white_pieces_pos) + len(board.black_pieces_pos) > self.max_pieces:
+            return None
+        white_bitboards, black_bitboards = board.piece_bitboards
+        if white_bitboards[PAWN] or black_bitboards[PAWN]:
+            return None
+        if not board.colour_bitboards[0] or not board.colour_bitboards[1]:
+            return None
+        self.__open()
+
+        signature, squares = (), []
+        for bitboards in (white_bitboards, black_bitboards):
+            placed = [(piece, x_coord * 8 + y_coord) for piece in PIECE_TYPES
+                      for x_coord, y_coord in board.squares_of(bitboards[piece])]
+            signature += (tuple(piece for piece, _ in placed),)
+            squares.extend(square for _, square in placed)
+        offset = self.__offsets.get(table_name(*signature))
+        if offset is None:
+            return None
+        index = position_index(signature, squares)
+        if colour_to_play == Colour.BLACK:
+            index += table_size(signature)
+        return decode_value(self.__mapped[offset + index])
+
+    def close(self):
+        """ Unmaps the file, the next probe maps it again """
+        if self.__mapped is not None:
+            self.__mapped.close()
+        self.__mapped, self.__offsets = None, None
+
+# The tablebases shared by the whole app
+TABLEBASE = Tablebase()
+
+def main(arguments = None):
+    """ Command line entry point, run with python -m antichess.tablebase --help """
+    parser = argparse.ArgumentParser(description = "Builds the endgame tablebases")
+    parser.add_argument("--output", default = TABLEBASE_PATH)
+    parser.add_argument("--pieces", type = int, default = 3,
+                        help = "largest number of pieces, 4 pieces write 1.7 GB and take hours")
+    parser.add_argument("--workers", type = int, default = None)
+    args = parser.parse_args(arguments)
+
+    start = time.perf_counter()
+    tables = build_tablebase(args.output, args.pieces, args.workers)
+    print(f"{tables} tables written to {args.output} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,47 @@
+""" Import pytest to create tests """
+import pytest
+import pygame
+from antichess.assets import AssetCache
+from antichess.pieces import Pawn, Queen
+from antichess.colour import Colour
+
+
+@pytest.mark.parametrize('piece', [Pawn(Colour.WHITE), Queen(Colour.BLACK)])
+def test_scaled_images(piece):
+    """ Tests that an image is loaded once and scaled again only when the size changes """
+    cache = AssetCache()
+    path = piece.image_white if piece.colour == Colour.WHITE else piece.image_black
+
+    first = cache.scaled_image(path, 80.4)
+    assert first.get_size() == (80, 80)
+    assert cache.scaled_image(path, 80) is first
+    assert cache.image(path) is cache.image(path)
+
+    resized = cache.scaled_image(path, 60)
+    assert resized.get_size() == (60, 60)
+    assert resized is not first
+    assert len(cache.scaled_images) == 1
+
+
+def test_fonts_and_texts():
+    """ Tests that fonts and rendered texts are created once """
+    pygame.font.init()
+    cache = AssetCache()
+
+    assert cache.font(30) is cache.font(30.2)
+    text = cache.text("PLAY", 30, "black")
+    assert cache.text("PLAY", 30, "black") is text
+    assert cache.text("PLAY", 30, "red") is not text
+
+    for number in range(0, AssetCache.MAX_TEXTS + 1):
+        cache.text(str(number), 30, "black")
+    assert len(cache.texts) <= AssetCache.MAX_TEXTS
+
+
+def test_overlay():
+    """ Tests that the highlight surfaces are reused """
+    cache = AssetCache()
+    overlay = cache.overlay(50.5, (255, 0, 0, 90))
+
+    assert overlay.get_size() == (50, 50)
+    assert cache.overlay(50, (255, 0, 0, 90)) is overlay
@@ -0,0 +1,75 @@
+""" Import pytest to create tests """
+import random
+import pytest
+from antichess.batch import child_codes, evaluate_batch, moves_batch
+from antichess.board import Board
+from antichess.colour import Colour
+from antichess.engine import Engine
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, promotion_index',
+    [
+        (Colour.WHITE,
+         "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR", 0),
+        (Colour.BLACK,
+         "K0000000/PPPPPPPP/00000000/00000000/00000000/k0000000/ppppk000/00000000", 3),
+        (Colour.WHITE,
+         "00000000/0P00000p/00000000/00000000/000Q0000/00000000/0p00000P/0000000R", 4),
+        (Colour.BLACK,
+         "000000rb/000000pp/00000000/00000000/00000000/00000000/PP000000/QR000000", 1),
+    ])
+def test_batch_children(colour, start_pos, promotion_index):
+    """ Tests the codes, evaluations and moves of all children against the board along a game """
+    tables = tuple(tuple(piece_index * 10 + square % 7 for square in range(64))
+                   for piece_index in range(6))
+    test_board = Board(colour, start_pos, promotion_index = promotion_index,
+                       piece_square_tables = tables)
+    generator = random.Random(11)
+    is_op = False
+    for _ in range(30):
+        player = test_board.colour
+        colour_to_play = player if not is_op else (
+            Colour.BLACK if player == Colour.WHITE else Colour.WHITE)
+        other_colour = Colour.BLACK if colour_to_play == Colour.WHITE else Colour.WHITE
+        moves = test_board.generate_legal_moves(colour_to_play, is_op)
+        if len(moves) == 0:
+            break
+
+        codes = child_codes(test_board, moves, is_op)
+        evaluations = evaluate_batch(codes, colour, tables)
+        can_capture, can_move = moves_batch(codes, other_colour, not is_op)
+        for move_number, move in enumerate(moves):
+            test_board.move(move, is_op, False)
+            replies = test_board.generate_legal_moves(other_colour, not is_op)
+            assert codes[move_number].tolist() == test_board.codes.tolist()
+            assert evaluations[move_number] == test_board.evaluation
+            assert can_move[move_number] == (len(replies) != 0)
+            assert can_capture[move_number] == (len(replies) != 0 and test_board.occupied & (
+                1 << (replies[0][2] * 8 + replies[0][3])) != 0)
+            test_board.unmake_last_move()
+
+        test_board.move(generator.choice(moves), is_op, False)
+        is_op = not is_op
+
+
+@pytest.mark.parametrize('quiescence_node_limit', [256, 1, 0])
+def test_engine_batched_leaves(quiescence_node_limit):
+    """ Tests that scoring the last ply together finds the same moves and scores """
+    generator = random.Random(5)
+    for _ in range(6):
+        test_board = Board(Colour.WHITE)
+        is_op = False
+        for _ in range(2 * generator.randrange(2, 8)):
+            colour_to_play = Colour.WHITE if not is_op else Colour.BLACK
+            test_board.move(generator.choice(
+                test_board.generate_legal_moves(colour_to_play, is_op)), is_op, False)
+            is_op = not is_op
+
+        results = []
+        for batch_min_leaves in (1, 10 ** 9):
+            test_engine = Engine(test_board, 3, Colour.BLACK,
+                                 quiescence_node_limit = quiescence_node_limit)
+            test_engine.BATCH_MIN_LEAVES = batch_min_leaves
+            results.append((test_engine.get_best_move(), test_engine.best_score))
+        assert results[0] == results[1]
@@ -1,6 +1,7 @@
 """ Importing pytest to create tests """
+import random
 import pytest
-from antichess.board import Board
+from antichess.board import Board, PROMOTION_PIECES
 from antichess.colour import Colour
 
 @pytest.mark.parametrize(
@@ -247,3 +248,423 @@ def test_board_check_move_valid(colour, start_pos, moves_to_test):
     for item in moves_to_test:
         move, is_valid, is_opponent = item
         assert test_board.is_move_valid(move, is_opponent) == is_valid
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, moves_to_make',
+    [
+        # colour of player, board position, (move to make, is it by opponent)
+        (
+            Colour.WHITE,
+            "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR",
+            [((6,4,4,4), False), ((1,3,3,3), True), ((4,4,3,3), False), ((0,3,3,3), True)],
+        ),
+
+        (
+            Colour.BLACK,
+            "K0000000/PPPPPPPP/00000000/00000000/00000000/k0000000/ppppk000/00000000",
+            [((1,7,0,7), False), ((5,0,5,1), True), ((1,6,0,6), False), ((6,1,7,1), True)],
+        ),
+    ])
+def test_board_bitboards(colour, start_pos, moves_to_make):
+    """ Tests that the bitboards follow the pieces on current_board through moves and unmoves """
+    test_board = Board(colour, start_pos)
+
+    def assert_bitboards_match():
+        occupied = 0
+        for row in range(0, 8):
+            for col in range(0, 8):
+                piece = test_board.current_board[row, col]
+                if piece is not False:
+                    occupied |= 1 << (row * 8 + col)
+                    assert test_board.colour_bitboards[piece.colour.value] & (1 << (row * 8 + col))
+        assert test_board.occupied == occupied
+        assert test_board.colour_bitboards[0] | test_board.colour_bitboards[1] == occupied
+        assert sum(test_board.piece_bitboards[0]) == test_board.colour_bitboards[0]
+        assert sum(test_board.piece_bitboards[1]) == test_board.colour_bitboards[1]
+        assert set(Board.squares_of(test_board.colour_bitboards[0])) == test_board.white_pieces_pos
+        assert set(Board.squares_of(test_board.colour_bitboards[1])) == test_board.black_pieces_pos
+
+    start_occupancy = test_board.occupied
+    for move, is_op in moves_to_make:
+        assert test_board.move(move, is_op)
+        assert_bitboards_match()
+
+    while test_board.unmake_last_move():
+        assert_bitboards_match()
+
+    assert test_board.occupied == start_occupancy
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, colour_to_play, legal_moves',
+    [
+        # colour of player, board position, colour to play, all legal moves of that colour
+        (
+            Colour.WHITE,
+            "00000000/00000000/00000000/00000000/00000000/00000000/00000000/00000000",
+            Colour.WHITE,
+            []
+        ),
+
+        (
+            Colour.WHITE,
+            "0000k000/00000000/00000000/00000000/00000000/00000000/0P000000/N0000000",
+            Colour.WHITE,
+            [(6,1,5,1), (6,1,4,1), (7,0,5,1), (7,0,6,2)]
+        ),
+
+        (
+            Colour.WHITE,
+            "0000k000/00000000/00000000/00000000/00000000/00n00000/0P000000/R0000000",
+            Colour.WHITE,
+            [(6,1,5,2)]
+        ),
+
+        (
+            Colour.BLACK,
+            "r000000r/0P000000/00000000/00000000/00000000/00000000/00000000/0000000R",
+            Colour.BLACK,
+            [(1,1,0,0), (7,7,0,7)]
+        ),
+
+        (
+            Colour.BLACK,
+            "r000000r/0P000000/00000000/00000000/00000000/00000000/00000000/0000000R",
+            Colour.WHITE,
+            [(0,7,7,7)]
+        ),
+    ])
+def test_board_generate_legal_moves(colour, start_pos, colour_to_play, legal_moves):
+    """ Tests the generate_legal_moves() method of Board against is_move_valid() """
+    test_board = Board(colour, start_pos)
+    is_opponent = colour_to_play != colour
+    generated = test_board.generate_legal_moves(colour_to_play)
+
+    assert sorted(generated) == sorted(legal_moves)
+    for move in generated:
+        assert test_board.is_move_valid(move, is_opponent)
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, moves_to_make',
+    [
+        # colour of player, board position, (move to make, is it by opponent)
+        (
+            Colour.WHITE,
+            "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR",
+            [((6,4,4,4), False), ((1,3,3,3), True), ((4,4,3,3), False), ((0,3,3,3), True)],
+        ),
+
+        (
+            Colour.BLACK,
+            "K0000000/PPPPPPPP/00000000/00000000/00000000/k0000000/ppppk000/00000000",
+            [((1,7,0,7), False), ((5,0,5,1), True), ((1,6,0,6), False), ((6,1,7,1), True)],
+        ),
+    ])
+def test_board_hash(colour, start_pos, moves_to_make):
+    """ Tests that the incremental hash_key always equals the hash computed from scratch """
+    test_board = Board(colour, start_pos)
+    hashes = [test_board.hash_key]
+    assert test_board.hash_key == test_board.compute_hash()
+
+    for move, is_op in moves_to_make:
+        assert test_board.move(move, is_op)
+        assert test_board.hash_key == test_board.compute_hash()
+        assert test_board.hash_key not in hashes
+        hashes.append(test_board.hash_key)
+
+    while test_board.unmake_last_move():
+        assert test_board.hash_key == test_board.compute_hash()
+
+    assert test_board.hash_key == hashes[0]
+
+
+def test_board_hash_transposition():
+    """ Tests that the same position reached by two move orders has the same hash """
+    first_board = Board(Colour.WHITE)
+    second_board = Board(Colour.WHITE)
+
+    for move, is_op in [((6,4,5,4), False), ((1,4,2,4), True), ((6,3,5,3), False)]:
+        first_board.move(move, is_op)
+    for move, is_op in [((6,3,5,3), False), ((1,4,2,4), True), ((6,4,5,4), False)]:
+        second_board.move(move, is_op)
+
+    assert first_board.hash_key == second_board.hash_key
+    assert first_board.hash_key != Board(Colour.WHITE).hash_key
+
+
+def test_board_hash_side_and_promotion():
+    """ Tests that the side to move and the promotion cycle are a part of the hash """
+    start_pos = "0000k000/00000000/00000000/00000000/00000000/00000000/00000000/0000K000"
+    white_board = Board(Colour.WHITE, start_pos)
+    black_board = Board(Colour.WHITE, start_pos, Colour.BLACK)
+    assert white_board.hash_key != black_board.hash_key
+
+    # a pawn is promoted and the promoted piece is captured so only promotion_index differs
+    promoted_board = Board(Colour.WHITE,
+        "00r0k000/P0000000/00000000/00000000/00000000/00000000/00000000/0000K000")
+    assert promoted_board.move((1,0,0,0), False)
+    assert promoted_board.move((0,2,0,0), True)
+    assert promoted_board.move((7,4,6,4), False)
+    assert promoted_board.move((0,4,1,4), True)
+    assert promoted_board.move((6,4,7,4), False)
+    assert promoted_board.move((1,4,0,4), True)
+    assert promoted_board.promotion_index == 1
+
+    plain_board = Board(Colour.WHITE,
+        "r000k000/00000000/00000000/00000000/00000000/00000000/00000000/0000K000")
+    assert plain_board.move((7,4,6,4), False)
+    assert plain_board.move((0,4,1,4), True)
+    assert plain_board.move((6,4,7,4), False)
+    assert plain_board.move((1,4,0,4), True)
+
+    assert promoted_board.side_to_move == plain_board.side_to_move
+    assert promoted_board.occupied == plain_board.occupied
+    assert promoted_board.hash_key != plain_board.hash_key
+
+
+def test_board_hash_colour():
+    """ Tests that the same pieces on the same squares hash differently for both players """
+    # both boards have a white king and pawn at the bottom and a black king at the top,
+    # the white pawn moves up on the first board and down on the second one
+    white_board = Board(Colour.WHITE,
+        "0000k000/00000000/00000000/00000000/00000000/00000000/0000P000/0000K000")
+    black_board = Board(Colour.BLACK,
+        "0000K000/00000000/00000000/00000000/00000000/00000000/0000p000/0000k000")
+    assert white_board.occupied == black_board.occupied
+    assert white_board.colour_bitboards == black_board.colour_bitboards
+    assert white_board.hash_key != black_board.hash_key
+    assert black_board.hash_key == black_board.compute_hash()
+
+    assert black_board.move((0,4,1,4), False)
+    assert black_board.hash_key == black_board.compute_hash()
+    assert black_board.unmake_last_move()
+    assert black_board.hash_key == black_board.compute_hash()
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, moves_to_make',
+    [
+        # colour of player, board position, (move to make, is it by opponent)
+        (
+            Colour.WHITE,
+            "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR",
+            [((6,4,4,4), False), ((1,3,3,3), True), ((4,4,3,3), False), ((0,3,3,3), True)],
+        ),
+
+        (
+            Colour.BLACK,
+            "K0000000/PPPPPPPP/00000000/00000000/00000000/k0000000/ppppk000/00000000",
+            [((1,7,0,7), False), ((5,0,5,1), True), ((1,6,0,6), False), ((6,1,7,1), True)],
+        ),
+    ])
+def test_board_evaluation(colour, start_pos, moves_to_make):
+    """ Tests that the incremental evaluation is the material of white minus black """
+    tables = tuple(tuple(piece_index * 10 + square % 7 for square in range(64))
+                   for piece_index in range(6))
+    test_board = Board(colour, start_pos)
+    square_board = Board(colour, start_pos, piece_square_tables = tables)
+    evaluations = [square_board.evaluation]
+
+    for move, is_op in moves_to_make:
+        assert test_board.move(move, is_op)
+        assert square_board.move(move, is_op)
+        material = (
+            sum(test_board.current_board[pos].get_value() for pos in test_board.white_pieces_pos)
+            - sum(test_board.current_board[pos].get_value() for pos in test_board.black_pieces_pos))
+        assert test_board.evaluation == test_board.compute_evaluation() == material
+        assert square_board.evaluation == square_board.compute_evaluation()
+        evaluations.append(square_board.evaluation)
+
+    while square_board.unmake_last_move():
+        evaluations.pop()
+        assert square_board.evaluation == evaluations[-1]
+        assert square_board.evaluation == square_board.compute_evaluation()
+
+
+def test_board_evaluation_square_tables():
+    """ Tests that a piece square table is seen from the side of the piece's owner """
+    tables = tuple(tuple(range(64)) if piece_index == 5 else (0,) * 64
+                   for piece_index in range(6))
+    start_pos = "0000k000/00000000/00000000/00000000/00000000/00000000/00000000/000K0000"
+    for colour in (Colour.WHITE, Colour.BLACK):
+        test_board = Board(colour, start_pos, piece_square_tables = tables)
+        player_bonus, opponent_bonus = 7 * 8 + 3, 63 - 4
+        sign = 1 if colour == Colour.WHITE else -1
+        assert test_board.evaluation == sign * (player_bonus - opponent_bonus)
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos',
+    [
+        (Colour.WHITE, "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR"),
+        (Colour.BLACK, "K0000000/PPPPPPPP/00000000/00000000/00000000/k0000000/ppppk000/00000000"),
+        (Colour.WHITE, "00000000/00000000/00000000/00000000/0000p000/0000P000/00000000/00000000"),
+        (Colour.BLACK, "000000rb/000000pp/00000000/00000000/00000000/00000000/PP000000/QR000000"),
+        (Colour.WHITE, "00000000/00000000/00000000/00000000/00000000/00000000/00000000/00000000"),
+    ])
+def test_board_has_legal_moves(colour, start_pos):
+    """ Tests has_legal_moves() against generate_legal_moves() along a random game """
+    test_board = Board(colour, start_pos)
+    generator = random.Random(7)
+    is_op = False
+    for _ in range(60):
+        player = test_board.colour
+        colour_to_play = player if not is_op else (
+            Colour.BLACK if player == Colour.WHITE else Colour.WHITE)
+        moves = test_board.generate_legal_moves(colour_to_play, is_op)
+        assert test_board.has_legal_moves(colour_to_play, is_op) == (len(moves) != 0)
+        if len(moves) == 0:
+            break
+        test_board.move(generator.choice(moves), is_op, False)
+        is_op = not is_op
+
+
+@pytest.mark.parametrize('colour', [Colour.WHITE, Colour.BLACK])
+def test_board_pawn_follows_its_colour(colour):
+    """ Tests that the colour of a pawn and not is_opponent decides how it moves and promotes """
+    start_pos = "0000k000/P0000000/00000000/00000000/00000000/00000000/0000000p/0000K000"
+    opponent = Colour.BLACK if colour == Colour.WHITE else Colour.WHITE
+    test_board = Board(colour, start_pos)
+
+    assert test_board.generate_legal_moves(colour) == test_board.generate_legal_moves(colour, False)
+    assert (0,0) in test_board.legal_moves_from(1, 0, False)
+    assert (7,7) in test_board.legal_moves_from(6, 7, True)
+    with pytest.raises(AssertionError):
+        test_board.generate_legal_moves(colour, True)
+    with pytest.raises(AssertionError):
+        test_board.has_legal_moves(opponent, False)
+    with pytest.raises(AssertionError):
+        test_board.can_take(opponent, False)
+
+    # a move of the wrong side still promotes into a piece of the pawn's colour
+    assert test_board.move((1,0,0,0), True)
+    assert test_board.current_board[0,0].colour == colour
+    assert test_board.move((6,7,7,7), False)
+    assert test_board.current_board[7,7].colour == opponent
+    assert test_board.hash_key == test_board.compute_hash()
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, moves_to_make',
+    [
+        (Colour.WHITE, "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR",
+         [((6, 4, 4, 4), False), ((1, 3, 3, 3), True)]),
+        (Colour.BLACK, "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR",
+         [((6, 0, 5, 0), False)]),
+        # two promotions so the promotion index is not 0
+        (Colour.WHITE, "00000000/PP000000/00000000/00000000/00000000/00000000/pp000000/00000000",
+         [((1, 0, 0, 0), False), ((6, 0, 7, 0), True), ((0, 0, 7, 0), False)]),
+        (Colour.BLACK, "00000000/00000000/00000000/00000000/00000000/00000000/00000000/00000000",
+         []),
+    ])
+def test_board_clone_and_serialization(colour, start_pos, moves_to_make):
+    """ Tests that clone, to_fen and to_bytes keep the position, side to move and promotions """
+    test_board = Board(colour, start_pos)
+    for move, is_op in moves_to_make:
+        assert test_board.move(move, is_op)
+
+    copies = [test_board.clone(), Board.from_fen(test_board.to_fen()),
+              Board.from_bytes(test_board.to_bytes())]
+    for board_copy in copies:
+        assert board_copy.to_fen() == test_board.to_fen()
+        assert board_copy.to_bytes() == test_board.to_bytes()
+        assert (board_copy.colour, board_copy.side_to_move, board_copy.promotion_index) == (
+            test_board.colour, test_board.side_to_move, test_board.promotion_index)
+        assert board_copy.hash_key == test_board.hash_key == board_copy.compute_hash()
+        assert board_copy.evaluation == test_board.evaluation
+        assert list(board_copy.codes) == list(test_board.codes)
+        assert len(board_copy.moves_played) == 0
+
+    # moves on the clone do not change the board it was cloned from
+    clone, fen = copies[0], test_board.to_fen()
+    for _ in range(3):
+        is_op = clone.side_to_move != clone.colour
+        moves = clone.generate_legal_moves(clone.side_to_move, is_op)
+        if len(moves) == 0:
+            break
+        clone.move(moves[0], is_op, False)
+    while clone.unmake_last_move():
+        pass
+    assert test_board.to_fen() == fen and clone.to_fen() == fen
+    assert len(test_board.to_bytes()) == 35
+
+
+@pytest.mark.parametrize('fen', [
+    "", "00000000 w w", "00000000 w x 0", "00000000 w b -1",
+    # rows of the position that are too long, too short, missing or use other letters
+    "000000000K w w 0", "X w w 0", "00000000/00000000 w w 0",
+    "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBN w w 0",
+    "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNX w w 0",
+    "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR/00000000 w w 0",
+])
+def test_board_from_fen_invalid(fen):
+    """ Tests that a malformed line is refused """
+    with pytest.raises(ValueError):
+        Board.from_fen(fen)
+    with pytest.raises(ValueError):
+        Board.from_bytes(fen.encode())
+
+
+@pytest.mark.parametrize('promotion_index, expected', [(0, 0), (4, 4), (7, 2), (70000, 0)])
+def test_board_promotion_index_cycle(promotion_index, expected):
+    """ Tests that the promotion index is kept in the cycle of the 5 promotion pieces """
+    test_board = Board.from_fen("00000000/P0000000/00000000/00000000/00000000/00000000/"
+                                f"00000000/0000000k w w {promotion_index}")
+    assert test_board.promotion_index == expected
+    copy = Board.from_bytes(test_board.to_bytes())
+    assert copy.to_fen() == test_board.to_fen()
+    assert copy.hash_key == test_board.hash_key == test_board.compute_hash()
+
+    # the pawn promotes to the piece of that place in the cycle
+    test_board.move((1, 0, 0, 0), False)
+    assert isinstance(test_board.current_board[0, 0], PROMOTION_PIECES[expected])
+
+
+@pytest.mark.parametrize(
+    'move, is_valid',
+    [
+        # knights and kings move only to their targets, rooks only along a rank or a file
+        ((7, 1, 5, 0), True), ((7, 1, 3, 3), False), ((7, 1, 6, 1), False),
+        ((7, 4, 6, 4), True), ((7, 4, 5, 4), False),
+        ((7, 7, 5, 7), True), ((7, 7, 6, 6), False), ((7, 7, 4, 4), False),
+        ((5, 2, 3, 4), True), ((5, 2, 0, 7), True), ((5, 2, 2, 2), False), ((5, 2, 4, 2), False),
+    ])
+def test_board_move_patterns(move, is_valid):
+    """ Tests that is_move_valid() refuses moves a piece cannot make at all """
+    test_board = Board(Colour.WHITE,
+                       "0000k000/00000000/00000000/00000000/00000000/00B00000/000000P0/0N00K00R")
+    assert test_board.is_move_valid(move, False) == is_valid
+
+
+@pytest.mark.parametrize(
+    'start_pos, move, is_opponent, is_valid',
+    [
+        # pawns push one square forward or two from their row, capture one square
+        # diagonally forward and never move back
+        ("0000k000/00000000/00000000/00000000/00000n00/00000000/0000P000/0000K000",
+         (6, 4, 4, 5), False, False),
+        ("0000k000/00000000/00000000/00000000/00000n00/00000000/0000P000/0000K000",
+         (6, 4, 4, 4), False, True),
+        ("0000k000/00000000/00000000/00000000/0000P000/00000000/00000000/0000K000",
+         (4, 4, 5, 4), False, False),
+        ("0000k000/00000000/00000000/00000000/0000P000/00000000/00000000/0000K000",
+         (4, 4, 2, 4), False, False),
+        ("0000k000/00000000/00000000/00000000/0000P000/00000000/00000000/0000K000",
+         (4, 4, 3, 4), False, True),
+        ("00N0k000/000p0000/00000000/0000N000/00000000/00000000/00000000/0000K000",
+         (1, 3, 0, 2), True, False),
+        ("00N0k000/000p0000/00000000/0000N000/00000000/00000000/00000000/0000K000",
+         (1, 3, 3, 4), True, False),
+        ("00N0k000/000p0000/00000000/0000N000/00000000/00000000/00000000/0000K000",
+         (1, 3, 0, 3), True, False),
+        ("00N0k000/000p0000/00000000/0000N000/00000000/00000000/00000000/0000K000",
+         (1, 3, 3, 3), True, True),
+        ("00000000/000p0000/0000N000/00000000/00000000/00000000/00000000/0000K000",
+         (1, 3, 2, 4), True, True),
+    ])
+def test_board_pawn_moves(start_pos, move, is_opponent, is_valid):
+    """ Tests that is_move_valid() allows pawns only their pushes and captures """
+    test_board = Board(Colour.WHITE, start_pos)
+    assert test_board.is_move_valid(move, is_opponent) == is_valid
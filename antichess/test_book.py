@@ -0,0 +1,63 @@
+""" Import pytest to create tests """
+import os
+import subprocess
+import sys
+import pytest
+from antichess.book import OpeningBook, build_book, write_book, encode_move, decode_move
+from antichess.board import Board
+from antichess.colour import Colour
+from antichess.engine import Engine
+
+
+@pytest.mark.parametrize('move', [(0,0,0,0), (6,4,4,4), (1,7,0,6), (7,7,7,7)])
+def test_encode_move(move):
+    """ Tests that a packed move fits into the record and unpacks to the same move """
+    assert 0 <= encode_move(move) < 4096
+    assert decode_move(encode_move(move)) == move
+
+
+def test_book_probe(tmp_path):
+    """ Tests the binary search over the records and the order of moves of one key """
+    path = str(tmp_path / "book.bin")
+    records = [(key, (6, key % 8, 5, key % 8), key % 5 + 1, -key % 7) for key in range(0, 300, 3)]
+    records += [(150, (6, 0, 4, 0), 9, 3), (2 ** 64 - 1, (1, 1, 2, 1), 1, -576)]
+    assert write_book(path, records) == len(records)
+
+    book = OpeningBook(path)
+    assert len(book) == len(records)
+    assert book.probe(150) == [((6, 0, 4, 0), 9, 3), ((6, 6, 5, 6), 1, 4)]
+    assert book.probe(3) == [((6, 3, 5, 3), 4, 4)]
+    assert book.probe(2 ** 64 - 1) == [((1, 1, 2, 1), 1, -576)]
+    for missing_key in (1, 151, 299, 2 ** 63):
+        assert book.probe(missing_key) == []
+    book.close()
+    assert OpeningBook(str(tmp_path / "missing.bin")).probe(0) == []
+
+
+def test_engine_plays_from_book(tmp_path):
+    """ Tests that the engine plays the built book moves without searching """
+    path = str(tmp_path / "book.bin")
+    assert build_book(path, depth = 1, engine_moves = 1) > 0
+    book = OpeningBook(path)
+
+    for colour, player_move in [(Colour.BLACK, None), (Colour.WHITE, (6, 4, 4, 4))]:
+        test_board = Board(colour)
+        if player_move is not None:
+            test_board.move(player_move)
+        engine_colour = Colour.WHITE if colour == Colour.BLACK else Colour.BLACK
+
+        searching_engine = Engine(test_board, 1, engine_colour)
+        book_engine = Engine(test_board, 1, engine_colour, book = book)
+        assert book_engine.get_best_move() == searching_engine.get_best_move()
+        assert book_engine.nodes == 0
+        assert searching_engine.nodes > 0
+
+
+def test_book_path(tmp_path):
+    """ Tests that the book of the package is found when started from another directory """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = "from antichess.book import OPENING_BOOK\nprint(len(OPENING_BOOK) > 0)\n"
+    output = subprocess.run([sys.executable, "-c", script], cwd = tmp_path, check = True,
+                            env = dict(os.environ, PYTHONPATH = root),
+                            capture_output = True, text = True).stdout.split()
+    assert output == ["True"]
@@ -1,6 +1,10 @@
 """ Import pytest to create tests for antichess """
+import threading
+import time
 import pytest
+from antichess import engine as engine_module
 from antichess.engine import Engine
+from antichess.transposition import TranspositionTable
 from antichess.colour import Colour
 from antichess.board import Board
 
@@ -78,3 +82,189 @@ def test_engine_best_move(colour, start_pos, depth, best_moves):
 
     # sometimes more than one move is optimal at a given depth
     assert test_engine.get_best_move() in best_moves
+
+@pytest.mark.parametrize(
+    'colour, start_pos, time_limit, node_limit',
+    [
+        # Colour of player, position to begin, time budget in seconds, node budget
+        (Colour.WHITE,
+         "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR",
+         0.3, None),
+        (Colour.BLACK,
+         "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR",
+         None, 2000),
+        (Colour.BLACK,
+         "R000000r/0PP00000/00000000/00000000/00000000/0KR00000/00000000/0000000R",
+         0.3, 5000),
+    ])
+def test_engine_search_budget(colour, start_pos, time_limit, node_limit):
+    """ Test that the iterative deepening of get_best_move() stays inside of its budget """
+    test_board = Board(colour, start_pos)
+    engine_colour = Colour.WHITE if colour == Colour.BLACK else Colour.BLACK
+    test_engine = Engine(test_board, None, engine_colour,
+                         time_limit = time_limit, node_limit = node_limit)
+
+    start = time.perf_counter()
+    best_move = test_engine.get_best_move()
+    elapsed = time.perf_counter() - start
+
+    assert best_move in test_board.generate_legal_moves(engine_colour)
+    assert test_engine.completed_depth >= 0
+    if time_limit is not None:
+        assert elapsed < time_limit + 0.5
+    if node_limit is not None:
+        assert test_engine.nodes <= node_limit
+
+@pytest.mark.parametrize(
+    'colour, start_pos, depth',
+    [
+        # Colour of player, position to begin, depth of engine
+        (Colour.WHITE,
+         "R0000000/00000000/00000000/00000000/00000000/00000000/00000000/000r0000", 4),
+        (Colour.BLACK,
+         "R000000r/0PP00000/00000000/00000000/00000000/0KR00000/00000000/0000000R", 2),
+        (Colour.BLACK,
+         "rnbqkbnr/pp0ppppp/00000000/00p00000/0000P000/00000000/PPPP0PPP/RNBQKBNR", 2),
+        (Colour.WHITE,
+         "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR", 2),
+    ])
+def test_engine_parallel_best_move(colour, start_pos, depth):
+    """ Test that splitting the root moves between processes finds the sequential best move """
+    test_board = Board(colour, start_pos)
+    engine_colour = Colour.WHITE if colour == Colour.BLACK else Colour.BLACK
+
+    sequential_move = Engine(test_board, depth, engine_colour).get_best_move()
+    parallel_engine = Engine(test_board, depth, engine_colour, workers = 2)
+
+    assert parallel_engine.get_best_move() == sequential_move
+    assert parallel_engine.completed_depth >= 0
+
+def test_engine_parallel_budget_and_stop():
+    """ Test that root moves waiting for a worker do not get the time budget again """
+    test_board = Board(Colour.BLACK)
+    engine = Engine(test_board, None, Colour.WHITE, time_limit = 1.0, workers = 2)
+    start = time.perf_counter()
+    assert engine.get_best_move() in test_board.generate_legal_moves(Colour.WHITE, True)
+    assert time.perf_counter() - start < 1.5
+    assert engine.completed_depth >= 0
+
+    engine = Engine(test_board, None, Colour.WHITE, workers = 2)
+    search = threading.Thread(target = engine.get_best_move)
+    search.start()
+    time.sleep(1.5)
+    start = time.perf_counter()
+    engine.stop()
+    search.join()
+    assert time.perf_counter() - start < 0.5
+    assert engine.completed_depth >= 0
+
+@pytest.mark.parametrize(
+    'colour, start_pos, depth',
+    [
+        # Colour of player, position to begin, depth of engine
+        (Colour.WHITE,
+         "R0000000/00000000/00000000/00000000/00000000/00000000/00000000/000r0000", 3),
+        (Colour.BLACK,
+         "R000000r/0PP00000/00000000/00000000/00000000/0KR00000/00000000/0000000R", 2),
+        (Colour.BLACK,
+         "rnbqkbnr/pp0ppppp/00000000/00p00000/0000P000/00000000/PPPP0PPP/RNBQKBNR", 2),
+        (Colour.WHITE,
+         "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR", 3),
+    ])
+def test_engine_principal_variation_search(colour, start_pos, depth):
+    """ Test that the null window search picks the move a full window search of every move picks """
+    test_board = Board(colour, start_pos)
+    engine_colour = Colour.WHITE if colour == Colour.BLACK else Colour.BLACK
+    sign = 1 if engine_colour == Colour.BLACK else -1
+
+    moves = test_board.generate_legal_moves(engine_colour)
+    evaluations = [sign * Engine(test_board, depth, engine_colour).evaluate_move(move, depth)
+                   for move in moves]
+    best_move = Engine(test_board, depth, engine_colour).get_best_move()
+
+    assert evaluations[moves.index(best_move)] == max(evaluations)
+
+@pytest.mark.parametrize(
+    'colour, start_pos, best_moves',
+    [
+        # Colour of player, position to begin, best move or moves of a deeper search
+        (Colour.WHITE,
+         "R0000000/00000000/00000000/00000000/00000000/00000000/00000000/000r0000",
+         [(7,3,0,3), (7,3,7,0)]),
+        (Colour.BLACK,
+         "r0000000/0P000000/00000000/00000000/00000000/00000000/00000000/0000000R",
+         [(0,0,0,2)]),
+        (Colour.BLACK,
+         "R000000r/0PP00000/00000000/00000000/00000000/0KR00000/00000000/0000000R",
+         [(0,7,0,0)]),
+    ])
+def test_engine_quiescence(colour, start_pos, best_moves):
+    """ Test that searching the forced captures at depth 0 finds the move of a deeper search """
+    test_board = Board(colour, start_pos)
+    engine_colour = Colour.WHITE if colour == Colour.BLACK else Colour.BLACK
+
+    assert Engine(test_board, 0, engine_colour).get_best_move() in best_moves
+    assert Engine(test_board, 0, engine_colour,
+                  quiescence_node_limit = 0).get_best_move() not in best_moves
+
+def test_engine_quiescence_node_limit():
+    """ Test that the search of captures below depth 0 stops at its node limit """
+    test_board = Board(Colour.WHITE,
+        "rnbqkbnr/pp0ppppp/00000000/00p00000/0000P000/00000000/PPPP0PPP/RNBQKBNR")
+
+    unlimited_engine = Engine(test_board, 1, Colour.BLACK, quiescence_node_limit = 0)
+    unlimited_engine.get_best_move()
+    assert unlimited_engine.quiescence_nodes == 0
+
+    limited_engine = Engine(test_board, 1, Colour.BLACK, quiescence_node_limit = 3)
+    limited_engine.get_best_move()
+    full_engine = Engine(test_board, 1, Colour.BLACK)
+    full_engine.get_best_move()
+    assert 0 < limited_engine.quiescence_nodes < full_engine.quiescence_nodes
+
+
+def test_engine_worker_table_follows_search_table(monkeypatch):
+    """ Tests that a pool worker drops its table once the table or settings of a search change """
+    # pylint: disable=protected-access
+    monkeypatch.setattr(engine_module, "_WORKER_STOP_FLAGS", engine_module._STOP_FLAGS)
+    table = TranspositionTable(1)
+    identity = table.identity
+    table.clear()
+    assert table.identity != identity != TranspositionTable(1).identity
+
+    test_board = Board(Colour.WHITE)
+    position = (test_board.to_bytes(), None)
+    move = test_board.generate_legal_moves(Colour.BLACK, True)[0]
+    worker_tables = []
+    for table_key in [(0, table.identity, 256), (0, table.identity, 256),
+                      (0, table.identity, 0), (0, TranspositionTable(1).identity, 0)]:
+        engine_module._search_root_move(position, move, 1, Colour.BLACK.value, None, None,
+                                        table_key[2], table_key, 0)
+        worker_tables.append(engine_module._WORKER_TABLE)
+    assert worker_tables[0].stores > 0
+    assert worker_tables[1] is worker_tables[0]
+    assert worker_tables[2] is not worker_tables[1] and worker_tables[3] is not worker_tables[2]
+
+
+def test_engine_parallel_searches_stop_alone():
+    """ Tests that stopping one search of a pool leaves the other searches running """
+    test_board = Board(Colour.WHITE)
+    test_board.move((6, 4, 4, 4))
+    endless = Engine(test_board, None, Colour.BLACK, workers = 2)
+    other = Engine(test_board, 3, Colour.BLACK, workers = 2)
+    results = {}
+    endless_search = threading.Thread(target = endless.get_best_move)
+    other_search = threading.Thread(target = lambda: results.update(move = other.get_best_move()))
+    endless_search.start()
+    time.sleep(0.5)
+    other_search.start()
+    time.sleep(0.5)
+    endless.stop()
+    endless_search.join()
+    other_search.join()
+
+    assert other.stopped is False and other.completed_depth == 3
+    assert results["move"] == Engine(test_board, 3, Colour.BLACK).get_best_move()
+    # pylint: disable=protected-access
+    assert sorted(engine_module._FREE_STOP_SLOTS) == list(range(0, engine_module.STOP_SLOTS))
+
@@ -1,4 +1,5 @@
 """ Import pytest to create tests """
+import os
 import pytest
 import pygame
 from antichess.game import Game
@@ -86,3 +87,64 @@ def test_stalemate(colour, start_pos, colour_to_check, is_stalemate):
     """ Tests the check_stalemate() method of Game """
     test_game = Game(pygame.display, colour, 1, start_pos)
     assert test_game.check_stalemate(colour_to_check) == is_stalemate
+
+
+@pytest.fixture(name = "ponder_game")
+def fixture_ponder_game():
+    """ Game with pondering in a window of the dummy video driver """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    window = pygame.display.set_mode((300, 300))
+    test_game = Game(window, Colour.WHITE, 2,
+        "rnbqkbnr/pppppp0p/000000p0/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR",
+        ponder = True)
+    # the player's move and the engine's reply before the engine starts pondering
+    test_game.board.move((6, 7, 5, 7))
+    search = test_game._Game__start_search((6, 7, 5, 7))
+    test_game.board.move(search.result(), True)
+    test_game._Game__start_pondering()
+    return test_game
+
+
+@pytest.mark.parametrize('is_hit', [True, False])
+def test_pondering(ponder_game, is_hit):
+    """ Tests that a ponder hit continues the ponder search and a miss starts a new one """
+    expected_move, ponder_search = ponder_game._Game__pondering
+    player_moves = ponder_game.board.generate_legal_moves(Colour.WHITE, False)
+    assert expected_move in player_moves
+
+    move = expected_move if is_hit else next(
+        player_move for player_move in player_moves if player_move != expected_move)
+    ponder_game.board.move(move)
+    search = ponder_game._Game__start_search(move)
+
+    assert ponder_game._Game__pondering is None
+    assert (search is ponder_search) == is_hit
+    if not is_hit:
+        # the ponder search was stopped and waited for before the new search started
+        assert ponder_search.done()
+    assert search.result() in ponder_game.board.generate_legal_moves(Colour.BLACK, True)
+
+
+@pytest.mark.parametrize('event_type', [pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED])
+def test_window_redrawn(event_type):
+    """ Tests that the whole board is drawn again once the window was uncovered or resized """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    window = pygame.display.set_mode((300, 300))
+    test_game = Game(window, Colour.WHITE, 1)
+    redraws = []
+    display_board = test_game.view.display_board
+
+    def recorded_display_board(window, highlights = None, redraw_all = False):
+        redraws.append(redraw_all)
+        if len(redraws) == 2:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        return display_board(window, highlights, redraw_all)
+
+    test_game.view.display_board = recorded_display_board
+    pygame.event.clear()
+    pygame.event.post(pygame.event.Event(event_type))
+    assert test_game.start_game() == "QUIT"
+    assert redraws == [True, True]
+
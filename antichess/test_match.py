@@ -0,0 +1,129 @@
+""" Import pytest to create tests """
+import math
+import pytest
+from antichess.match import (EngineConfig, SPRT, MatchResult, GameRecord, play_game, run_match,
+                             opening_lines, elo_difference, mirror_position, mirror_move)
+from antichess.board import Board, STARTING_POSITION
+from antichess.colour import Colour
+
+
+@pytest.mark.parametrize('score, elo', [(0.5, 0), (0.75, 190.85), (0.25, -190.85), (0.9, 381.7)])
+def test_elo_difference(score, elo):
+    """ Tests the Elo difference of an expected score """
+    assert elo_difference(score) == pytest.approx(elo, abs = 0.1)
+
+
+def test_match_result():
+    """ Tests the score, Elo and its error bars of the counted games """
+    result = MatchResult()
+    for white_score, a_is_white in [(1, True), (1, False), (0.5, True), (0, False), (0, True)]:
+        record = GameRecord()
+        record.white_score = white_score
+        record.nodes, record.search_time = [100, 300], [1.0, 2.0]
+        record.move_times = [[1.0], [2.0]]
+        result.add(record, a_is_white)
+
+    assert (result.wins, result.draws, result.losses) == (2, 1, 2)
+    assert result.score() == 0.5
+    elo, margin = result.elo()
+    assert elo == 0 and 0 < margin < 1000
+    assert result.nodes == [100 * 3 + 300 * 2, 300 * 3 + 100 * 2]
+    assert result.nodes_per_second(0) == pytest.approx(900 / 7)
+    assert result.latency(1) == (1.6, 2.0, 2.0)
+
+
+@pytest.mark.parametrize('wins, draws, losses', [(10, 0, 0), (0, 0, 10), (0, 10, 0), (1, 0, 0)])
+def test_match_result_same_results(wins, draws, losses):
+    """ Tests that games that all ended the same give a finite Elo and a margin """
+    result = MatchResult()
+    result.wins, result.draws, result.losses = wins, draws, losses
+    elo, margin = result.elo()
+    assert math.isfinite(elo) and margin > 0 and not math.isnan(margin)
+    assert (elo > 0) == (wins > 0) and (elo < 0) == (losses > 0)
+    assert "nan" not in result.report(EngineConfig(name = "A"), EngineConfig(name = "B"))[1]
+
+
+@pytest.mark.parametrize(
+    'wins, draws, losses, decision',
+    [
+        (0, 0, 0, None),
+        (10, 5, 10, None),
+        (400, 100, 200, "H1"),
+        (200, 100, 400, "H0"),
+        (60, 0, 0, "H1"),
+    ])
+def test_sprt(wins, draws, losses, decision):
+    """ Tests that the SPRT decides only once the results are clear enough """
+    assert SPRT(0, 20).decision(wins, draws, losses) == decision
+
+
+def test_engine_config_parse():
+    """ Tests the key=value notation of the engine settings """
+    config = EngineConfig.parse("depth=none, time=0.5,nodes=2000,quiescence=0,book=1", "A")
+    assert (config.name, config.depth, config.time_limit, config.node_limit) == (
+        "A", None, 0.5, 2000)
+    assert config.quiescence_node_limit == 0 and config.book is True
+    assert config.tablebase is False
+    with pytest.raises(ValueError):
+        EngineConfig.parse("width=3")
+
+
+@pytest.mark.parametrize('text, shown', [
+    ("depth=0,quiescence=0", "A (depth=0, quiescence=0)"),
+    ("depth=none,time=0.5,book=1,tablebase=0", "A (time=0.5, quiescence=256, book=True)"),
+])
+def test_engine_config_str(text, shown):
+    """ Tests that the report shows settings of 0 and leaves out the ones that are off """
+    assert str(EngineConfig.parse(text, "A")) == shown
+
+
+def test_mirrored_boards():
+    """ Tests that the board of the engine playing white is the game seen by black """
+    white_view = Board(Colour.WHITE, STARTING_POSITION)
+    black_view = Board(Colour.BLACK, mirror_position(STARTING_POSITION))
+    # the book was built on the board Game gives to a black player
+    assert black_view.hash_key == Board(Colour.BLACK).hash_key
+
+    for move in opening_lines(1, 12, seed = 4)[0]:
+        is_op = len(white_view.moves_played) % 2 == 1
+        assert white_view.move(move, is_op)
+        assert black_view.move(mirror_move(move), not is_op)
+        assert black_view.position_string() == mirror_position(white_view.position_string())
+        assert black_view.evaluation == white_view.evaluation
+
+
+def test_opening_lines():
+    """ Tests that opening lines are different and made of legal moves """
+    lines = opening_lines(30, 2, seed = 1)
+    assert len(lines) == len(set(lines)) == 30
+    assert opening_lines(30, 2, seed = 1) == lines
+    assert len(opening_lines(100, 1)) == 20
+
+
+def test_play_game():
+    """ Tests that a game is played until someone wins or it is too long """
+    weak = EngineConfig("weak", depth = 0, quiescence_node_limit = 0)
+    strong = EngineConfig("strong", depth = 2)
+    record = play_game(strong, weak, opening_lines(1, 2)[0], max_plies = 200)
+    assert record.white_score == 1
+    assert len(record.move_times[0]) + len(record.move_times[1]) == record.plies - 2
+    assert record.nodes[0] > record.nodes[1] > 0
+
+    record = play_game(strong, strong, (), max_plies = 6)
+    assert (record.white_score, record.plies) == (0.5, 6)
+
+
+def test_run_match():
+    """ Tests that every opening is played with both colours and that the SPRT stops it """
+    weak = EngineConfig("weak", depth = 0, quiescence_node_limit = 0)
+    strong = EngineConfig("strong", depth = 1)
+    games = []
+    result = run_match(strong, weak, opening_lines(2, 2), max_plies = 20,
+                       on_game = lambda result: games.append(result.games()))
+    assert result.games() == 4 and games == [1, 2, 3, 4]
+    assert result.decision is None
+
+    result = run_match(strong, weak, opening_lines(30, 2), max_plies = 200,
+                       sprt = SPRT(0, 400, 0.2, 0.2))
+    assert result.decision == "H1"
+    assert result.games() < 60
@@ -0,0 +1,60 @@
+""" Import pytest to create tests """
+import pytest
+from antichess.ordering import MoveOrderer
+from antichess.engine import Engine
+from antichess.colour import Colour
+from antichess.board import Board
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, colour_to_play, first_moves',
+    [
+        # colour of player, board position, colour to play, expected order of first moves
+        (Colour.WHITE,
+         "0000k000/00000000/00000000/0q0r0n00/00P0P000/00000000/00000000/0000K000",
+         Colour.WHITE, [(4,2,3,1), (4,2,3,3), (4,4,3,3), (4,4,3,5)]),
+        (Colour.WHITE,
+         "0000k000/00000000/00000000/00p000R0/0Q000000/00000000/00000000/0000K000",
+         Colour.WHITE, [(3,6,3,2), (4,1,3,2)]),
+    ])
+def test_order_captures(colour, start_pos, colour_to_play, first_moves):
+    """ Tests that captures are ordered by the most valuable victim and least valuable attacker """
+    test_board = Board(colour, start_pos)
+    orderer = MoveOrderer()
+    moves = test_board.generate_legal_moves(colour_to_play)
+
+    ordered = orderer.order(test_board, moves, 0)
+    assert sorted(ordered) == sorted(moves)
+    assert ordered[:len(first_moves)] == first_moves
+
+    # the transposition table move always goes first
+    assert orderer.order(test_board, moves, 0, first_moves[-1])[0] == first_moves[-1]
+
+
+def test_order_killers_and_history():
+    """ Tests that quiet moves follow killer moves of the ply and then the history table """
+    test_board = Board(Colour.WHITE)
+    orderer = MoveOrderer()
+    moves = test_board.generate_legal_moves(Colour.WHITE)
+
+    orderer.record_cutoff(test_board, (6,0,5,0), 3, 2, 0)
+    orderer.record_cutoff(test_board, (6,7,4,7), 1, 4, 5)
+    orderer.record_cutoff(test_board, (6,7,4,7), 1, 4, 5)
+
+    assert orderer.order(test_board, moves, 3)[:2] == [(6,0,5,0), (6,7,4,7)]
+    assert orderer.order(test_board, moves, 1)[:2] == [(6,7,4,7), (6,0,5,0)]
+    assert orderer.order(test_board, moves, 0)[:2] == [(6,7,4,7), (6,0,5,0)]
+
+    assert orderer.cutoffs == 3
+    assert orderer.first_move_cutoffs == 1
+    assert orderer.first_move_cutoff_rate() == pytest.approx(1 / 3)
+
+
+def test_engine_first_move_cutoffs():
+    """ Tests that the engine search reports how often the first move caused the cutoff """
+    test_board = Board(Colour.BLACK)
+    test_engine = Engine(test_board, 3, Colour.WHITE)
+    test_engine.get_best_move()
+
+    assert test_engine.move_orderer.cutoffs > 0
+    assert test_engine.move_orderer.first_move_cutoff_rate() > 0.5
@@ -0,0 +1,28 @@
+""" Import pytest to create tests """
+import pytest
+from antichess.board import Board
+from antichess.perft import PERFT_SUITE, perft, divide
+
+
+@pytest.mark.parametrize('colour, start_pos, is_opponent, counts', PERFT_SUITE)
+def test_perft_suite(colour, start_pos, is_opponent, counts):
+    """ Tests perft() against the reference node counts and that the board is left untouched """
+    test_board = Board(colour, start_pos)
+    occupied = test_board.occupied
+
+    for depth, expected in enumerate(counts, start = 1):
+        assert perft(test_board, depth, is_opponent) == expected
+
+    assert test_board.occupied == occupied
+    assert len(test_board.moves_played) == 0
+
+
+@pytest.mark.parametrize('colour, start_pos, is_opponent, counts', PERFT_SUITE)
+def test_divide(colour, start_pos, is_opponent, counts):
+    """ Tests that divide() splits the perft count between the root moves """
+    test_board = Board(colour, start_pos)
+    depth = min(len(counts), 3)
+    counts_per_move = divide(test_board, depth, is_opponent)
+
+    assert len(counts_per_move) == counts[0]
+    assert sum(counts_per_move.values()) == counts[depth - 1]
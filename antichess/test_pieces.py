@@ -1,6 +1,8 @@
 """ Import pytest to create tests """
 import pytest
 from antichess.pieces import Pawn, Rook, Bishop, King, Queen, Knight
+from antichess.pieces import (KNIGHT_TARGETS, KING_TARGETS, KNIGHT_ATTACKS, ROOK_RAYS,
+                              BISHOP_RAYS, PAWN_PUSHES, PAWN_CAPTURES)
 from antichess.colour import Colour
 
 
@@ -123,3 +125,57 @@ def test_king(colour):
     assert king_copy.image_white is not None
     assert king_copy.image_white == king.image_white
     assert king_copy.image_black == king.image_black
+
+@pytest.mark.parametrize(
+    'piece_type, value',
+    [
+        # Type of piece and its value
+        (Pawn, 1), (Knight, 3), (Bishop, 3), (Rook, 5), (Queen, 9), (King, 3)
+    ])
+def test_shared_pieces(piece_type, value):
+    """ Tests that there is one piece per type and colour and that it cannot be changed """
+    white, black = piece_type(Colour.WHITE), piece_type(Colour.BLACK)
+
+    assert white is piece_type(Colour.WHITE) and white.copy() is white
+    assert black is not white and black.colour == Colour.BLACK
+    assert white.VALUE == white.get_value() == value
+    assert not hasattr(white, "__dict__")
+    with pytest.raises(AttributeError):
+        white.colour = Colour.BLACK
+    assert white.colour == Colour.WHITE
+
+def test_queen_moves():
+    """ Tests that a queen moves like a bishop and a rook together """
+    queen = Queen(Colour.WHITE)
+    for x_coord, y_coord in [(0, 0), (3, 4), (7, 2)]:
+        assert queen.get_moves(x_coord, y_coord) == (
+            Bishop(Colour.WHITE).get_moves(x_coord, y_coord)
+            + Rook(Colour.WHITE).get_moves(x_coord, y_coord))
+
+@pytest.mark.parametrize(
+    'square, knight_count, king_count, ray_lengths',
+    [
+        # Square index x * 8 + y, number of knight and king targets, lengths of the rook rays
+        (0, 2, 3, [7, 7]), (27, 8, 8, [4, 4, 3, 3]), (63, 2, 3, [7, 7]), (56, 2, 3, [7, 7])
+    ])
+def test_move_tables(square, knight_count, king_count, ray_lengths):
+    """ Tests the precomputed targets and rays of the pieces """
+    assert len(KNIGHT_TARGETS[square]) == knight_count
+    assert len(KING_TARGETS[square]) == king_count
+    assert [len(ray) for ray in ROOK_RAYS[square]] == ray_lengths
+    assert bin(KNIGHT_ATTACKS[square]).count("1") == knight_count
+    for ray in ROOK_RAYS[square] + BISHOP_RAYS[square]:
+        for x_coord, y_coord, bit in ray:
+            assert bit == 1 << (x_coord * 8 + y_coord)
+        # the nearest square comes first
+        assert ray[0] in KING_TARGETS[square]
+
+def test_pawn_tables():
+    """ Tests the pushes and captures of the pawns of both sides """
+    # the player's pawns move up from row 6, the opponent's down from row 1
+    assert [target[:2] for target in PAWN_PUSHES[False][6 * 8 + 4]] == [(5, 4), (4, 4)]
+    assert [target[:2] for target in PAWN_PUSHES[False][5 * 8 + 4]] == [(4, 4)]
+    assert [target[:2] for target in PAWN_PUSHES[True][1 * 8 + 0]] == [(2, 0), (3, 0)]
+    assert PAWN_PUSHES[True][7 * 8 + 3] == () and PAWN_CAPTURES[True][7 * 8 + 3] == ()
+    assert [target[:2] for target in PAWN_CAPTURES[False][6 * 8 + 0]] == [(5, 1)]
+    assert [target[:2] for target in PAWN_CAPTURES[True][1 * 8 + 4]] == [(2, 5), (2, 3)]
@@ -0,0 +1,50 @@
+""" Importing pytest to create tests """
+import os
+import subprocess
+import sys
+import pygame
+import pytest
+from antichess.board import Board
+from antichess.render import BoardView
+
+
+@pytest.fixture(name = "window")
+def fixture_window():
+    """ Window of the dummy video driver """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    return pygame.display.set_mode((900, 600))
+
+
+def test_view_dirty_tiles(window):
+    """ Tests that only the tiles that changed since the last frame are redrawn """
+    board = Board()
+    view = BoardView(board)
+    highlight = [(0, 0, 255, 40)]
+
+    assert len(view.display_board(window)) == 65
+    assert len(view.display_board(window)) == 0
+
+    board.move((6, 4, 4, 4))
+    assert len(view.display_board(window, {(6, 4): highlight, (4, 4): highlight})) == 2
+    assert len(view.display_board(window, {(6, 4): highlight, (4, 4): highlight})) == 0
+    assert len(view.display_board(window, {(4, 4): highlight})) == 1
+    assert len(view.display_board(window, redraw_all = True)) == 65
+
+
+@pytest.mark.parametrize('row, col', [(0, 0), (7, 7), (6, 4), (3, 5)])
+def test_view_tile_coords(window, row, col):
+    """ Tests that the center of a tile is mapped back to the tile """
+    view = BoardView(Board())
+    assert view.get_tile_based_on_click(window, *view.get_coords(window, col, row)) == (row, col)
+    assert view.get_tile_size(window) * 8 == view.get_size_of_board(window) == 540
+
+
+def test_core_without_pygame():
+    """ Tests that the game logic and the engine are imported without pygame """
+    script = ("import sys\nimport antichess.board, antichess.pieces, antichess.engine\n"
+              "import antichess.match, antichess.book, antichess.tablebase, antichess.uci\n"
+              "print('pygame' in sys.modules)\n")
+    output = subprocess.run([sys.executable, "-c", script], capture_output = True,
+                            text = True, check = True).stdout.split()
+    assert output == ["False"]
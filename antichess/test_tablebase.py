@@ -0,0 +1,201 @@
+""" Import pytest to create tests """
+import random
+import pytest
+import numpy as np
+from antichess import tablebase as tablebase_module
+from antichess.tablebase import (Tablebase, build_tablebase, table_signatures, encode_value,
+                                 decode_value, table_size, position_indexes, position_squares,
+                                 position_index, SYMMETRIES, WIN, LOSS, DRAW)
+from antichess.board import Board, PIECE_LETTERS, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from antichess.colour import Colour
+from antichess.engine import Engine
+
+
+@pytest.fixture(scope = "module", name = "tablebase")
+def fixture_tablebase(tmp_path_factory):
+    """ Tables of all positions with two pieces """
+    path = str(tmp_path_factory.mktemp("tablebase") / "tablebase.bin")
+    assert build_tablebase(path, 2, workers = 1) == len(table_signatures(2))
+    return Tablebase(path)
+
+
+@pytest.mark.parametrize('result, distance', [(WIN, 0), (LOSS, 1), (WIN, 126), (DRAW, 0)])
+def test_tablebase_values(result, distance):
+    """ Tests that a result and its distance fit into one byte """
+    assert 0 <= encode_value(result, distance) <= 255
+    assert decode_value(encode_value(result, distance)) == (result, distance)
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, colour_to_play, expected',
+    [
+        # colour of player, board position, colour to play, (result, distance)
+        (Colour.WHITE,
+         "R0000k00/00000000/00000000/00000000/00000000/00000000/00000000/00000000",
+         Colour.WHITE, (LOSS, 1)),
+        (Colour.WHITE,
+         "R0000k00/00000000/00000000/00000000/00000000/00000000/00000000/00000000",
+         Colour.BLACK, (WIN, 2)),
+        (Colour.BLACK,
+         "00000000/00000000/00000000/00000000/00000000/00000000/00000000/00k0000R",
+         Colour.BLACK, (LOSS, 1)),
+        (Colour.WHITE,
+         "K0000000/00000000/00000000/00000000/00000000/00000000/00000000/0000000p",
+         Colour.WHITE, None),
+        (Colour.WHITE,
+         "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR",
+         Colour.WHITE, None),
+    ])
+def test_tablebase_probe(tablebase, colour, start_pos, colour_to_play, expected):
+    """ Tests positions that are solved by hand and positions the tables do not cover """
+    assert tablebase.probe(Board(colour, start_pos), colour_to_play) == expected
+
+
+@pytest.mark.parametrize('signature, size', [
+    # (white types, black types), positions with one side to move
+    (((QUEEN,), (KING,)), 10 * 63),
+    (((BISHOP, BISHOP), (ROOK,)), 278 * 62),
+    (((KNIGHT,), (KING, KING)), 10 * 63 * 62 // 2),
+    (((ROOK, QUEEN), (ROOK, KING)), 10 * 63 * 62 * 61),
+])
+def test_tablebase_index(signature, size):
+    """ Tests that indexes are dense and that mirrored positions have the same index """
+    assert table_size(signature) == size
+    indexes = np.arange(0, size, max(1, size // 5000))
+    squares = position_squares(signature, indexes)
+    assert (position_indexes(signature, squares) == indexes).all()
+    for symmetry in SYMMETRIES:
+        mirrored = [symmetry[square] for square in squares]
+        found = position_indexes(signature, mirrored)
+        assert found.min() >= 0 and found.max() < size
+        assert position_index(signature, [int(square[0]) for square in mirrored]) == found[0]
+        assert (position_indexes(signature, position_squares(signature, found)) == found).all()
+
+
+def test_tablebase_mirrored_positions(tablebase):
+    """ Tests that the 8 mirrored positions of a position have the same result """
+    generator = random.Random(5)
+    for _ in range(50):
+        white_square, black_square = generator.sample(range(64), 2)
+        results = set()
+        for symmetry in SYMMETRIES:
+            rows = [["0"] * 8 for _ in range(8)]
+            rows[symmetry[white_square] // 8][symmetry[white_square] % 8] = "Q"
+            rows[symmetry[black_square] // 8][symmetry[black_square] % 8] = "n"
+            results.add(tablebase.probe(Board(Colour.WHITE, "/".join("".join(row)
+                                                                     for row in rows)),
+                                        Colour.WHITE))
+        assert len(results) == 1
+
+
+def test_tablebase_solves_positions(tablebase):
+    """ Tests that every result follows from the results after the legal moves """
+    generator = random.Random(3)
+    for _ in range(300):
+        white_type, black_type = generator.choice(table_signatures(2))
+        white_square, black_square = generator.sample(range(64), 2)
+        rows = [["0"] * 8 for _ in range(8)]
+        rows[white_square // 8][white_square % 8] = PIECE_LETTERS[white_type[0]]
+        rows[black_square // 8][black_square % 8] = PIECE_LETTERS[black_type[0]].lower()
+        board = Board(Colour.WHITE, "/".join("".join(row) for row in rows))
+        colour_to_play = generator.choice([Colour.WHITE, Colour.BLACK])
+        other_colour = Colour.BLACK if colour_to_play == Colour.WHITE else Colour.WHITE
+        is_op = colour_to_play == Colour.BLACK
+
+        results = []
+        for move in board.generate_legal_moves(colour_to_play, is_op):
+            board.move(move, is_op, False)
+            if len(board.white_pieces_pos) == 0 or len(board.black_pieces_pos) == 0:
+                results.append((WIN, 0))
+            else:
+                results.append(tablebase.probe(board, other_colour))
+            board.unmake_last_move()
+
+        losses = [distance for result, distance in results if result == LOSS]
+        if len(results) == 0:
+            expected = (WIN, 0)
+        elif losses:
+            expected = (WIN, min(losses) + 1)
+        elif all(result == WIN for result, _ in results):
+            expected = (LOSS, max(distance for _, distance in results) + 1)
+        else:
+            expected = (DRAW, 0)
+        assert tablebase.probe(board, colour_to_play) == expected
+
+
+def plain_search(board, colour_to_play, depth):
+    """ Returns (result, distance) found by a full search of depth plies or None """
+    moves = board.generate_legal_moves(colour_to_play)
+    if len(moves) == 0:
+        return WIN, 0
+    if depth == 0:
+        return None
+    other_colour = Colour.BLACK if colour_to_play == Colour.WHITE else Colour.WHITE
+    results = []
+    for move in moves:
+        board.move(move, colour_to_play != board.colour, False)
+        results.append(plain_search(board, other_colour, depth - 1))
+        board.unmake_last_move()
+
+    losses = [result[1] for result in results if result is not None and result[0] == LOSS]
+    if losses:
+        return WIN, min(losses) + 1
+    if all(result is not None and result[0] == WIN for result in results):
+        return LOSS, max(result[1] for result in results) + 1
+    return None
+
+
+def test_tablebase_three_pieces(tmp_path, monkeypatch):
+    """ Tests a table of three pieces against a plain search of mirrored random positions """
+    signature = ((ROOK,), (KNIGHT, KING))
+    signatures = table_signatures
+    monkeypatch.setattr(tablebase_module, "table_signatures",
+                        lambda pieces: signatures(pieces) if pieces < 3 else [signature])
+    path = str(tmp_path / "tablebase.bin")
+    assert build_tablebase(path, 3, workers = 1) == len(signatures(2)) + 1
+    tablebase = Tablebase(path)
+
+    generator = random.Random(4)
+    depth, found = 3, set()
+    for _ in range(60):
+        symmetry = SYMMETRIES[generator.randrange(len(SYMMETRIES))]
+        index = generator.randrange(table_size(signature))
+        squares = [symmetry[square[0]] for square in position_squares(signature, [index])]
+        colour = generator.choice([Colour.WHITE, Colour.BLACK])
+        rows = [["0"] * 8 for _ in range(8)]
+        for place, (piece, square) in enumerate(zip(signature[0] + signature[1], squares)):
+            is_white = place < len(signature[0])
+            letter = PIECE_LETTERS[piece]
+            rows[square // 8][square % 8] = (letter if is_white == (colour == Colour.WHITE)
+                                             else letter.lower())
+        board = Board(colour, "/".join("".join(row) for row in rows))
+        colour_to_play = generator.choice([Colour.WHITE, Colour.BLACK])
+
+        expected = tablebase.probe(board, colour_to_play)
+        result = plain_search(board, colour_to_play, depth)
+        if expected[0] != DRAW and expected[1] <= depth:
+            assert result == expected
+            found.add(result[0])
+        else:
+            assert result is None
+    assert found == {WIN, LOSS}
+
+
+def test_engine_plays_from_tablebase(tablebase):
+    """ Tests that the engine plays the fastest win from the tables without searching """
+    # the black queen has to avoid the rook and give it a capture
+    test_board = Board(Colour.WHITE,
+        "00000000/00000000/000q0000/00000000/00000000/00000000/00000000/R0000000")
+    assert tablebase.probe(test_board, Colour.BLACK)[0] == WIN
+
+    test_engine = Engine(test_board, 3, Colour.BLACK, tablebase = tablebase)
+    best_move = test_engine.get_best_move()
+    assert test_engine.nodes == 0
+    assert test_engine.best_score > 0
+
+    test_board.move(best_move, True)
+    result, distance = tablebase.probe(test_board, Colour.WHITE)
+    assert result == LOSS
+    assert distance + 1 == tablebase.probe(Board(Colour.WHITE,
+        "00000000/00000000/000q0000/00000000/00000000/00000000/00000000/R0000000"),
+        Colour.BLACK)[1]
@@ -0,0 +1,81 @@
+""" Import pytest to create tests """
+import pytest
+from antichess.transposition import TranspositionTable, ENTRY_SIZE, EXACT, LOWER, UPPER
+from antichess.engine import Engine
+from antichess.colour import Colour
+from antichess.board import Board
+
+
+@pytest.mark.parametrize('size_in_mb', [0, 1, 4, 16])
+def test_transposition_table_size(size_in_mb):
+    """ Tests that the table stays in its memory budget and has a power of two buckets """
+    table = TranspositionTable(size_in_mb)
+    buckets = len(table) // 2
+
+    assert buckets & (buckets - 1) == 0
+    assert buckets == 1 or len(table) * ENTRY_SIZE <= size_in_mb * 1024 * 1024
+
+
+def test_transposition_table_store_probe():
+    """ Tests storing, probing and the hit counters """
+    table = TranspositionTable(1)
+
+    assert table.probe(12345) is None
+    table.store(12345, 3, -7, EXACT, (6,4,4,4))
+    assert table.probe(12345) == (12345, 3, -7, EXACT, (6,4,4,4))
+    assert table.probe(54321) is None
+
+    assert table.probes == 3
+    assert table.hits == 1
+    assert table.stores == 1
+    assert table.hit_rate() == pytest.approx(1 / 3)
+
+    table.clear()
+    assert table.probe(12345) is None
+    assert table.probes == 1
+
+
+def test_transposition_table_replacement():
+    """ Tests the depth-preferred and always-replace entries of a bucket """
+    table = TranspositionTable(1)
+    buckets = len(table) // 2
+    deep_key, shallow_key, other_key = 5, 5 + buckets, 5 + 2 * buckets
+
+    table.store(deep_key, 6, 1, LOWER, None)
+    table.store(shallow_key, 2, 2, UPPER, None)
+    assert table.probe(deep_key)[1] == 6
+    assert table.probe(shallow_key)[1] == 2
+
+    # a shallow result replaces only the always-replace entry
+    table.store(other_key, 1, 3, EXACT, None)
+    assert table.probe(deep_key)[1] == 6
+    assert table.probe(shallow_key) is None
+    assert table.probe(other_key)[1] == 1
+
+    # a deeper result takes the depth-preferred entry
+    table.store(shallow_key, 7, 4, EXACT, None)
+    assert table.probe(shallow_key)[1] == 7
+    assert table.probe(deep_key) is None
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, depth',
+    [
+        (Colour.WHITE,
+         "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR", 2),
+        (Colour.BLACK,
+         "rnbqkbnr/pp0ppppp/00000000/00p00000/0000P000/00000000/PPPP0PPP/RNBQKBNR", 3),
+    ])
+def test_engine_reuses_transposition_table(colour, start_pos, depth):
+    """ Tests that a shared table keeps the best move and saves nodes on the next search """
+    test_board = Board(colour, start_pos)
+    engine_colour = Colour.WHITE if colour == Colour.BLACK else Colour.BLACK
+    table = TranspositionTable(4)
+
+    first_engine = Engine(test_board, depth, engine_colour, table)
+    first_move = first_engine.get_best_move()
+    second_engine = Engine(test_board, depth, engine_colour, table)
+
+    assert second_engine.get_best_move() == first_move
+    assert second_engine.nodes < first_engine.nodes
+    assert table.hits > 0
@@ -0,0 +1,149 @@
+""" Import pytest to create tests """
+import subprocess
+import sys
+import pytest
+from antichess.uci import UciSession, move_to_text, text_to_move
+from antichess.board import Board
+from antichess.colour import Colour
+from antichess.engine import Engine
+
+
+@pytest.mark.parametrize('text, move', [("e2e4", (6,4,4,4)), ("a8h1", (0,0,7,7)),
+                                        ("h1a8", (7,7,0,0)), ("b7b8", (1,1,0,1))])
+def test_move_text(text, move):
+    """ Tests the notation of moves on the board of white """
+    assert text_to_move(text) == move
+    assert move_to_text(move) == text
+
+
+@pytest.mark.parametrize('text', ["e2e", "e2e9", "i2e4", "e2e4q", ""])
+def test_move_text_invalid(text):
+    """ Tests that a move that is not on the board is refused """
+    with pytest.raises(ValueError):
+        text_to_move(text)
+
+
+def run_session(commands):
+    """ Returns the lines the session answered to the commands once its search ended """
+    lines = []
+    session = UciSession(lines.append)
+    for command in commands:
+        assert session.handle(command)
+    session.wait_for_search()
+    return lines
+
+
+def test_uci_handshake():
+    """ Tests the answers to uci and isready """
+    lines = run_session(["uci", "isready", "ucinewgame", "isready"])
+    assert lines[0].startswith("id name")
+    assert lines[-3:] == ["uciok", "readyok", "readyok"]
+    assert all(line.startswith("option name") for line in lines[1:-3])
+    assert UciSession(lines.append).handle("quit") is False
+
+
+def test_uci_search():
+    """ Tests that go streams info lines and plays the move the engine finds """
+    lines = run_session(["setoption name OwnBook value false",
+                         "position startpos moves e2e4", "go depth 3"])
+    assert [line.split()[2] for line in lines[:-1]] == ["1", "2", "3"]
+    assert all(" pv " in line and " nodes " in line for line in lines[:-1])
+
+    test_board = Board(Colour.WHITE)
+    test_board.move((6,4,4,4))
+    best_move = Engine(test_board, 2, Colour.BLACK).get_best_move()
+    assert lines[-1] == f"bestmove {move_to_text(best_move)}"
+
+
+@pytest.mark.parametrize(
+    'commands, legal_moves',
+    [
+        # white moves first in the starting position
+        (["position startpos", "go nodes 500"],
+         Board(Colour.WHITE).generate_legal_moves(Colour.WHITE, False)),
+        # the pawn on e4 is forced to capture on d5
+        (["position startpos moves e2e4 d7d5", "go movetime 100"], [(4,4,3,3)]),
+        (["position board 00000000/00000000/000q0000/00000000/00000000/00000000/00000000/"
+          "R0000000 b 0", "go depth 2"], None),
+    ])
+def test_uci_positions(commands, legal_moves):
+    """ Tests that the best move is legal for the side to move of the position """
+    lines = run_session(commands)
+    best_move = text_to_move(lines[-1].split()[1])
+    if legal_moves is None:
+        test_board = Board(Colour.WHITE, commands[0].split()[2])
+        legal_moves = test_board.generate_legal_moves(Colour.BLACK, True)
+    assert best_move in legal_moves
+
+
+def test_uci_stop_and_errors():
+    """ Tests that stop ends an infinite search and that wrong input is reported """
+    lines = run_session(["position startpos moves e2e4 e7e4", "go infinite", "stop", "foo"])
+    assert lines[0] == "info string illegal move e7e4"
+    assert lines[-2].startswith("bestmove")
+    assert lines[-1] == "info string unknown command foo"
+
+    lines = run_session(["position board 0000K000/00000000/00000000/00000000/00000000/"
+                         "00000000/00000000/0000k000 w", "go depth 2"])
+    assert lines[-1].startswith("bestmove")
+    lines = run_session(["position board 00000000/00000000/00000000/00000000/00000000/"
+                         "00000000/0000p000/0000P000 w", "go depth 2"])
+    assert lines[-1] == "bestmove 0000"
+
+
+@pytest.mark.parametrize('command, answer', [
+    ("go depth x", "info string invalid depth 'x'"),
+    ("setoption name Hash value big", "info string invalid value of Hash 'big'"),
+    ("setoption name Threads", "info string invalid value of Threads ''"),
+    ("position board 0000k000/00000000/00000000/00000000/00000000/00000000/00000000/0000K000"
+     " w q", "info string invalid promotion index 'q'"),
+    # a row of 9 squares, a missing row and a letter that is not a piece
+    ("position board 000000000/00000000/00000000/00000000/00000000/00000000/00000000/0000K000"
+     " w 0", "info string invalid position '000000000/00000000/00000000/00000000/00000000/"
+     "00000000/00000000/0000K000'"),
+    ("position board 0000k000/00000000 w 0 moves e1e2",
+     "info string invalid position '0000k000/00000000'"),
+    ("position board x", "info string invalid position 'x'"),
+])
+def test_uci_invalid_values(command, answer):
+    """ Tests that a wrong number is reported and the session keeps its position """
+    lines = []
+    session = UciSession(lines.append)
+    assert session.handle("position startpos moves e2e4")
+    assert session.handle(command)
+    assert lines == [answer]
+    assert session.hash_mb == UciSession.hash_mb and session.workers == 1
+    assert session.side_to_move() == Colour.BLACK
+    assert session.handle("isready")
+    assert lines[-1] == "readyok"
+
+
+@pytest.mark.parametrize('command, illegal', [
+    # pawns never move back
+    ("position startpos moves e2e4 e7e5 e4e3", "e4e3"),
+    # a pawn captures one square diagonally forward only
+    ("position board 0000k000/00000000/00000000/00000000/00000n00/00000000/0000P000/0000K000"
+     " w 0 moves e2f4", "e2f4"),
+    # capturing is compulsory
+    ("position startpos moves e2e4 d7d5 a2a3", "a2a3"),
+])
+def test_uci_illegal_moves(command, illegal):
+    """ Tests that an illegal move is refused and the previous position is kept """
+    lines = []
+    session = UciSession(lines.append)
+    assert session.handle("position startpos moves g2g3")
+    previous_boards = session.boards
+    assert session.handle(command)
+    assert lines == [f"info string illegal move {illegal}"]
+    assert session.boards is previous_boards
+    assert [len(board.moves_played) for board in session.boards.values()] == [1, 1]
+    assert session.side_to_move() == Colour.BLACK
+
+
+def test_uci_without_pygame():
+    """ Tests that the protocol runs in a process that never loads pygame """
+    script = ("import sys\nfrom antichess.uci import UciSession\n"
+              "UciSession().handle('uci')\nprint('pygame' in sys.modules)\n")
+    output = subprocess.run([sys.executable, "-c", script], capture_output = True,
+                            text = True, check = True).stdout.split()
+    assert output[-2:] == ["uciok", "False"]
@@ -0,0 +1,54 @@
+""" Import pytest to create tests """
+import time
+import threading
+import pytest
+from antichess.worker import SearchHandle
+from antichess.engine import Engine
+from antichess.colour import Colour
+from antichess.board import Board
+
+
+@pytest.mark.parametrize(
+    'colour, start_pos, depth',
+    [
+        (Colour.WHITE,
+         "R0000000/00000000/00000000/00000000/00000000/00000000/00000000/000r0000", 4),
+        (Colour.BLACK,
+         "rnbqkbnr/pppppppp/00000000/00000000/00000000/00000000/PPPPPPPP/RNBQKBNR", 2),
+    ])
+def test_search_handle_result(colour, start_pos, depth):
+    """ Tests that a search in the background finds the same move as a direct search """
+    test_board = Board(colour, start_pos)
+    engine_colour = Colour.WHITE if colour == Colour.BLACK else Colour.BLACK
+
+    handle = SearchHandle(Engine(test_board, depth, engine_colour))
+    best_move = Engine(test_board, depth, engine_colour).get_best_move()
+
+    assert handle.result(timeout = 30) == best_move
+    assert handle.done()
+    assert handle.progress()[0] >= 0
+
+
+def test_search_handle_cancel():
+    """ Tests that a cancelled search stops quickly and still returns a legal move """
+    test_board = Board(Colour.BLACK)
+    handle = SearchHandle(Engine(test_board, None, Colour.WHITE))
+
+    time.sleep(0.2)
+    assert not handle.done()
+    start = time.perf_counter()
+    handle.cancel()
+    best_move = handle.result(timeout = 5)
+
+    assert time.perf_counter() - start < 1
+    assert best_move in test_board.generate_legal_moves(Colour.WHITE)
+
+
+def test_search_handle_on_done():
+    """ Tests that on_done is called once the result can be read without waiting """
+    finished = threading.Event()
+    handle = SearchHandle(Engine(Board(Colour.WHITE), 1, Colour.BLACK), finished.set)
+
+    assert finished.wait(timeout = 30)
+    assert handle.done()
+    assert handle.result(timeout = 0) != (0,0,0,0)
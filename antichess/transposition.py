@@ -0,0 +1,81 @@
+""" Transposition table storing results of searched positions under their hash """
+
+# Importing count to number the tables and their clears
+from itertools import count
+
+# Bound types of a stored score
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Approximate number of bytes one stored entry takes, a tuple of five items and its key int
+ENTRY_SIZE = 160
+
+# Identities of the tables, a table takes the next one when it is created or cleared
+_IDENTITIES = count(1)
+
+class TranspositionTable:
+    """
+        Fixed size table of searched positions keyed by Board.hash_key
+
+        Every bucket has two entries, the first one is replaced only by a search that
+        was at least as deep (depth-preferred) and the second one is replaced always.
+        An entry is a tuple (key, depth, score, bound, best_move)
+
+        identity changes whenever the entries are thrown away, so copies of the table
+        kept elsewhere (the tables of the pool workers of Engine) know when to drop theirs
+    """
+    size_in_mb = 16
+    identity = 0
+    mask = 0
+    probes = 0
+    hits = 0
+    stores = 0
+
+    def __init__(self, size_in_mb = 16):
+        self.size_in_mb = size_in_mb
+        buckets = max(1, int(size_in_mb * 1024 * 1024 / (2 * ENTRY_SIZE)))
+        buckets = 1 << (buckets.bit_length() - 1)
+        self.mask = buckets - 1
+        self.depth_preferred = [None] * buckets
+        self.always_replace = [None] * buckets
+        self.probes, self.hits, self.stores = 0, 0, 0
+        self.identity = next(_IDENTITIES)
+
+    def __len__(self):
+        """ Returns the number of entries the table can hold """
+        return 2 * (self.mask + 1)
+
+    def probe(self, key):
+        """ Returns the entry stored for the key or None """
+        self.probes += 1
+        index = key & self.mask
+        entry = self.depth_preferred[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self.always_replace[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, score, bound, best_move):
+        """ Stores a search result, keeps deeper results in the depth-preferred entry """
+        self.stores += 1
+        index = key & self.mask
+        entry = (key, depth, score, bound, best_move)
+        kept = self.depth_preferred[index]
+        if kept is None or kept[0] == key or depth >= kept[1]:
+            self.depth_preferred[index] = entry
+        else:
+            self.always_replace[index] = entry
+
+    def clear(self):
+        """ Removes all entries and resets the counters """
+        self.depth_preferred = [None] * (self.mask + 1)
+        self.always_replace = [None] * (self.mask + 1)
+        self.probes, self.hits, self.stores = 0, 0, 0
+        self.identity = next(_IDENTITIES)
+
+    def hit_rate(self):
+        """ Returns the share of probes that found an entry """
+        return self.hits / self.probes if self.probes else 0.0
@@ -0,0 +1,262 @@
+""" Importing sys to read the commands from the standard input """
+import sys
+
+# Importing threading to keep the lines of the search and of the commands apart
+import threading
+
+# Importing time to report how long the search took
+import time
+
+# Importing a class representing a chess board
+from antichess.board import Board, STARTING_POSITION, check_position
+
+# Importing a colour enum class to represent black and white
+from antichess.colour import Colour
+
+# Importing the engine that searches the moves
+from antichess.engine import Engine
+
+# Importing the transposition table kept between the searches of a game
+from antichess.transposition import TranspositionTable
+
+# Importing the opening book, the tablebases and the board of the other colour
+from antichess.book import OPENING_BOOK
+from antichess.tablebase import TABLEBASE
+from antichess.match import mirror_position, mirror_move
+
+ENGINE_NAME = "Antichess-minimax"
+
+FILES = "abcdefgh"
+
+def move_to_text(move):
+    """ Returns the move on the board of white as text, (6, 4, 4, 4) is e2e4 """
+    x_from, y_from, x_to, y_to = move
+    return f"{FILES[y_from]}{8 - x_from}{FILES[y_to]}{8 - x_to}"
+
+def text_to_move(text):
+    """ Returns the move on the board of white written as e2e4, raises ValueError otherwise """
+    if len(text) != 4 or text[0] not in FILES or text[2] not in FILES or (
+            text[1] not in "12345678" or text[3] not in "12345678"):
+        raise ValueError(f"invalid move {text!r}")
+    return (8 - int(text[1]), FILES.index(text[0]), 8 - int(text[3]), FILES.index(text[2]))
+
+def text_to_number(text, name):
+    """ Returns the integer written as text, raises ValueError naming the value otherwise """
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"invalid {name} {text!r}") from None
+
+class UciSession:
+    """
+        One connection of the line based protocol, close to UCI:
+
+            uci, isready, ucinewgame, quit
+            setoption name <Hash|Threads|Quiescence|OwnBook|Tablebase> value <value>
+            position startpos [moves e2e4 ...]
+            position board <position> [w|b] [promotion index] [moves e2e4 ...]
+            go [depth N] [movetime ms] [nodes N] [infinite]
+            stop
+
+        Positions use the starting position notation of Board seen by white, moves are
+        squares of white's board. The search runs in a background thread that sends an
+        info line after every depth and bestmove at the end, so stop is read meanwhile,
+        other commands that need the position wait for the search to end.
+        Wrong values and illegal moves are answered by an info string and leave the
+        session as it was. Every line of the answers is passed to output
+    """
+    hash_mb = Engine.TRANSPOSITION_TABLE_MB
+    workers = 1
+    quiescence_node_limit = 256
+    own_book = True
+    use_tablebase = True
+    OPTIONS = (
+        "option name Hash type spin default 16 min 1 max 4096",
+        "option name Threads type spin default 1 min 1 max 256",
+        "option name Quiescence type spin default 256 min 0 max 1000000",
+        "option name OwnBook type check default true",
+        "option name Tablebase type check default true",
+    )
+
+    def __init__(self, output = None):
+        self.output = output if output is not None else self.__print
+        self.transposition_table = TranspositionTable(self.hash_mb)
+        self.boards = {}
+        self.engine = None
+        self.search_thread = None
+        self.__lock = threading.Lock()
+        self.__set_position(STARTING_POSITION, Colour.WHITE, 0, [])
+
+    @staticmethod
+    def __print(line):
+        print(line, flush = True)
+
+    def send(self, line):
+        """ Sends one line, the search thread and the commands never mix their lines """
+        with self.__lock:
+            self.output(line)
+
+    def handle(self, line):
+        """ Runs one command, returns False once the session should end """
+        words = line.split()
+        if not words:
+            return True
+        command, arguments = words[0], words[1:]
+        if command == "quit":
+            self.wait_for_search(stop = True)
+            return False
+        try:
+            self.__run(command, arguments)
+        except ValueError as error:
+            self.send(f"info string {error}")
+        return True
+
+    def __run(self, command, arguments):
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            for option in self.OPTIONS:
+                self.send(option)
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "ucinewgame":
+            self.wait_for_search()
+            self.transposition_table = TranspositionTable(self.hash_mb)
+        elif command == "setoption":
+            self.__set_option(arguments)
+        elif command == "position":
+            self.wait_for_search()
+            self.__position(arguments)
+        elif command == "go":
+            self.wait_for_search()
+            self.__go(arguments)
+        elif command == "stop":
+            self.wait_for_search(stop = True)
+        else:
+            self.send(f"info string unknown command {command}")
+
+    def wait_for_search(self, stop = False):
+        """ Waits until the running search sent its bestmove, stops it first if stop """
+        if self.search_thread is None:
+            return
+        if stop:
+            self.engine.stop()
+        self.search_thread.join()
+        self.engine, self.search_thread = None, None
+
+    def side_to_move(self):
+        """ Returns the colour that moves in the current position """
+        return self.boards[Colour.BLACK].side_to_move
+
+    def __set_position(self, position, side_to_move, promotion_index, moves):
+        """
+            Sets up the boards of both colours and plays the moves, if one is illegal
+            the previous position is kept and it returns False, a malformed position
+            raises ValueError before anything changes
+        """
+        check_position(position)
+        previous_boards = self.boards
+        # the engine playing a colour is the opponent on the board of the other colour
+        self.boards = {
+            Colour.WHITE : Board(Colour.BLACK, mirror_position(position), side_to_move,
+                                 promotion_index),
+            Colour.BLACK : Board(Colour.WHITE, position, side_to_move, promotion_index)}
+        for text in moves:
+            colour = self.side_to_move()
+            other_colour = Colour.BLACK if colour == Colour.WHITE else Colour.WHITE
+            try:
+                move = text_to_move(text)
+            except ValueError:
+                move = None
+            own_move = None if move is None else (
+                mirror_move(move) if colour == Colour.WHITE else move)
+            if own_move not in self.boards[colour].generate_legal_moves(colour, True):
+                self.send(f"info string illegal move {text}")
+                self.boards = previous_boards
+                return False
+            self.boards[colour].move(own_move, True, False)
+            self.boards[other_colour].move(mirror_move(own_move), False, False)
+        return True
+
+    def __position(self, arguments):
+        moves = []
+        if "moves" in arguments:
+            moves = arguments[arguments.index("moves") + 1:]
+            arguments = arguments[:arguments.index("moves")]
+        if arguments[:1] == ["startpos"]:
+            self.__set_position(STARTING_POSITION, Colour.WHITE, 0, moves)
+        elif arguments[:1] == ["board"] and len(arguments) >= 2:
+            side_to_move = Colour.BLACK if arguments[2:3] == ["b"] else Colour.WHITE
+            promotion_index = (text_to_number(arguments[3], "promotion index")
+                               if len(arguments) >= 4 else 0)
+            self.__set_position(arguments[1], side_to_move, promotion_index, moves)
+        else:
+            self.send("info string position needs startpos or board <position>")
+
+    def __set_option(self, arguments):
+        if "name" not in arguments:
+            return
+        value_index = arguments.index("value") if "value" in arguments else len(arguments)
+        name = " ".join(arguments[arguments.index("name") + 1:value_index]).lower()
+        value = " ".join(arguments[value_index + 1:]).lower()
+        if name == "hash":
+            self.hash_mb = min(4096, max(1, text_to_number(value, "value of Hash")))
+            self.transposition_table = TranspositionTable(self.hash_mb)
+        elif name == "threads":
+            self.workers = min(256, max(1, text_to_number(value, "value of Threads")))
+        elif name == "quiescence":
+            self.quiescence_node_limit = max(0, text_to_number(value, "value of Quiescence"))
+        elif name == "ownbook":
+            self.own_book = value == "true"
+        elif name == "tablebase":
+            self.use_tablebase = value == "true"
+        else:
+            self.send(f"info string unknown option {name}")
+
+    def __go(self, arguments):
+        limits = {"depth" : None, "movetime" : None, "nodes" : None}
+        for index, word in enumerate(arguments[:-1]):
+            if word in limits:
+                limits[word] = text_to_number(arguments[index + 1], word)
+
+        colour = self.side_to_move()
+        # go depth 1 searches only the moves of the engine, Engine counts the plies after them
+        depth = None if limits["depth"] is None else max(0, limits["depth"] - 1)
+        time_limit = None if limits["movetime"] is None else limits["movetime"] / 1000
+        engine = Engine(self.boards[colour], depth, colour, self.transposition_table,
+                        time_limit, limits["nodes"], self.workers,
+                        self.quiescence_node_limit,
+                        book = OPENING_BOOK if self.own_book else None,
+                        tablebase = TABLEBASE if self.use_tablebase else None)
+        start = time.perf_counter()
+
+        def to_text(move):
+            return move_to_text(mirror_move(move) if colour == Colour.WHITE else move)
+
+        def send_info(depth, score, move):
+            elapsed = time.perf_counter() - start
+            self.send(f"info depth {depth + 1} score cp {score * 100} nodes {engine.nodes} "
+                      f"nps {int(engine.nodes / elapsed) if elapsed > 0 else 0} "
+                      f"time {int(elapsed * 1000)} pv {to_text(move)}")
+
+        def search():
+            move = engine.get_best_move()
+            no_move = not self.boards[colour].has_legal_moves(colour, True)
+            self.send("bestmove 0000" if no_move else f"bestmove {to_text(move)}")
+
+        engine.on_iteration = send_info
+        self.engine = engine
+        self.search_thread = threading.Thread(target = search, daemon = True)
+        self.search_thread.start()
+
+def main():
+    """ Reads commands from the standard input until quit or its end """
+    session = UciSession()
+    for line in sys.stdin:
+        if not session.handle(line):
+            break
+    session.wait_for_search()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
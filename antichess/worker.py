@@ -0,0 +1,47 @@
+""" Importing threading to run the engine next to the pygame event loop """
+import threading
+
+# Importing Future as the result holder of a search
+from concurrent.futures import Future
+
+class SearchHandle:
+    """
+        Future-style handle of Engine.get_best_move() running in a background thread,
+        the thread that created it can keep handling events and drawing meanwhile,
+        on_done is called from the search thread once the result is set
+    """
+    engine = None
+    on_done = None
+
+    def __init__(self, engine, on_done = None):
+        self.engine = engine
+        self.on_done = on_done
+        self.__future = Future()
+        self.__thread = threading.Thread(target = self.__run, daemon = True)
+        self.__thread.start()
+
+    def __run(self):
+        try:
+            best_move = self.engine.get_best_move()
+        except Exception as error: # pylint: disable=broad-exception-caught
+            self.__future.set_exception(error)
+        else:
+            self.__future.set_result(best_move)
+        if self.on_done is not None:
+            self.on_done()
+
+    def done(self):
+        """ Returns True if the search finished """
+        return self.__future.done()
+
+    def result(self, timeout = None):
+        """ Waits for the search for up to timeout seconds and returns the best move """
+        return self.__future.result(timeout)
+
+    def cancel(self):
+        """ Stops the search, result() then returns the best move of the last finished depth """
+        self.engine.stop()
+
+    def progress(self):
+        """ Returns (the deepest finished depth, number of nodes searched so far) """
+        return self.engine.completed_depth, self.engine.nodes
@@ -0,0 +1,4 @@
+""" Importing the line based engine protocol to run the engine without the window """
+from antichess.uci import main
+
+raise SystemExit(main())